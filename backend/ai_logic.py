@@ -1,20 +1,63 @@
-from typing import List, Optional
+import time
+from functools import cached_property
+from typing import TYPE_CHECKING, List, Optional
 from backend.models import Card, Player
+from backend.ai_params import AIParams, load_startup_params
 from backend.card_utils import CardUtils
+from backend.search import AnytimeSearch, Decision
+
+if TYPE_CHECKING:
+    from backend.strategies import RulesStrategy
 
 
 class AILogic:
-    def __init__(self, game):
+    def __init__(self, game, search: Optional[AnytimeSearch] = None, params: Optional[AIParams] = None):
         self.game = game
+        self.params = params if params is not None else load_startup_params()
         self.card_utils = CardUtils(self.game)
+        self.search = search
+        self.last_decision: Optional[Decision] = None
+
+    @cached_property
+    def strategy(self) -> "RulesStrategy":
+        # This AI seen through the strategy interface the engine drives; imported here as strategies builds on AILogic
+        from backend.strategies import RulesStrategy
+        return RulesStrategy(self.game, ai_logic=self)
 
     def choose_ai_setup_cards(self, player: Player):
         # Combine all available cards (hand + face_up)
         combined = player.hand + player.face_up
 
+        tables = CardUtils.tables
+        threshold = self.params.high_value_threshold
+        if tables is not None and tables.has_setup(len(combined), threshold):
+            face_up_cards = self._cards_for_ranks(combined, tables.setup_ranks(combined, threshold))
+        else:
+            face_up_cards = self.setup_face_up_by_rules(combined, threshold)
+
+        # Create hand from remaining cards
+        hand_cards = self.card_utils.cards_without(combined, face_up_cards)
+
+        # Update player's cards
+        player.face_up = face_up_cards
+        player.hand = hand_cards
+
+    @staticmethod
+    def _cards_for_ranks(combined: List[Card], ranks) -> List[Card]:
+        # The rules take the earliest cards of each chosen value, so the table's ranks map back the same way
+        remaining = list(combined)
+        chosen = []
+        for rank in ranks:
+            for index, card in enumerate(remaining):
+                if card.value == rank:
+                    chosen.append(remaining.pop(index))
+                    break
+        return chosen
+
+    @staticmethod
+    def setup_face_up_by_rules(combined: List[Card], high_value_threshold: int) -> List[Card]:
         # Group cards by value for easier selection
-        value_groups = self.card_utils.group_cards_by_value(combined)
-        high_value_threshold = 9
+        value_groups = CardUtils.group_cards_by_value(combined)
 
         prioritised_cards = []
 
@@ -31,6 +74,7 @@ class AILogic:
                 if value >= high_value_threshold and len(cards) >= 2:
                     needed = 3 - len(prioritised_cards)
                     prioritised_cards.extend(cards[:needed])
+                    del value_groups[value]
                     if len(prioritised_cards) >= 3:
                         break
 
@@ -40,6 +84,7 @@ class AILogic:
                 if value >= high_value_threshold:
                     needed = 3 - len(prioritised_cards)
                     prioritised_cards.extend(cards[:needed])
+                    del value_groups[value]
                     if len(prioritised_cards) >= 3:
                         break
 
@@ -54,26 +99,19 @@ class AILogic:
 
         # Fill remaining slots with highest-value cards
         if len(prioritised_cards) < 3:
-            remaining = [card for card in combined if card not in prioritised_cards]
+            remaining = CardUtils.cards_without(combined, prioritised_cards)
             remaining.sort(key=lambda c: c.value, reverse=True)
             needed = 3 - len(prioritised_cards)
             prioritised_cards.extend(remaining[:needed])
 
         # Select exactly 3 cards for face-up (no more, no less)
-        face_up_cards = prioritised_cards[:3]
-
-        # Create hand from remaining cards
-        hand_cards = [card for card in combined if card not in face_up_cards]
-
-        # Update player's cards
-        player.face_up = face_up_cards
-        player.hand = hand_cards
+        return prioritised_cards[:3]
 
     def get_best_ai_play(self, player: Player, playable_sets: List[List[Card]]) -> Optional[List[Card]]:
         non_eights = [s for s in playable_sets if s[0].value != 8]
         eights = [s for s in playable_sets if s[0].value == 8]
 
-        if len(player.hand) <= 3 and eights:
+        if len(player.hand) <= self.params.eights_hand_limit and eights:
             return min(eights, key=lambda s: len(s))
 
         if non_eights:
@@ -90,11 +128,8 @@ class AILogic:
             return None
 
         # Check if any opponent has exactly one face-down card
-        opponent_one_face_down = False
-        for p in self.game.players:
-            if p != player and len(p.face_down) == 1 and not p.hand and not p.face_up:
-                opponent_one_face_down = True
-                break
+        seat = player.seat if player else None
+        opponent_one_face_down = self.game.zones.opponents_on_last_card(seat) > 0
 
         # Separate special and non-special sets
         non_special = [s for s in playable_sets if s[0].value not in [2, 7, 8, 10]]
@@ -105,32 +140,32 @@ class AILogic:
         valid_non_special = [s for s in non_special if self.card_utils._base_card_value(s[0]) >= top_pile_value]
 
         # Check for four-of-a-kind burn opportunity
-        if len(self.game.pile) >= 3:
-            last_three = self.game.pile[-3:]
-            if all(card.value == last_three[0].value for card in last_three):
-                matching_sets = [s for s in valid_non_special if s[0].value == last_three[0].value]
-                if matching_sets:
-                    return min(matching_sets, key=len)
+        pile = self.game.pile
+        if pile.run_length >= 3:
+            matching_sets = [s for s in valid_non_special if s[0].value == pile.run_rank]
+            if matching_sets:
+                return min(matching_sets, key=len)
 
         # Strategy based on game state
         if opponent_one_face_down and valid_non_special:
             return max(valid_non_special, key=lambda s: (s[0].value, len(s)))
 
-        if player and len(player.hand) <= 3 and eights:
+        if player and len(player.hand) <= self.params.eights_hand_limit and eights:
             return min(eights, key=len)
 
         if top_pile_value == 14 and any(s[0].value == 7 for s in special_no_eights):
             sevens = [s for s in special_no_eights if s[0].value == 7]
             return min(sevens, key=len)
 
-        if top_pile_value >= 10 and any(s[0].value == 2 for s in special_no_eights):
+        if top_pile_value >= self.params.twos_pile_threshold and any(
+                s[0].value == 2 for s in special_no_eights):
             twos = [s for s in special_no_eights if s[0].value == 2]
             return min(twos, key=len)
 
         if top_pile_value <= 9 and valid_non_special:
             return min(valid_non_special, key=lambda s: (s[0].value, len(s)))
 
-        if player and len(player.hand) > 10 and valid_non_special:
+        if player and len(player.hand) > self.params.large_hand_limit and valid_non_special:
             return max(valid_non_special, key=len)
 
         if valid_non_special:
@@ -143,3 +178,18 @@ class AILogic:
             return min(eights, key=len)
 
         return None
+
+    def choose_playable_set_by(self, deadline: float, playable_sets: List[List[Card]], top_pile_value: int,
+                               player: Player) -> Decision:
+        start = time.perf_counter()
+        # The rule-based choice is always available immediately and is returned if the search cannot improve on it
+        fallback = self.computer_choose_playable_set(playable_sets, top_pile_value, player)
+        if self.search is None and self.game.move_time_budget is not None:
+            # Giving the game a move budget opts its computer seats into searching within it
+            self.search = AnytimeSearch(self.game)
+        if self.search is None or not playable_sets:
+            decision = Decision(fallback, "rules", elapsed=time.perf_counter() - start)
+        else:
+            decision = self.search.choose(player, playable_sets, fallback, deadline)
+        self.last_decision = decision
+        return decision
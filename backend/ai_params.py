@@ -0,0 +1,77 @@
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+from backend.file_utils import write_json_atomic
+
+DEFAULT_PARAMS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ai_params.json")
+PARAMS_PATH_ENV = "SHITHEAD_AI_PARAMS"
+
+logger = logging.getLogger(__name__)
+
+
+class AIParams:
+    # name -> (default, lower bound, upper bound); the order fixes the layout of the parameter vector
+    SPEC = {
+        "high_value_threshold": (9, 2, 14),  # setup: lowest value worth keeping face-up
+        "eights_hand_limit": (3, 0, 20),  # play an 8 while the hand holds at most this many cards
+        "large_hand_limit": (10, 0, 52),  # above this hand size, shed the largest valid set
+        "twos_pile_threshold": (10, 2, 15),  # reset with a 2 once the pile value reaches this
+    }
+
+    def __init__(self, **values: int):
+        unknown = set(values) - set(self.SPEC)
+        if unknown:
+            raise ValueError(f"Unknown AI parameters: {', '.join(sorted(unknown))}")
+        for name, (default, _, _) in self.SPEC.items():
+            setattr(self, name, int(values.get(name, default)))
+
+    @classmethod
+    def names(cls) -> List[str]:
+        return list(cls.SPEC)
+
+    @classmethod
+    def from_vector(cls, vector: List[float]) -> "AIParams":
+        values = {}
+        for (name, (_, low, high)), value in zip(cls.SPEC.items(), vector):
+            values[name] = min(high, max(low, int(round(value))))
+        return cls(**values)
+
+    def to_vector(self) -> List[float]:
+        return [float(getattr(self, name)) for name in self.SPEC]
+
+    def to_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.SPEC}
+
+    def save(self, path: str):
+        # Indented, as the tuned parameters are meant to be read and reviewed
+        write_json_atomic(path, self.to_dict(), indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "AIParams":
+        with open(path) as f:
+            return cls(**json.load(f))
+
+    def __eq__(self, other):
+        return isinstance(other, AIParams) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"AIParams({', '.join(f'{k}={v}' for k, v in self.to_dict().items())})"
+
+
+_startup_params: Optional[AIParams] = None
+
+
+def load_startup_params() -> AIParams:
+    # Read once per process: the env var wins, then a tuned file next to this module, then the defaults
+    global _startup_params
+    if _startup_params is None:
+        path = os.environ.get(PARAMS_PATH_ENV, DEFAULT_PARAMS_PATH)
+        if os.path.exists(path):
+            _startup_params = AIParams.load(path)
+            logger.info("Loaded AI parameters from %s: %s", path, _startup_params.to_dict())
+        else:
+            _startup_params = AIParams()
+            logger.info("No AI parameter file at %s; using the defaults", path)
+    return _startup_params
@@ -0,0 +1,232 @@
+import csv
+import json
+import os
+import sys
+from multiprocessing import Pool
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from backend.game_logic import CardGame
+from backend.models import Card, Player
+from backend.perft import generate_moves
+from backend.search import AnytimeSearch
+from backend.simulation import new_selfplay_game
+
+RANK_CHARS = "23456789TJQKA"  # index + 2 is the rank
+UNKNOWN = "?"
+SEED_PREFIX = "seed:"
+CSV_FIELDS = ("position", "spec", "seat", "rank", "move", "score", "rollouts", "rules_choice")
+
+
+def _rank_char(rank: int) -> str:
+    return RANK_CHARS[rank - 2]
+
+
+def _parse_ranks(text: str) -> List[Optional[int]]:
+    # None for an unknown card
+    ranks = []
+    for char in text.upper():
+        if char == UNKNOWN:
+            ranks.append(None)
+        elif char in RANK_CHARS:
+            ranks.append(RANK_CHARS.index(char) + 2)
+        else:
+            raise ValueError(f"Invalid card '{char}' in '{text}'; use {RANK_CHARS} or {UNKNOWN}")
+    return ranks
+
+
+def encode_position(game: CardGame, hide_from: Optional[int] = None) -> str:
+    # Seats as hand.face_up.face_down separated by "/", then |pile|deck|seat to move; the pile is listed
+    # bottom to top and the deck, like face-down cards, by count. With hide_from, the other seats' hands
+    # are written as unknown cards, as that seat sees them.
+    seats = []
+    for index, player in enumerate(game.players):
+        hidden = hide_from is not None and index != hide_from
+        hand = UNKNOWN * len(player.hand) if hidden else "".join(_rank_char(card.value) for card in player.hand)
+        face_up = "".join(_rank_char(card.value) for card in player.face_up)
+        seats.append(f"{hand}.{face_up}.{UNKNOWN * len(player.face_down)}")
+    pile = "".join(_rank_char(card.value) for card in game.pile)
+    return f"{'/'.join(seats)}|{pile}|{len(game.deck)}|{game.current_player}"
+
+
+def decode_position(text: str, seed: int = 0) -> CardGame:
+    # Rebuilds a game from encode_position's format without dealing or setting up. Face-down cards, the
+    # deck and any unknown hand cards are drawn, using seed, from the cards the known ranks leave over;
+    # cards missing from every zone count as burned.
+    try:
+        seats_text, pile_text, deck_text, current_text = text.strip().split("|")
+        seats = [seat.split(".") for seat in seats_text.split("/")]
+        deck_size = int(deck_text)
+        current = int(current_text)
+    except ValueError as err:
+        raise ValueError(f"Position must look like 'hand.face_up.face_down/...|pile|deck|seat', got '{text}'") from err
+    if any(len(zones) != 3 for zones in seats):
+        raise ValueError(f"Every seat needs hand, face-up and face-down zones separated by '.', got '{seats_text}'")
+    if not 0 <= current < len(seats):
+        raise ValueError(f"Seat to move {current} is not one of the {len(seats)} seats")
+
+    game = CardGame(seed=seed, verbose=False, num_players=len(seats))
+    pool = game.create_deck()
+    game.rng.shuffle(pool)
+
+    def take(rank: Optional[int]) -> Card:
+        if rank is None:
+            return pool.pop()
+        for index, card in enumerate(pool):
+            if card.value == rank:
+                return pool.pop(index)
+        raise ValueError(f"Position holds more {_rank_char(rank)}s than the deck has")
+
+    zones = [[_parse_ranks(zone) for zone in seat] for seat in seats]
+    pile_ranks = _parse_ranks(pile_text)
+    if None in pile_ranks:
+        raise ValueError("Pile cards must be known")
+    # Known cards first, so unknown ones can only come from what is left
+    known = [[[take(rank) for rank in zone if rank is not None] for zone in seat] for seat in zones]
+    pile = [take(rank) for rank in pile_ranks]
+    needed = deck_size + sum(zone.count(None) for seat in zones for zone in seat)
+    if needed > len(pool):
+        raise ValueError(f"Position needs {needed} unseen cards but only {len(pool)} are left")
+
+    names = ["Leo"] + ([f"Computer {i}" for i in range(1, len(seats))] if len(seats) > 2 else ["Computer"])
+    players = []
+    for name, seat_ranks, seat_known in zip(names, zones, known):
+        player = Player(name, is_computer=name != "Leo")
+        hand, face_up, face_down = (cards + [take(None) for rank in ranks if rank is None]
+                                    for ranks, cards in zip(seat_ranks, seat_known))
+        player.hand = sorted(hand, key=lambda card: card.value)
+        player.face_up = sorted(face_up, key=lambda card: card.value)
+        player.face_down = face_down
+        players.append(player)
+    game.deck = [take(None) for _ in range(deck_size)]
+    game.pile = pile
+    game.players = players
+    game.current_player = current
+    return game
+
+
+def position_after(seed: int, move: int, num_players: int = 2) -> CardGame:
+    # The self-play game for seed, stopped before its move-th turn (counting from 0)
+    game, seat_ais = new_selfplay_game(seed, num_players=num_players)
+    for turn in range(move):
+        if game.check_game_over():
+            raise ValueError(f"Game {seed} ended after {turn} turns, before move {move}")
+        seat = game.current_player
+        if not game.computer_turn(game.players[seat], ai_logic=seat_ais[seat]):
+            game.current_player = (seat + 1) % len(game.players)
+    if game.check_game_over():
+        raise ValueError(f"Game {seed} ended after {move} turns, before move {move}")
+    return game
+
+
+def load_position(spec: str, num_players: int = 2, seed: int = 0) -> CardGame:
+    # "seed:S:M" is move M of the self-play game with seed S; anything else is an encode_position string
+    if spec.startswith(SEED_PREFIX):
+        try:
+            game_seed, move = (int(part) for part in spec[len(SEED_PREFIX):].split(":"))
+        except ValueError as err:
+            raise ValueError(f"Seeded positions look like 'seed:SEED:MOVE', got '{spec}'") from err
+        return position_after(game_seed, move, num_players)
+    return decode_position(spec, seed)
+
+
+def _move_text(cards: Optional[List[Card]]) -> str:
+    return "".join(_rank_char(card.value) for card in cards) if cards else "pickup"
+
+
+def analyse_position(game: CardGame, rollouts: int, seed: int = 0, playout: str = "fast",
+                     rollout_turn_limit: int = 200) -> Tuple[int, List[dict]]:
+    # Every move perft generates for the seat to move, the tactical pickup of a non-empty pile included,
+    # ranked by its mean rollout score; a seat with no choice (nothing playable, or a blind face-down
+    # flip) gets a single forced row with no rollouts
+    seat = game.current_player
+    player = game.players[seat]
+    if player.can_play_from_face_down():
+        return seat, [{"rank": 1, "move": "face_down", "score": None, "rollouts": 0, "rules_choice": True}]
+    candidates = [move.cards for move in generate_moves(game, tactical_pickups=True)]  # None for the pickup
+    playable_sets = [cards for cards in candidates if cards is not None]
+    if not playable_sets:
+        return seat, [{"rank": 1, "move": "pickup", "score": None, "rollouts": 0, "rules_choice": True}]
+    top_value = game.card_utils.get_top_pile_value()
+    chosen = game.ai_logic.computer_choose_playable_set(playable_sets, top_value, player)
+    search = AnytimeSearch(game, seed=seed, playout=playout, rollout_turn_limit=rollout_turn_limit)
+    scores = search.evaluate(player, candidates, rollouts)
+    order = sorted(range(len(candidates)), key=lambda i: -scores[i])
+    return seat, [{"rank": rank, "move": _move_text(candidates[i]), "score": round(scores[i], 4),
+                   "rollouts": rollouts, "rules_choice": candidates[i] is not None and candidates[i] is chosen}
+                  for rank, i in enumerate(order, 1)]
+
+
+def _analyse(args: Tuple[int, str, int, int, int, str]) -> dict:
+    index, spec, num_players, rollouts, seed, playout = args
+    # Each position gets its own rollout stream, so results do not depend on which worker ran it
+    position_seed = seed * 1_000_003 + index
+    try:
+        game = load_position(spec, num_players, position_seed)
+        seat, moves = analyse_position(game, rollouts, position_seed, playout)
+    except ValueError as e:
+        return {"position": index, "spec": spec, "error": str(e)}
+    return {"position": index, "spec": spec, "seat": seat, "moves": moves}
+
+
+def analyse_positions(specs: Iterable[str], rollouts: int = 200, num_players: int = 2, workers: int = 1,
+                      seed: int = 0, playout: str = "fast") -> Iterator[dict]:
+    # Yields each position's result as soon as it is finished, so the order follows completion; the
+    # "position" field is the index of the spec in the input
+    jobs = ((index, spec, num_players, rollouts, seed, playout) for index, spec in enumerate(specs))
+    if workers <= 1:
+        yield from map(_analyse, jobs)
+        return
+    with Pool(workers) as pool:
+        yield from pool.imap_unordered(_analyse, jobs)
+
+
+def _read_specs(positions: List[str], path: Optional[str]) -> Iterator[str]:
+    yield from positions
+    if path:
+        with (sys.stdin if path == "-" else open(path)) as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield line
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rank every legal move of logged positions by rollouts.")
+    parser.add_argument("positions", nargs="*",
+                        help="'seed:SEED:MOVE' or an encoded position 'hand.up.down/...|pile|deck|seat'")
+    parser.add_argument("--file", help="one position per line ('-' for stdin)")
+    parser.add_argument("--rollouts", type=int, default=200, help="rollouts per move")
+    parser.add_argument("--players", type=int, default=2, help="seats in seeded games")
+    parser.add_argument("--playout", choices=("fast", "rules"), default="fast")
+    parser.add_argument("--seed", type=int, default=0, help="seeds hidden-card fills and rollouts")
+    parser.add_argument("--format", choices=("csv", "json"), default="csv")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+    if not args.positions and not args.file:
+        parser.error("give positions or --file")
+
+    writer = None
+    if args.format == "csv":
+        writer = csv.DictWriter(sys.stdout, CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+    failed = 0
+    for result in analyse_positions(_read_specs(args.positions, args.file), args.rollouts, args.players,
+                                    args.workers, args.seed, args.playout):
+        if "error" in result:
+            failed += 1
+            print(f"position {result['position']}: {result['error']}", file=sys.stderr)
+        elif writer is not None:
+            for move in result["moves"]:
+                writer.writerow({"position": result["position"], "spec": result["spec"], "seat": result["seat"],
+                                 **move})
+        else:
+            print(json.dumps(result))
+        sys.stdout.flush()
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import os
+from collections import Counter
+from multiprocessing import Pool
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.enums import GameOutcome
+from backend.game_stats import GameStats
+from backend.simulation import DEFAULT_MAX_TURNS, GameResult, new_selfplay_game, play_selfplay_game, \
+    run_selfplay_game
+
+MAX_RECORDED_SEEDS = 1000
+
+
+class BatchReport:
+    def __init__(self, num_players: int = 2, stats: Optional[GameStats] = None):
+        self.games = 0
+        self.outcomes = Counter()
+        self.wins = [0] * num_players
+        self.win_turns = 0
+        # (seed, outcome, turns) for games that did not finish, capped so huge runs stay small; only
+        # for replaying seeds, as the length distribution comes from every game in stopped_lengths
+        self.stopped: List[Tuple[int, str, int]] = []
+        self.stopped_lengths: Dict[str, Counter] = {}  # outcome value -> turns -> games
+        self.stats = stats  # pickup, phase and face-down sketches, only when the batch collects them
+
+    def add(self, result: GameResult):
+        self.games += 1
+        self.outcomes[result.outcome.value] += 1
+        if result.outcome is GameOutcome.WIN:
+            self.wins[result.winner] += 1
+            self.win_turns += result.turns
+            return
+        self.stopped_lengths.setdefault(result.outcome.value, Counter())[result.turns] += 1
+        if len(self.stopped) < MAX_RECORDED_SEEDS:
+            self.stopped.append((result.seed, result.outcome.value, result.turns))
+
+    def merge(self, other: "BatchReport"):
+        self.games += other.games
+        self.outcomes.update(other.outcomes)
+        self.wins = [a + b for a, b in zip(self.wins, other.wins)]
+        self.win_turns += other.win_turns
+        for outcome, lengths in other.stopped_lengths.items():
+            self.stopped_lengths.setdefault(outcome, Counter()).update(lengths)
+        self.stopped.extend(other.stopped[:MAX_RECORDED_SEEDS - len(self.stopped)])
+        if other.stats is not None:
+            if self.stats is None:
+                self.stats = GameStats()
+            self.stats.merge(other.stats)
+
+    def to_dict(self) -> dict:
+        data = {
+            "games": self.games,
+            "outcomes": dict(self.outcomes),
+            "wins": self.wins,
+            "win_turns": self.win_turns,
+            "stopped": self.stopped,
+            "stopped_lengths": {outcome: {str(turns): games for turns, games in lengths.items()}
+                                for outcome, lengths in self.stopped_lengths.items()},
+        }
+        if self.stats is not None:
+            data["stats"] = self.stats.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BatchReport":
+        report = cls(len(data["wins"]))
+        report.games = data["games"]
+        report.outcomes = Counter(data["outcomes"])
+        report.wins = list(data["wins"])
+        report.win_turns = data["win_turns"]
+        report.stopped = [tuple(entry) for entry in data["stopped"]]
+        report.stopped_lengths = {outcome: Counter({int(turns): games for turns, games in lengths.items()})
+                                  for outcome, lengths in data["stopped_lengths"].items()}
+        if "stats" in data:
+            report.stats = GameStats.from_dict(data["stats"])
+        return report
+
+    def length_quantiles(self, outcome: GameOutcome, quantiles=(0.5, 0.9, 0.99, 1.0)) -> List[int]:
+        lengths = self.stopped_lengths.get(outcome.value)
+        if not lengths:
+            return []
+        games = sum(lengths.values())
+        ordered = sorted(lengths.items())
+        result = []
+        for q in quantiles:
+            rank = min(games - 1, int(q * games))
+            seen = 0
+            for turns, count in ordered:
+                seen += count
+                if seen > rank:
+                    result.append(turns)
+                    break
+        return result
+
+    def mean_length(self, outcome: GameOutcome) -> float:
+        lengths = self.stopped_lengths.get(outcome.value)
+        if not lengths:
+            return 0.0
+        return sum(turns * games for turns, games in lengths.items()) / sum(lengths.values())
+
+    def format(self) -> str:
+        lines = [f"Games: {self.games}"]
+        for outcome in GameOutcome:
+            count = self.outcomes[outcome.value]
+            rate = count / self.games if self.games else 0.0
+            lines.append(f"  {outcome.value:<8} {count:>8}  ({rate:.3%})")
+        if self.outcomes[GameOutcome.WIN.value]:
+            lines.append(f"Mean turns (finished): {self.win_turns / self.outcomes[GameOutcome.WIN.value]:.1f}")
+        lines.append("Wins by seat: " + ", ".join(f"{seat}={wins}" for seat, wins in enumerate(self.wins)))
+        for outcome in (GameOutcome.DRAWN, GameOutcome.ABORTED):
+            quantiles = self.length_quantiles(outcome)
+            if quantiles:
+                lines.append(f"{outcome.value} length: mean={self.mean_length(outcome):.1f} p50={quantiles[0]} "
+                             f"p90={quantiles[1]} p99={quantiles[2]} max={quantiles[3]}")
+        if self.stopped:
+            seeds = " ".join(str(seed) for seed, _, _ in self.stopped[:20])
+            lines.append(f"Pathological seeds (replay with --replay SEED): {seeds}")
+        if self.stats is not None:
+            lines.append(self.stats.format())
+        return "\n".join(lines)
+
+
+def run_seed_chunk(args: Tuple[List[int], int, int, bool]) -> BatchReport:
+    seeds, max_turns, num_players, collect_stats = args
+    report = BatchReport(num_players, GameStats() if collect_stats else None)
+    for seed in seeds:
+        report.add(play_selfplay_game(seed, max_turns=max_turns, num_players=num_players, stats=report.stats))
+    return report
+
+
+def run_batch(seeds: Iterable[int], workers: int = 1, max_turns: int = DEFAULT_MAX_TURNS, num_players: int = 2,
+              chunk_size: int = 200, tables_dir: Optional[str] = None, use_tables: bool = False,
+              collect_stats: bool = False) -> BatchReport:
+    seeds = list(seeds)
+    chunks = [(seeds[i:i + chunk_size], max_turns, num_players, collect_stats)
+              for i in range(0, len(seeds), chunk_size)]
+    report = BatchReport(num_players)
+    tables = None
+    if use_tables:
+        from backend import tables as rule_tables
+
+        # Build (or validate) the cache once here, so each worker only maps the finished file
+        tables = rule_tables.load_tables(tables_dir)
+    if workers > 1:
+        initializer = rule_tables.use_tables if tables is not None else None
+        with Pool(workers, initializer=initializer, initargs=(tables_dir,)) as pool:
+            for chunk_report in pool.imap_unordered(run_seed_chunk, chunks):
+                report.merge(chunk_report)
+    else:
+        if tables is not None:
+            rule_tables.install_tables(tables)
+        try:
+            for chunk in chunks:
+                report.merge(run_seed_chunk(chunk))
+        finally:
+            if tables is not None:
+                rule_tables.install_tables(None)
+    if tables is not None:
+        tables.close()
+    return report
+
+
+def replay(seed: int, max_turns: int = DEFAULT_MAX_TURNS, num_players: int = 2) -> GameResult:
+    game, seat_ais = new_selfplay_game(seed, num_players=num_players, verbose=True)
+    return run_selfplay_game(game, seat_ais, seed, max_turns)
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run seeded computer-vs-computer games and report outcomes.")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--replay", type=int, help="replay one seed with the full game log")
+    parser.add_argument("--tables", action="store_true", help="use the memory-mapped precomputed rule tables")
+    parser.add_argument("--tables-dir", help="table cache directory (see backend.tables)")
+    parser.add_argument("--stats", action="store_true",
+                        help="also report pickup sizes, hand sizes, turns per phase and face-down flips")
+    args = parser.parse_args(argv)
+
+    if args.replay is not None:
+        print(replay(args.replay, args.max_turns, args.players))
+        return
+    report = run_batch(range(args.first_seed, args.first_seed + args.games), args.workers, args.max_turns,
+                       args.players, tables_dir=args.tables_dir, use_tables=args.tables,
+                       collect_stats=args.stats)
+    print(report.format())
+
+
+if __name__ == "__main__":
+    main()
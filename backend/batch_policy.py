@@ -0,0 +1,189 @@
+from itertools import combinations
+from typing import List, Optional, Sequence
+
+from backend.ai_params import AIParams, load_startup_params
+from backend.models import Card, Player
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; states can still be encoded, but deciding them needs it
+    np = None
+
+# One row per decision. The active zone is encoded as rank counts while the player still holds a hand,
+# and as the face-up cards' ranks in order once it is empty, because face-up sets are position
+# combinations whose first card decides how the rules classify them.
+COUNTS = slice(0, 15)
+FACE_UP = slice(15, 18)
+HAND_SIZE = 18
+PILE_VALUE = 19
+BURN_RANK = 20  # rank of the top three pile cards when they match, else 0
+OPPONENTS_ON_LAST = 21  # opponents down to a single face-down card
+PHASE = 22
+STATE_WIDTH = 23
+
+HAND_PHASE = 0
+FACE_UP_PHASE = 1
+OTHER_PHASE = 2  # face-down or finished; the rule chain is not consulted
+
+FACE_UP_SLOTS = 3
+FACE_UP_FLAG = 1 << 8
+PASS = 0
+# Face-up position masks in the order CardUtils.find_playable_combinations generates them
+FACE_UP_MASKS = [sum(1 << slot for slot in combo)
+                 for size in range(1, FACE_UP_SLOTS + 1) for combo in combinations(range(FACE_UP_SLOTS), size)]
+
+NON_SPECIAL_RANKS = (3, 4, 5, 6, 9, 11, 12, 13, 14)
+
+
+def hand_move(rank: int, count: int) -> int:
+    return rank << 4 | count
+
+
+def encode_state(game, player: Player) -> List[int]:
+    row = [0] * STATE_WIDTH
+    if player.hand:
+        row[PHASE] = HAND_PHASE
+        for card in player.hand:
+            row[card.value] += 1
+    elif player.face_up:
+        row[PHASE] = FACE_UP_PHASE
+        for slot, card in enumerate(player.face_up[:FACE_UP_SLOTS]):
+            row[FACE_UP.start + slot] = card.value
+    else:
+        row[PHASE] = OTHER_PHASE
+    row[HAND_SIZE] = len(player.hand)
+    row[PILE_VALUE] = game.card_utils.get_top_pile_value()
+    if game.pile.run_length >= 3:
+        row[BURN_RANK] = game.pile.run_rank
+    row[OPPONENTS_ON_LAST] = game.zones.opponents_on_last_card(player.seat)
+    return row
+
+
+def cards_for_move(player: Player, move: int) -> Optional[List[Card]]:
+    # Maps a move back to the exact cards the scalar rules would have returned
+    if move == PASS:
+        return None
+    if move & FACE_UP_FLAG:
+        return [card for slot, card in enumerate(player.face_up) if move >> slot & 1]
+    rank, count = move >> 4, move & 15
+    return [card for card in player.hand if card.value == rank][:count]
+
+
+def _first(condition):
+    # Index of the first True per row (0 when there is none), so ties resolve in generation order
+    return np.argmax(condition, axis=1)
+
+
+def _decide_hand(states, params: AIParams):
+    counts = states[:, COUNTS]
+    pile_value = states[:, PILE_VALUE]
+    hand_size = states[:, HAND_SIZE]
+    rows = np.arange(len(states))
+    ranks = np.arange(15)
+
+    non_special = np.isin(ranks, NON_SPECIAL_RANKS)
+    valid = (counts > 0) & non_special & (ranks >= pile_value[:, None])
+    has_valid = valid.any(axis=1)
+    lowest = np.argmax(valid, axis=1)
+    highest = 14 - np.argmax(valid[:, ::-1], axis=1)
+    # Largest valid set, lowest rank first on ties like max() over the hand's sorted groups
+    largest = np.argmax(np.where(valid, counts, -1), axis=1)
+    burn_rank = states[:, BURN_RANK]
+    burn = (burn_rank > 0) & valid[rows, burn_rank]
+    twos, sevens, eights, tens = (counts[:, rank] > 0 for rank in (2, 7, 8, 10))
+    lowest_special = np.where(twos, 2, np.where(sevens, 7, 10))
+
+    conditions = [
+        burn,
+        (states[:, OPPONENTS_ON_LAST] > 0) & has_valid,
+        (hand_size <= params.eights_hand_limit) & eights,
+        (pile_value == 14) & sevens,
+        (pile_value >= params.twos_pile_threshold) & twos,
+        (pile_value <= 9) & has_valid,
+        (hand_size > params.large_hand_limit) & has_valid,
+        has_valid,
+        twos | sevens | tens,
+        eights,
+    ]
+    choices = [
+        hand_move(burn_rank, 1),
+        hand_move(highest, counts[rows, highest]),
+        hand_move(8, 1),
+        hand_move(7, 1),
+        hand_move(2, 1),
+        hand_move(lowest, 1),
+        hand_move(largest, counts[rows, largest]),
+        hand_move(lowest, counts[rows, lowest]),
+        hand_move(lowest_special, 1),
+        hand_move(8, 1),
+    ]
+    return np.select(conditions, choices, PASS)
+
+
+def _decide_face_up(states, params: AIParams):
+    slots = states[:, FACE_UP]
+    pile_value = states[:, PILE_VALUE]
+    masks = np.array(FACE_UP_MASKS)
+    members = (masks[:, None] >> np.arange(FACE_UP_SLOTS)) & 1 == 1  # mask x slot
+    sizes = members.sum(axis=1)
+    first_slot = np.argmax(members, axis=1)
+
+    special = np.isin(slots, (2, 7, 8, 10))
+    legal = (slots > 0) & (special | (slots >= pile_value[:, None]))
+    # A combination exists when every slot it uses holds a legal card
+    exists = (legal[:, None, :] | ~members[None]).all(axis=2)
+    first = slots[:, first_slot]
+    valid = exists & np.isin(first, NON_SPECIAL_RANKS)
+    twos, sevens, eights = (exists & (first == rank) for rank in (2, 7, 8))
+    specials = exists & np.isin(first, (2, 7, 10))
+    has_valid = valid.any(axis=1)
+    burn_rank = states[:, BURN_RANK]
+    burn = valid & (first == burn_rank[:, None])
+    hand_size = states[:, HAND_SIZE]
+    unused = np.iinfo(np.int64).max
+
+    conditions = [
+        burn.any(axis=1),
+        (states[:, OPPONENTS_ON_LAST] > 0) & has_valid,
+        (hand_size <= params.eights_hand_limit) & eights.any(axis=1),
+        (pile_value == 14) & sevens.any(axis=1),
+        (pile_value >= params.twos_pile_threshold) & twos.any(axis=1),
+        (pile_value <= 9) & has_valid,
+        (hand_size > params.large_hand_limit) & has_valid,
+        has_valid,
+        specials.any(axis=1),
+        eights.any(axis=1),
+    ]
+    # Masks are generated shortest first, so the first match of a kind is also the shortest
+    picks = [
+        _first(burn),
+        np.argmax(np.where(valid, first * 4 + sizes, -1), axis=1),
+        _first(eights),
+        _first(sevens),
+        _first(twos),
+        np.argmin(np.where(valid, first * 4 + sizes, unused), axis=1),
+        np.argmax(np.where(valid, sizes, -1), axis=1),
+        np.argmin(np.where(valid, first * 4 + (FACE_UP_SLOTS - sizes), unused), axis=1),
+        np.argmin(np.where(specials, first, unused), axis=1),
+        _first(eights),
+    ]
+    chosen = np.select(conditions, picks, -1)
+    return np.where(chosen >= 0, FACE_UP_FLAG | masks[chosen], PASS)
+
+
+def decide_batch(states, params: Optional[AIParams] = None):
+    # Vectorised AILogic.computer_choose_playable_set: one move per encoded state, PASS when nothing is playable
+    if np is None:
+        raise ImportError("decide_batch requires NumPy")
+    params = params if params is not None else load_startup_params()
+    states = np.asarray(states, dtype=np.int64).reshape(-1, STATE_WIDTH)
+    phase = states[:, PHASE]
+    return np.select([phase == HAND_PHASE, phase == FACE_UP_PHASE],
+                     [_decide_hand(states, params), _decide_face_up(states, params)], PASS)
+
+
+def decide_games(games: Sequence, params: Optional[AIParams] = None) -> List[Optional[List[Card]]]:
+    # Chooses for the current player of every game at once, e.g. to step many games in lockstep
+    players = [game.players[game.current_player] for game in games]
+    moves = decide_batch([encode_state(game, player) for game, player in zip(games, players)], params)
+    return [cards_for_move(player, int(move)) for player, move in zip(players, moves)]
@@ -1,8 +1,11 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, TYPE_CHECKING
 from backend.enums import Suit
 from backend.models import Card, Player
 from itertools import combinations
 
+if TYPE_CHECKING:
+    from backend.tables import RuleTables
+
 
 class CardUtils:
     FACE_VALUES = {
@@ -11,11 +14,23 @@ class CardUtils:
         'j': 11, 'q': 12, 'k': 13
     }
 
+    # Precomputed rule tables shared by every game in the process; see backend.tables.install_tables
+    tables: Optional["RuleTables"] = None
+
     def __init__(self, game):
         self.game = game
 
-    def create_deck(self) -> List[Card]:
-        return [Card(value, suit) for suit in Suit for value in range(2, 15)]
+    def create_deck(self, decks: int = 1) -> List[Card]:
+        return [Card(value, suit) for _ in range(decks) for suit in Suit for value in range(2, 15)]
+
+    @staticmethod
+    def cards_without(cards: List[Card], removed: List[Card]) -> List[Card]:
+        # Removes one occurrence per removed card, so identical cards from a second deck survive
+        remaining = list(cards)
+        for card in removed:
+            if card in remaining:
+                remaining.remove(card)
+        return remaining
 
     @staticmethod
     def group_cards_by_value(cards: List[Card]) -> Dict[int, List[Card]]:
@@ -40,6 +55,36 @@ class CardUtils:
         return self.get_pile_top_value_for_comparison(self.game.pile) or 0
 
     def can_play_cards(self, cards: List[Card]) -> bool:
+        tables = self.tables
+        if tables is None:
+            return self.can_play_cards_by_rules(cards)
+        if not cards:
+            return False
+
+        # Every legal-play check reduces to one predicate on (rank, value to beat), which the table holds
+        play = tables.play
+        first = cards[0].value
+        if self.game.players[self.game.current_player].hand:
+            non_eights = None
+            for card in cards:
+                if card.value != first:
+                    non_eights = [card for card in cards if card.value != 8]
+                    break
+            if non_eights is None:
+                return play[first * 15 + self.get_top_pile_value()] == 1
+            if len(non_eights) != 1:
+                return False
+            pile = self.game.pile
+            underlying_value = self.get_pile_top_value_for_comparison(pile[:-1]) or 0 if pile else 0
+            return play[non_eights[0].value * 15 + underlying_value] == 1
+
+        pile_value = self.get_top_pile_value()
+        for card in cards:
+            if not play[card.value * 15 + pile_value]:
+                return False
+        return True
+
+    def can_play_cards_by_rules(self, cards: List[Card]) -> bool:
         if not cards:
             return False
 
@@ -95,28 +140,34 @@ class CardUtils:
         return playable
 
     def play_cards(self, player: Player, cards: List[Card]) -> bool:
-        new_hand = [card for card in player.hand if card not in cards]
+        # One pass moves each card from its zone to the pile in place; removing from a sorted hand keeps
+        # it sorted, and nothing here builds a new list
+        hand = player.hand
+        pile = self.game.pile
         for card in cards:
-            if card in player.face_up:
+            if card in hand:
+                hand.remove(card)
+            elif card in player.face_up:
                 player.face_up.remove(card)
             elif card in player.face_down:
                 player.face_down.remove(card)
-        player.hand = new_hand
-
-        self.game.pile.extend(cards)
+            pile.append(card)
+            if card.value in (2, 7, 8, 10):
+                self.game.specials_played += 1
+        self.game.zones.update(player)
         card_value = cards[-1].value
 
         if card_value == 10:
-            print(f"Pile burned! {len(self.game.pile)} cards removed.")
+            self.game.log(f"Pile burned! {len(pile)} cards removed.")
             self.game.pile = []
+            self.game.burns += 1
             return True
 
-        if len(self.game.pile) >= 4:
-            last_four = self.game.pile[-4:]
-            if all(card.value == last_four[0].value for card in last_four):
-                print(f"4 of a kind played! Pile burned! {len(self.game.pile)} cards removed.")
-                self.game.pile = []
-                return True
+        if pile.run_length >= 4:
+            self.game.log(f"4 of a kind played! Pile burned! {len(pile)} cards removed.")
+            self.game.pile = []
+            self.game.burns += 1
+            return True
 
         if card_value == 8:
             return True
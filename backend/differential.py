@@ -0,0 +1,233 @@
+import os
+import time
+from abc import ABC, abstractmethod
+from itertools import zip_longest
+from multiprocessing import Pool
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+
+from backend.card_utils import CardUtils
+from backend.simulation import DEFAULT_MAX_TURNS, new_selfplay_game
+from backend.trace import TraceRecorder, TurnRecord, trace_game
+
+CONTEXT_TURNS = 5  # agreeing turns kept before a divergence
+
+
+class Engine(ABC):
+    # One implementation of the rules, seen only through the records it produces for a seeded self-play
+    # game; an optimised fork registers a subclass and yields the same TurnRecords as the reference
+    name = ""
+
+    @classmethod
+    def prepare(cls):
+        # Runs once in the parent before any worker starts, for setup the workers should share
+        pass
+
+    @abstractmethod
+    def trace(self, seed: int, num_players: int, max_turns: int) -> Iterator[TurnRecord]:
+        ...
+
+
+ENGINES: Dict[str, Type[Engine]] = {}
+
+
+def register_engine(name: str):
+    def register(cls: Type[Engine]) -> Type[Engine]:
+        if cls.__abstractmethods__:
+            raise TypeError(f"Engine '{name}' does not implement {', '.join(sorted(cls.__abstractmethods__))}")
+        cls.name = name
+        ENGINES[name] = cls
+        return cls
+    return register
+
+
+def create_engine(name: str) -> Engine:
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine '{name}'; registered: {', '.join(sorted(ENGINES))}")
+    return ENGINES[name]()
+
+
+@register_engine("reference")
+class ReferenceEngine(Engine):
+    # CardGame and CardUtils deciding every rule from the cards, with no precomputed tables installed
+    def trace(self, seed: int, num_players: int, max_turns: int) -> Iterator[TurnRecord]:
+        from backend import tables as rule_tables
+
+        installed = CardUtils.tables
+        rule_tables.install_tables(None)
+        try:
+            game, _ = new_selfplay_game(seed, num_players=num_players)
+            yield from trace_game(game, max_turns)
+        finally:
+            rule_tables.install_tables(installed)
+
+
+@register_engine("tables")
+class TablesEngine(Engine):
+    # The same engine reading legality and setup from the memory-mapped rule tables (backend.tables)
+    def __init__(self):
+        self.tables = None
+
+    @classmethod
+    def prepare(cls):
+        from backend import tables as rule_tables
+
+        # Build or validate the cache once, so each worker only maps the finished file
+        rule_tables.load_tables().close()
+
+    def trace(self, seed: int, num_players: int, max_turns: int) -> Iterator[TurnRecord]:
+        from backend import tables as rule_tables
+
+        if self.tables is None:
+            self.tables = rule_tables.load_tables()
+        installed = CardUtils.tables
+        rule_tables.install_tables(self.tables)
+        try:
+            game, _ = new_selfplay_game(seed, num_players=num_players)
+            yield from trace_game(game, max_turns)
+        finally:
+            rule_tables.install_tables(installed)
+
+
+class Divergence:
+    def __init__(self, seed: int, engines: Tuple[str, str], num_players: int, context: List[TurnRecord],
+                 first: Optional[TurnRecord], second: Optional[TurnRecord]):
+        self.seed = seed
+        self.engines = engines
+        self.num_players = num_players
+        self.context = context  # the last agreeing records, oldest first
+        self.first = first  # None when that engine's game ended earlier
+        self.second = second
+
+    @property
+    def turn(self) -> int:
+        return (self.first or self.second).turn
+
+    def reproduction(self) -> str:
+        return (f"python -m backend.differential {self.engines[0]} {self.engines[1]} --seed {self.seed} "
+                f"--players {self.num_players} --show")
+
+    def format(self) -> str:
+        lines = [f"Seed {self.seed} diverges at turn {self.turn}:"]
+        lines.extend(f"  = {line}" for line in TraceRecorder(self.context).lines())
+        for name, record in zip(self.engines, (self.first, self.second)):
+            shown = next(TraceRecorder([record]).lines()) if record is not None else "(game over)"
+            lines.append(f"  {name}: {shown}")
+        lines.append(f"Reproduce: {self.reproduction()}")
+        return "\n".join(lines)
+
+
+def compare_seed(seed: int, first: Engine, second: Engine, num_players: int = 2,
+                 max_turns: int = DEFAULT_MAX_TURNS) -> Tuple[Optional[Divergence], int]:
+    # Engines may keep process-wide state (installed tables), so the first trace is finished before the
+    # second starts; the second stops at the first record that differs. Returns the divergence, if any,
+    # and the number of records compared.
+    expected = list(first.trace(seed, num_players, max_turns))
+    compared = 0
+    actual = second.trace(seed, num_players, max_turns)
+    try:
+        for record, other in zip_longest(expected, actual):
+            if record != other:
+                context = expected[max(0, compared - CONTEXT_TURNS):compared]
+                return Divergence(seed, (first.name, second.name), num_players, context, record, other), compared
+            compared += 1
+    finally:
+        actual.close()
+    return None, compared
+
+
+class DiffReport:
+    def __init__(self):
+        self.games = 0
+        self.turns = 0
+        self.divergence: Optional[Divergence] = None
+        self.elapsed = 0.0
+
+    def format(self) -> str:
+        rate = self.games / self.elapsed if self.elapsed else 0.0
+        lines = [f"Games: {self.games}, turns compared: {self.turns} ({rate:.0f} games/s)"]
+        lines.append(self.divergence.format() if self.divergence else "No divergence")
+        return "\n".join(lines)
+
+
+_engines: Dict[str, Engine] = {}
+
+
+def _engine(name: str) -> Engine:
+    # One instance per process, so an engine's setup (mapping its tables) is paid once per worker
+    if name not in _engines:
+        _engines[name] = create_engine(name)
+    return _engines[name]
+
+
+def _diff_chunk(args: Tuple[List[int], str, str, int, int]) -> Tuple[int, int, Optional[Divergence]]:
+    seeds, first, second, num_players, max_turns = args
+    turns = 0
+    for index, seed in enumerate(seeds):
+        divergence, compared = compare_seed(seed, _engine(first), _engine(second), num_players, max_turns)
+        turns += compared
+        if divergence is not None:
+            return index + 1, turns, divergence
+    return len(seeds), turns, None
+
+
+def run_differential(first: str, second: str, seeds: range, num_players: int = 2, workers: int = 1,
+                     chunk_size: int = 500, max_turns: int = DEFAULT_MAX_TURNS) -> DiffReport:
+    # Chunks are folded in seed order, so the reported divergence is the lowest diverging seed whatever the
+    # number of workers; the run stops as soon as it is known
+    for name in (first, second):
+        create_engine(name).prepare()
+    report = DiffReport()
+    start = time.perf_counter()
+    chunks = ((seeds[i:i + chunk_size], first, second, num_players, max_turns)
+              for i in range(0, len(seeds), chunk_size))
+    pool = Pool(workers) if workers > 1 else None
+    try:
+        results = pool.imap(_diff_chunk, chunks) if pool else map(_diff_chunk, chunks)
+        for games, turns, divergence in results:
+            report.games += games
+            report.turns += turns
+            if divergence is not None:
+                report.divergence = divergence
+                break
+    finally:
+        if pool:
+            pool.terminate()
+            pool.join()
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Play the same seeds through two engines and report the first "
+                                                 "turn where their traces differ.")
+    parser.add_argument("first", nargs="?", default="reference", help=f"engine, one of: {', '.join(ENGINES)}")
+    parser.add_argument("second", nargs="?", default="tables")
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--seed", type=int, help="check a single seed")
+    parser.add_argument("--show", action="store_true", help="print the first engine's trace for --seed")
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    if args.seed is not None:
+        if args.show:
+            records = create_engine(args.first).trace(args.seed, args.players, args.max_turns)
+            for line in TraceRecorder(list(records)).lines():
+                print(line)
+        seeds, workers = range(args.seed, args.seed + 1), 1
+    else:
+        seeds, workers = range(args.first_seed, args.first_seed + args.games), args.workers
+    report = run_differential(args.first, args.second, seeds, args.players, workers, args.chunk_size,
+                              args.max_turns)
+    print(report.format())
+    if report.divergence is not None:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,3 +6,9 @@ class Suit(Enum):
     DIAMONDS = "♦"
     CLUBS = "♣"
     SPADES = "♠"
+
+
+class GameOutcome(Enum):
+    WIN = "win"
+    DRAWN = "drawn"  # the suit-agnostic state repeated with no random event in between
+    ABORTED = "aborted"  # the turn cap was reached
@@ -0,0 +1,130 @@
+import json
+import os
+import random
+import time
+from multiprocessing import Pool
+from typing import List, Optional
+
+from backend.batch import BatchReport, run_seed_chunk
+from backend.file_utils import rng_state_from_json, write_json_atomic
+from backend.simulation import DEFAULT_MAX_TURNS
+
+
+class Experiment:
+    # A long self-play run over a seed stream drawn from a master RNG. Chunks are dispatched in order and
+    # results are folded in completion order of that sequence, so a checkpoint always describes a prefix
+    # of the stream: games done, the aggregate report and the RNG state right after that prefix.
+
+    def __init__(self, checkpoint_path: str, games: int = 10000, master_seed: int = 0, num_players: int = 2,
+                 max_turns: int = DEFAULT_MAX_TURNS, chunk_size: int = 500, checkpoint_interval: float = 30.0):
+        self.checkpoint_path = checkpoint_path
+        self.games = games
+        self.master_seed = master_seed
+        self.num_players = num_players
+        self.max_turns = max_turns
+        self.chunk_size = chunk_size
+        self.checkpoint_interval = checkpoint_interval
+        self.games_done = 0
+        self.report = BatchReport(num_players)
+        self.rng = random.Random(master_seed)
+
+    @classmethod
+    def resume(cls, checkpoint_path: str) -> "Experiment":
+        with open(checkpoint_path) as f:
+            state = json.load(f)
+        config = state["config"]
+        experiment = cls(checkpoint_path, **config)
+        experiment.games_done = state["games_done"]
+        experiment.report = BatchReport.from_dict(state["report"])
+        experiment.rng.setstate(rng_state_from_json(state["rng_state"]))
+        return experiment
+
+    def config(self) -> dict:
+        return {
+            "games": self.games,
+            "master_seed": self.master_seed,
+            "num_players": self.num_players,
+            "max_turns": self.max_turns,
+            "chunk_size": self.chunk_size,
+            "checkpoint_interval": self.checkpoint_interval,
+        }
+
+    def _checkpoint(self, games_done: int, rng_state):
+        write_json_atomic(self.checkpoint_path, {
+            "config": self.config(),
+            "games_done": games_done,
+            "report": self.report.to_dict(),
+            "rng_state": rng_state,
+        })
+
+    def _chunks(self, rng_states: List):
+        remaining = self.games - self.games_done
+        while remaining > 0:
+            size = min(self.chunk_size, remaining)
+            seeds = [self.rng.getrandbits(32) for _ in range(size)]
+            remaining -= size
+            rng_states.append(self.rng.getstate())
+            yield seeds, self.max_turns, self.num_players, False
+
+    def run(self, workers: int = 1, max_chunks: Optional[int] = None) -> BatchReport:
+        # max_chunks stops early after that many chunks, as if the process had been interrupted
+        rng_states: List = []
+        chunks = self._chunks(rng_states)
+        last_checkpoint = time.monotonic()
+        pool = Pool(workers) if workers > 1 else None
+        try:
+            results = pool.imap(run_seed_chunk, chunks) if pool else map(run_seed_chunk, chunks)
+            for index, chunk_report in enumerate(results):
+                self.report.merge(chunk_report)
+                self.games_done += chunk_report.games
+                now = time.monotonic()
+                finished = self.games_done >= self.games
+                stopping = max_chunks is not None and index + 1 >= max_chunks
+                if finished or stopping or now - last_checkpoint >= self.checkpoint_interval:
+                    self._checkpoint(self.games_done, rng_states[index])
+                    last_checkpoint = now
+                if stopping:
+                    break
+        finally:
+            if pool:
+                pool.terminate()
+                pool.join()
+        return self.report
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Long-running self-play experiments with checkpoint and resume.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="start a new experiment")
+    run_parser.add_argument("checkpoint")
+    run_parser.add_argument("--games", type=int, default=1000000)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--players", type=int, default=2)
+    run_parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    run_parser.add_argument("--chunk-size", type=int, default=500)
+    run_parser.add_argument("--checkpoint-interval", type=float, default=30.0, help="seconds between checkpoints")
+    run_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+
+    resume_parser = subparsers.add_parser("resume", help="continue an experiment from its checkpoint")
+    resume_parser.add_argument("checkpoint")
+    resume_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        if os.path.exists(args.checkpoint):
+            parser.error(f"{args.checkpoint} already exists; use 'resume' to continue it")
+        experiment = Experiment(args.checkpoint, args.games, args.seed, args.players, args.max_turns,
+                                args.chunk_size, args.checkpoint_interval)
+    else:
+        experiment = Experiment.resume(args.checkpoint)
+        print(f"Resuming at {experiment.games_done}/{experiment.games} games")
+
+    report = experiment.run(args.workers)
+    print(report.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import json
+import os
+from typing import Optional
+
+
+def write_json_atomic(path: str, payload: dict, indent: Optional[int] = None):
+    # Write beside the target and rename into place, so a crash never leaves a torn file behind
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def rng_state_from_json(state: list) -> tuple:
+    # random.Random.getstate() round-trips through JSON as nested lists
+    version, internal, gauss = state
+    return version, tuple(internal), gauss
+
+
+def write_bytes_atomic(path: str, payload: bytes):
+    # Unique temp name, so processes racing to build the same file never write into each other's copy
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
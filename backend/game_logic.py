@@ -1,70 +1,181 @@
+import math
 import random
-from typing import List, Optional
+import time
+from functools import cached_property
+from typing import TYPE_CHECKING, List, Optional, Sequence
 
-from backend.ai_logic import AILogic
-from backend.card_utils import CardUtils
-from backend.input_utils import InputUtils
-from backend.models import Card, Player
+from backend.enums import GameOutcome
+from backend.models import Card, Pile, Player, SeatZones
+from backend.state_hash import CycleDetector
+
+if TYPE_CHECKING:
+    from backend.ai_logic import AILogic
+    from backend.game_stats import GameObserver
+    from backend.strategies import Strategy, StrategySpec
+    from backend.card_utils import CardUtils
+    from backend.input_utils import InputUtils
+    from backend.renderer import ConsoleRenderer
+
+MIN_PLAYERS = 2
+MAX_PLAYERS = 6
+CARDS_PER_SEAT = 9
 
 
 class CardGame:
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None, verbose: bool = True, num_players: int = 2,
+                 strategies: Optional[Sequence[Optional["StrategySpec"]]] = None):
+        if not MIN_PLAYERS <= num_players <= MAX_PLAYERS:
+            raise ValueError(f"Number of players must be between {MIN_PLAYERS} and {MAX_PLAYERS}, got {num_players}")
+        if strategies is not None and len(strategies) != num_players:
+            raise ValueError(f"Expected one strategy per seat ({num_players}), got {len(strategies)}")
+        self.rng = random.Random(seed)
+        self.verbose = verbose
+        self.num_players = num_players
         self.deck: List[Card] = []
         self.players: List[Player] = []
-        self.pile: List[Card] = []
+        self.pile = Pile()
         self.current_player = 0
         self.game_over = None
         self.winner: Optional[Player] = None
-        self.card_utils = CardUtils(self)
-        self.ai_logic = AILogic(self)
-        self.input_utils = InputUtils(self)
+        self.outcome: Optional[GameOutcome] = None  # set when play_game ends
+        # Seconds per computer move; setting it makes rule-based seats search within it (see AILogic), None
+        # plays by rules alone
+        self.move_time_budget: Optional[float] = None
+        self.pickups = 0
+        self.burns = 0
+        self.specials_played = 0
+        # Statistics hooks (see backend.game_stats); each call site costs one None check when unset
+        self.observer: Optional["GameObserver"] = None
+        # Per-seat strategies (see backend.strategies); a seat without one plays by the default rules if it
+        # is a computer and by prompt otherwise
+        self.strategies: List[Optional["Strategy"]] = [None] * num_players
+        if strategies is not None:
+            from backend.strategies import create_strategies
+            self.strategies = create_strategies(strategies, self)
+
+    # Subsystems are imported and built on first use, so short-lived processes that never touch the AI,
+    # the prompt or the board display do not pay for loading them. Once built they are plain attributes.
+    @cached_property
+    def card_utils(self) -> "CardUtils":
+        from backend.card_utils import CardUtils
+        return CardUtils(self)
+
+    @cached_property
+    def ai_logic(self) -> "AILogic":
+        from backend.ai_logic import AILogic
+        return AILogic(self)
+
+    @cached_property
+    def input_utils(self) -> "InputUtils":
+        from backend.input_utils import InputUtils
+        return InputUtils(self)
+
+    @cached_property
+    def renderer(self) -> "ConsoleRenderer":
+        from backend.renderer import ConsoleRenderer
+        return ConsoleRenderer(self)
+
+    @property
+    def players(self) -> List[Player]:
+        return self._players
+
+    @players.setter
+    def players(self, players: List[Player]):
+        self._players = players
+        self.zones = SeatZones(len(players))
+        for seat, player in enumerate(players):
+            player.seat = seat
+            player.zones = self.zones
+            self.zones.update(player)
+
+    @property
+    def pile(self) -> Pile:
+        return self._pile
+
+    @pile.setter
+    def pile(self, cards: List[Card]):
+        # Plain lists are wrapped so the top-run tracking is always available; a Pile is kept as-is
+        self._pile = cards if isinstance(cards, Pile) else Pile(cards)
+
+    def strategy_for(self, player: Player, ai_logic: Optional["AILogic"] = None) -> "Strategy":
+        # An explicit AILogic wins, then the seat's own strategy, then the game's default rules
+        if ai_logic is not None:
+            return ai_logic.strategy
+        return self._seat_strategy(player) or self.ai_logic.strategy
+
+    def is_automated(self, player: Player) -> bool:
+        return player.is_computer or self._seat_strategy(player) is not None
+
+    def _seat_strategy(self, player: Player) -> Optional["Strategy"]:
+        # Tests seat players by hand, so a seat may lie outside the strategies given at construction
+        seat = player.seat
+        return self.strategies[seat] if seat is not None and seat < len(self.strategies) else None
 
     def create_deck(self) -> List[Card]:
-        return self.card_utils.create_deck()
+        decks = math.ceil(self.num_players * CARDS_PER_SEAT / 52)
+        return self.card_utils.create_deck(decks)
+
+    def log(self, message: str):
+        if self.verbose:
+            print(message)
+
+    def clone(self) -> "CardGame":
+        other = CardGame(verbose=False, num_players=self.num_players)
+        other.deck = list(self.deck)
+        other.players = [player.copy() for player in self.players]
+        other.pile = list(self.pile)
+        other.current_player = self.current_player
+        other.game_over = self.game_over
+        if self.winner is not None:
+            other.winner = other.players[self.players.index(self.winner)]
+        return other
 
     def shuffle_deck(self):
-        random.shuffle(self.deck)
+        self.rng.shuffle(self.deck)
 
     def deal_cards(self):
         self.deck = self.create_deck()
         self.shuffle_deck()
-        self.players = [Player("Leo"), Player("Computer")]
-        for player in self.players:
+        if self.num_players == 2:
+            computer_names = ["Computer"]
+        else:
+            computer_names = [f"Computer {i}" for i in range(1, self.num_players)]
+        players = [Player("Leo")] + [Player(name, is_computer=True) for name in computer_names]
+        for player in players:
             player.face_down = [self.deck.pop() for _ in range(3)]
             player.face_up = [self.deck.pop() for _ in range(3)]
             player.hand = [self.deck.pop() for _ in range(3)]
+        self.players = players
 
     def draw_card(self, player: Player):
-        new_hand = player.hand.copy()
-        while len(new_hand) < 3 and self.deck:
-            new_hand.append(self.deck.pop())
-        player.hand = new_hand
+        hand = player.hand
+        deck = self.deck
+        while len(hand) < 3 and deck:
+            player.add_to_hand(deck.pop())
+        self.zones.update(player)
 
     def player_must_pickup_pile(self, player: Player):
-        print(f"{player.name} picks up the pile!")
-        new_hand = player.hand + self.pile
+        if self.observer is not None:
+            self.observer.on_pickup(self, player)
+        self.log(f"{player.name} picks up the pile!")
+        self.pickups += 1
+        for card in self.pile:
+            player.add_to_hand(card)
         self.pile = []
-        player.hand = new_hand
+        self.zones.update(player)
+
+    def play_and_draw(self, player: Player, cards: List[Card]) -> bool:
+        another_turn = self.card_utils.play_cards(player, cards)
+        self.draw_card(player)
+        return another_turn
+
+    def pickup_and_draw(self, player: Player) -> bool:
+        self.player_must_pickup_pile(player)
+        self.draw_card(player)
+        return False
 
     def display_game_state(self):
-        print("\n" + "=" * 50)
-        print("GAME STATE")
-        print("=" * 50)
-
-        for i, player in enumerate(self.players):
-            current = " (CURRENT)" if i == self.current_player else ""
-            print(f"\n{player.name}{current}:")
-            hand_display = player.hand if player.name == "Leo" else '[Hidden]' if player.hand else 'Empty'
-            print(f"  Hand ({len(player.hand)}): {hand_display}")
-            print(f"  Face-up ({len(player.face_up)}): {player.face_up if player.face_up else 'Empty'}")
-            face_down_str = '[Hidden] ' * len(player.face_down) if player.face_down else 'Empty'
-            print(f"  Face-down ({len(player.face_down)}): {face_down_str}")
-
-        pile_display = self.pile[-5:] if len(self.pile) > 3 else self.pile
-        print(f"\nPile ({len(self.pile)}): {pile_display}")
-        if self.pile:
-            print(f"Top pile value: {self.card_utils.get_top_pile_value()}")
-        print(f"Deck remaining: {len(self.deck)}")
+        self.renderer.render()
 
     def check_game_over(self) -> bool:
         players_with_no_cards = [player for player in self.players if not player.has_cards()]
@@ -81,7 +192,8 @@ class CardGame:
 
         for player in self.players:
             print(f"\n{player.name}'s turn to set up:")
-            if player.name == "Leo":
+            automated = self.is_automated(player)
+            if not automated:
                 print(f"Your Hand: {player.hand}")
                 print(f"Your Face-up: {player.face_up}")
             else:
@@ -90,7 +202,7 @@ class CardGame:
             combined = player.hand + player.face_up
             combined_sorted_desc = sorted(combined, key=lambda c: c.value, reverse=True)
 
-            if player.name == "Leo":
+            if not automated:
                 while True:
                     print("You have the following 6 cards to choose from:")
                     for idx, card in enumerate(combined_sorted_desc):
@@ -120,15 +232,18 @@ class CardGame:
                                     print(f"Card value '{val}' not available in your cards! Try again!")
                                     break
             else:
-                self.ai_logic.choose_ai_setup_cards(player)
+                self.strategy_for(player).choose_setup(player)
 
             player.face_up.sort(key=lambda card: card.value)
+            self.zones.update(player)
             print(f"After setup - Face-up: {player.face_up}")
-            if player.name == "Leo":
+            if not automated:
                 print(f"Your Hand: {player.hand}")
 
     def player_turn(self, player: Player) -> bool:
         print(f"\n{player.name}'s turn:")
+        if self.observer is not None:
+            self.observer.on_turn(self, player)
 
         if player.can_play_from_face_down():
             if not hasattr(player, 'face_down_positions'):
@@ -137,23 +252,8 @@ class CardGame:
             print(f"Face-down cards available: {len(player.face_down)}")
             valid_positions = player.face_down_positions
 
-            if player.name == "Computer":
-                choice = random.choice(valid_positions)
-                chosen_index = player.face_down_positions.index(choice)
-                chosen_cards = [player.face_down[chosen_index]]
-                print(f"{player.name} plays: {chosen_cards}")
-                if self.card_utils.can_play_cards(chosen_cards):
-                    player.face_down_positions.remove(choice)
-                    another_turn = self.card_utils.play_cards(player, chosen_cards)
-                    self.draw_card(player)
-                    return another_turn
-                else:
-                    print(f"{chosen_cards[0]} cannot be played. {player.name} must pick up the pile.")
-                    player.face_down_positions.remove(choice)
-                    player.face_down.pop(chosen_index)
-                    self.player_must_pickup_pile(player)
-                    self.draw_card(player)
-                    return False
+            if self.is_automated(player):
+                return self._computer_move(player)
             else:
                 prompt = f"Choose a face-down card ({', '.join(map(str, valid_positions))}): "
                 while True:
@@ -162,7 +262,10 @@ class CardGame:
                         chosen_index = player.face_down_positions.index(int(choice))
                         chosen_cards = [player.face_down[chosen_index]]
                         print(f"You played: {chosen_cards}")
-                        if self.card_utils.can_play_cards(chosen_cards):
+                        playable = self.card_utils.can_play_cards(chosen_cards)
+                        if self.observer is not None:
+                            self.observer.on_face_down(self, player, playable)
+                        if playable:
                             player.face_down_positions.remove(int(choice))
                             another_turn = self.card_utils.play_cards(player, chosen_cards)
                             self.draw_card(player)
@@ -184,7 +287,7 @@ class CardGame:
             return False
 
         top_value = self.card_utils.get_top_pile_value()
-        if player.name == "Leo" and player.hand:
+        if not self.is_automated(player) and player.hand:
             can_play = False
             has_eight = False
             for s in playable_sets:
@@ -217,18 +320,8 @@ class CardGame:
                 self.draw_card(player)
                 return False
 
-        if player.name == "Computer":
-            chosen_cards = self.ai_logic.computer_choose_playable_set(playable_sets, top_value, player)
-            if chosen_cards:
-                print(f"{player.name} plays: {chosen_cards}")
-                another_turn = self.card_utils.play_cards(player, chosen_cards)
-                self.draw_card(player)
-                return another_turn
-            else:
-                print(f"{player.name} has no playable cards and must pick up the pile.")
-                self.player_must_pickup_pile(player)
-                self.draw_card(player)
-                return False
+        if self.is_automated(player):
+            return self._computer_move(player)
 
         chosen_cards = self.input_utils.handle_player_input(playable_sets)
         if chosen_cards:
@@ -241,13 +334,67 @@ class CardGame:
         self.draw_card(player)
         return False
 
-    def play_game(self):
+    def computer_turn(self, player: Player, deadline: Optional[float] = None,
+                      ai_logic: Optional["AILogic"] = None) -> bool:
+        if self.observer is not None:
+            self.observer.on_turn(self, player)
+        return self._computer_move(player, deadline, ai_logic)
+
+    def _computer_move(self, player: Player, deadline: Optional[float] = None,
+                       ai_logic: Optional["AILogic"] = None) -> bool:
+        strategy = self.strategy_for(player, ai_logic)
+        if player.can_play_from_face_down():
+            if not hasattr(player, 'face_down_positions'):
+                player.face_down_positions = list(range(1, len(player.face_down) + 1))
+
+            choice = strategy.choose_face_down(player)
+            chosen_index = player.face_down_positions.index(choice)
+            chosen_cards = [player.face_down[chosen_index]]
+            self.log(f"{player.name} plays: {chosen_cards}")
+            player.face_down_positions.remove(choice)
+            playable = self.card_utils.can_play_cards(chosen_cards)
+            if self.observer is not None:
+                self.observer.on_face_down(self, player, playable)
+            if playable:
+                return self.play_and_draw(player, chosen_cards)
+            self.log(f"{chosen_cards[0]} cannot be played. {player.name} must pick up the pile.")
+            player.face_down.pop(chosen_index)
+            return self.pickup_and_draw(player)
+
+        playable_sets = self.card_utils.get_playable_cards(player)
+        top_value = self.card_utils.get_top_pile_value()
+        if deadline is None and self.move_time_budget is not None:
+            deadline = time.perf_counter() + self.move_time_budget
+        chosen_cards = strategy.choose_play(player, playable_sets, top_value, deadline)
+        if chosen_cards:
+            self.log(f"{player.name} plays: {chosen_cards}")
+            return self.play_and_draw(player, chosen_cards)
+        self.log(f"{player.name} has no playable cards and must pick up the pile.")
+        return self.pickup_and_draw(player)
+
+    def play_game(self, max_turns: Optional[int] = None):
+        # Ends with self.outcome set: WIN, DRAWN at the first repeated position (see CycleDetector, skipped
+        # when an automated seat plays by chance or the clock) or ABORTED at max_turns
         self.deal_cards()
         self.setup_phase()
+        automated = [player for player in self.players if self.is_automated(player)]
+        deterministic = all(self.strategy_for(player).deterministic for player in automated)
+        cycles = CycleDetector(len(self.players)) if deterministic else None
+        turns = 0
         while not self.game_over:
+            if max_turns is not None and turns >= max_turns:
+                self.outcome = GameOutcome.ABORTED
+                print(f"\nGame aborted after {turns} turns without a winner.")
+                return
+            if cycles is not None and cycles.repeated(self):
+                self.outcome = GameOutcome.DRAWN
+                print(f"\nThe table is back in a position it has already played from. "
+                      f"Game drawn after {turns} turns.")
+                return
             self.display_game_state()
             player = self.players[self.current_player]
             another_turn = self.player_turn(player)
+            turns += 1
 
             if self.check_game_over():
                 break
@@ -255,4 +402,5 @@ class CardGame:
             if not another_turn:
                 self.current_player = (self.current_player + 1) % len(self.players)
 
+        self.outcome = GameOutcome.WIN
         print(f"\nGame Over! Winner is {self.winner.name}!")
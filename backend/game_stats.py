@@ -0,0 +1,119 @@
+from typing import Dict, List
+
+from backend.sketches import HdrHistogram
+
+DECK = "deck"  # playing from the hand while the deck still refills it
+HAND = "hand"  # playing from the hand after the deck ran out
+FACE_UP = "face_up"
+FACE_DOWN = "face_down"
+PHASES = (DECK, HAND, FACE_UP, FACE_DOWN)
+
+HAND_WINDOW = 10  # turns per hand-size histogram
+HAND_WINDOWS = 20  # the last window also takes every later turn
+
+
+def turn_phase(game, player) -> str:
+    if player.hand:
+        return DECK if game.deck else HAND
+    return FACE_UP if player.face_up else FACE_DOWN
+
+
+class GameStats:
+    # Fixed-memory aggregates over any number of games: pickup sizes, the moving seat's hand size by
+    # turn window, turns spent in each phase per game, and how often a blind face-down flip can be played.
+    # Collected only for games passed to observe(); an unobserved game pays one None check per hook.
+    # Every metric is a small non-negative integer, so HdrHistogram's bucketed quantiles serve as the
+    # quantile sketch: bounded relative error, and merges that add bucket counts give exactly the
+    # single-process result, which rank-based sketches (KLL, t-digest) do not guarantee.
+
+    def __init__(self):
+        self.games = 0
+        self.pickup_size = HdrHistogram()
+        self.hand_size: List[HdrHistogram] = [HdrHistogram() for _ in range(HAND_WINDOWS)]
+        self.phase_turns: Dict[str, HdrHistogram] = {phase: HdrHistogram() for phase in PHASES}
+        self.face_down_flips = 0
+        self.face_down_successes = 0
+
+    def observe(self, game) -> "GameObserver":
+        return GameObserver(self, game)
+
+    @property
+    def face_down_success_rate(self) -> float:
+        return self.face_down_successes / self.face_down_flips if self.face_down_flips else 0.0
+
+    def merge(self, other: "GameStats"):
+        self.games += other.games
+        self.pickup_size.merge(other.pickup_size)
+        for histogram, other_histogram in zip(self.hand_size, other.hand_size):
+            histogram.merge(other_histogram)
+        for phase in PHASES:
+            self.phase_turns[phase].merge(other.phase_turns[phase])
+        self.face_down_flips += other.face_down_flips
+        self.face_down_successes += other.face_down_successes
+
+    def to_dict(self) -> dict:
+        return {
+            "games": self.games,
+            "pickup_size": self.pickup_size.to_dict(),
+            "hand_size": [histogram.to_dict() for histogram in self.hand_size],
+            "phase_turns": {phase: histogram.to_dict() for phase, histogram in self.phase_turns.items()},
+            "face_down_flips": self.face_down_flips,
+            "face_down_successes": self.face_down_successes,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "GameStats":
+        stats = cls()
+        stats.games = data["games"]
+        stats.pickup_size = HdrHistogram.from_dict(data["pickup_size"])
+        stats.hand_size = [HdrHistogram.from_dict(histogram) for histogram in data["hand_size"]]
+        stats.phase_turns = {phase: HdrHistogram.from_dict(histogram)
+                             for phase, histogram in data["phase_turns"].items()}
+        stats.face_down_flips = data["face_down_flips"]
+        stats.face_down_successes = data["face_down_successes"]
+        return stats
+
+    def format(self) -> str:
+        lines = [f"Pickup size: {self.pickup_size.summary()}"]
+        for phase in PHASES:
+            lines.append(f"Turns in {phase:<9}: {self.phase_turns[phase].summary()}")
+        lines.append(f"Face-down flips: {self.face_down_flips}, playable {self.face_down_success_rate:.1%}")
+        lines.append("Hand size by turn:")
+        for window, histogram in enumerate(self.hand_size):
+            if histogram.count:
+                start = window * HAND_WINDOW
+                label = f"{start}+" if window == HAND_WINDOWS - 1 else f"{start}-{start + HAND_WINDOW - 1}"
+                lines.append(f"  {label:>7}: {histogram.summary((0.5, 0.9))}")
+        return "\n".join(lines)
+
+
+class GameObserver:
+    # Set as game.observer while a game is observed; the engine calls on_turn at the start of every turn,
+    # on_face_down after each blind flip and on_pickup before a pile is picked up. finish() folds the game's
+    # per-phase turn counts into the stats and detaches from the game.
+    def __init__(self, stats: GameStats, game):
+        self.stats = stats
+        self.game = game
+        self.turns = 0
+        self.phase_turns = dict.fromkeys(PHASES, 0)
+        game.observer = self
+
+    def on_turn(self, game, player):
+        self.phase_turns[turn_phase(game, player)] += 1
+        self.stats.hand_size[min(self.turns // HAND_WINDOW, HAND_WINDOWS - 1)].record(len(player.hand))
+        self.turns += 1
+
+    def on_face_down(self, game, player, playable: bool):
+        self.stats.face_down_flips += 1
+        if playable:
+            self.stats.face_down_successes += 1
+
+    def on_pickup(self, game, player):
+        self.stats.pickup_size.record(len(game.pile))
+
+    def finish(self):
+        for phase, turns in self.phase_turns.items():
+            self.stats.phase_turns[phase].record(turns)
+        self.stats.games += 1
+        if self.game.observer is self:
+            self.game.observer = None
@@ -0,0 +1,191 @@
+import json
+import math
+import os
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from backend.enums import GameOutcome
+from backend.simulation import DEFAULT_MAX_TURNS, play_selfplay_game
+from backend.strategies import StrategySpec
+
+ACCEPT_H0 = "H0"
+ACCEPT_H1 = "H1"
+INCONCLUSIVE = "inconclusive"
+
+
+def elo_to_score(elo: float) -> float:
+    return 1.0 / (1.0 + 10.0 ** (-elo / 400.0))
+
+
+def score_to_elo(score: float) -> float:
+    score = min(max(score, 1e-6), 1.0 - 1e-6)
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+
+class SPRT:
+    # Generalised sequential probability ratio test on paired scores, with the normal approximation used by
+    # chess engine testing: H0 says the candidate's expected score is elo_to_score(elo0), H1 elo_to_score(elo1).
+    # Pairs rather than single games are the samples, so the variance already reflects the shared deals.
+
+    def __init__(self, elo0: float = 0.0, elo1: float = 10.0, alpha: float = 0.05, beta: float = 0.05):
+        if elo1 <= elo0:
+            raise ValueError(f"elo1 ({elo1}) must be greater than elo0 ({elo0})")
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower = math.log(beta / (1.0 - alpha))
+        self.upper = math.log((1.0 - beta) / alpha)
+
+    def llr(self, count: int, total: float, total_squares: float) -> float:
+        if count < 2:
+            return 0.0
+        mean = total / count
+        variance = total_squares / count - mean * mean
+        if variance <= 1e-12:
+            # Every pair scored the same so far: the normal approximation has no spread to work with yet
+            return 0.0
+        s0, s1 = elo_to_score(self.elo0), elo_to_score(self.elo1)
+        return count * (s1 - s0) * (2.0 * mean - s0 - s1) / (2.0 * variance)
+
+    def verdict(self, llr: float) -> Optional[str]:
+        if llr >= self.upper:
+            return ACCEPT_H1
+        if llr <= self.lower:
+            return ACCEPT_H0
+        return None
+
+
+class MatchReport:
+    def __init__(self, candidate: StrategySpec, baseline: StrategySpec, sprt: SPRT):
+        self.candidate = candidate
+        self.baseline = baseline
+        self.sprt = sprt
+        self.pairs = 0
+        self.total = 0.0  # sum of pair scores, each 0, 0.25, 0.5, 0.75 or 1 from the candidate's side
+        self.total_squares = 0.0
+        self.games = {"win": 0, "draw": 0, "loss": 0}  # per game, from the candidate's side
+        self.llr = 0.0
+        self.result = INCONCLUSIVE
+
+    def add(self, pair_score: float, game_scores: Sequence[float]):
+        self.pairs += 1
+        self.total += pair_score
+        self.total_squares += pair_score * pair_score
+        for score in game_scores:
+            self.games["win" if score == 1.0 else "loss" if score == 0.0 else "draw"] += 1
+        self.llr = self.sprt.llr(self.pairs, self.total, self.total_squares)
+
+    @property
+    def score(self) -> float:
+        return self.total / self.pairs if self.pairs else 0.5
+
+    @property
+    def elo(self) -> float:
+        return score_to_elo(self.score)
+
+    def format(self) -> str:
+        return "\n".join([
+            f"{_spec_name(self.candidate)} vs {_spec_name(self.baseline)}: {self.pairs} pairs, "
+            f"W/D/L {self.games['win']}/{self.games['draw']}/{self.games['loss']}",
+            f"Score {self.score:.4f} (Elo {self.elo:+.1f})",
+            f"LLR {self.llr:.3f} in [{self.sprt.lower:.3f}, {self.sprt.upper:.3f}] for "
+            f"elo0={self.sprt.elo0:g} elo1={self.sprt.elo1:g}: {self.result}",
+        ])
+
+
+def _spec_name(spec: StrategySpec) -> str:
+    return spec if isinstance(spec, str) else spec[0]
+
+
+def _game_score(seed: int, strategies: List[StrategySpec], candidate_seat: int, max_turns: int) -> float:
+    # Draws and aborted games count as half a point for each side
+    result = play_selfplay_game(seed, max_turns=max_turns, strategies=strategies)
+    if result.outcome is not GameOutcome.WIN:
+        return 0.5
+    return 1.0 if result.winner == candidate_seat else 0.0
+
+
+def play_pair(seed: int, candidate: StrategySpec, baseline: StrategySpec,
+              max_turns: int = DEFAULT_MAX_TURNS) -> Tuple[float, float]:
+    # The same deal twice with the seats swapped, so the deal and seat advantage cancel within the pair
+    return (_game_score(seed, [candidate, baseline], 0, max_turns),
+            _game_score(seed, [baseline, candidate], 1, max_turns))
+
+
+def _play_pair_chunk(args: Tuple[List[int], StrategySpec, StrategySpec, int]) -> List[Tuple[float, float]]:
+    seeds, candidate, baseline, max_turns = args
+    return [play_pair(seed, candidate, baseline, max_turns) for seed in seeds]
+
+
+def _bounded_imap(pool: Pool, func, jobs: Iterable, window: int) -> Iterator:
+    # Like pool.imap, which queues every job up front, but with at most window jobs submitted ahead of the
+    # results taken so far, so a caller that stops early leaves the rest of the run unplayed
+    jobs = iter(jobs)
+    pending = deque(pool.apply_async(func, (job,)) for job in islice(jobs, window))
+    while pending:
+        result = pending.popleft().get()
+        for job in islice(jobs, 1):
+            pending.append(pool.apply_async(func, (job,)))
+        yield result
+
+
+def run_match(candidate: StrategySpec, baseline: StrategySpec, max_pairs: int = 20000, sprt: Optional[SPRT] = None,
+              first_seed: int = 0, workers: int = 1, chunk_size: int = 20,
+              max_turns: int = DEFAULT_MAX_TURNS) -> MatchReport:
+    # Chunks of consecutive seeds are folded in dispatch order and the test is checked after each one, so the
+    # stopping point and the report depend only on the seeds and chunk size, never on the number of workers
+    report = MatchReport(candidate, baseline, sprt or SPRT())
+    chunks = ((list(range(start, min(start + chunk_size, first_seed + max_pairs))), candidate, baseline, max_turns)
+              for start in range(first_seed, first_seed + max_pairs, chunk_size))
+    pool = Pool(workers) if workers > 1 else None
+    try:
+        results = _bounded_imap(pool, _play_pair_chunk, chunks, 2 * workers) if pool else \
+            map(_play_pair_chunk, chunks)
+        for pairs in results:
+            for game_scores in pairs:
+                report.add(sum(game_scores) / 2.0, game_scores)
+            verdict = report.sprt.verdict(report.llr)
+            if verdict is not None:
+                report.result = verdict
+                break
+    finally:
+        if pool:
+            pool.terminate()
+            pool.join()
+    return report
+
+
+def _parse_spec(name: str, options: Optional[str]) -> StrategySpec:
+    return (name, json.loads(options)) if options else name
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Play two strategies against each other on paired, seat-swapped "
+                                                 "deals until a sequential probability ratio test is decisive.")
+    parser.add_argument("candidate", help="registered strategy name (see backend.strategies)")
+    parser.add_argument("baseline", help="registered strategy name")
+    parser.add_argument("--candidate-options", help="JSON object of constructor options")
+    parser.add_argument("--baseline-options", help="JSON object of constructor options")
+    parser.add_argument("--max-pairs", type=int, default=20000)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--elo0", type=float, default=0.0)
+    parser.add_argument("--elo1", type=float, default=10.0)
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.05)
+    parser.add_argument("--chunk-size", type=int, default=20)
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    report = run_match(_parse_spec(args.candidate, args.candidate_options),
+                       _parse_spec(args.baseline, args.baseline_options), args.max_pairs,
+                       SPRT(args.elo0, args.elo1, args.alpha, args.beta), args.first_seed, args.workers,
+                       args.chunk_size, args.max_turns)
+    print(report.format())
+
+
+if __name__ == "__main__":
+    main()
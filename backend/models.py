@@ -1,5 +1,9 @@
+from bisect import insort
+from operator import attrgetter
 from backend.enums import Suit
-from typing import List
+from typing import List, Optional
+
+_card_value = attrgetter("value")
 
 
 class Card:
@@ -23,11 +27,20 @@ class Card:
 
 
 class Player:
-    def __init__(self, name: str):
+    def __init__(self, name: str, is_computer: bool = False):
         self.name = name
+        self.is_computer = is_computer
+        self.seat: Optional[int] = None
+        # The zone-size arrays of the game this player is seated in; assigning a zone refreshes them, and
+        # engine code that mutates a zone in place calls SeatZones.update itself
+        self.zones: Optional["SeatZones"] = None
         self._hand: List[Card] = []
-        self.face_up: List[Card] = []
-        self.face_down: List[Card] = []
+        self._face_up: List[Card] = []
+        self._face_down: List[Card] = []
+
+    def _zones_changed(self):
+        if self.zones is not None:
+            self.zones.update(self)
 
     @property
     def hand(self) -> List[Card]:
@@ -35,7 +48,39 @@ class Player:
 
     @hand.setter
     def hand(self, cards: List[Card]):
-        self._hand = sorted(cards, key=lambda card: card.value)
+        self._hand = sorted(cards, key=_card_value)
+        self._zones_changed()
+
+    @property
+    def face_up(self) -> List[Card]:
+        return self._face_up
+
+    @face_up.setter
+    def face_up(self, cards: List[Card]):
+        self._face_up = cards
+        self._zones_changed()
+
+    @property
+    def face_down(self) -> List[Card]:
+        return self._face_down
+
+    @face_down.setter
+    def face_down(self, cards: List[Card]):
+        self._face_down = cards
+        self._zones_changed()
+
+    def add_to_hand(self, card: Card):
+        # Inserts in place after any cards of equal value, the order a stable re-sort would give
+        insort(self._hand, card, key=_card_value)
+
+    def copy(self) -> "Player":
+        other = Player(self.name, self.is_computer)
+        other._hand = list(self._hand)
+        other._face_up = list(self._face_up)
+        other._face_down = list(self._face_down)
+        if hasattr(self, 'face_down_positions'):
+            other.face_down_positions = list(self.face_down_positions)
+        return other
 
     def total_cards(self) -> int:
         return len(self.hand) + len(self.face_up) + len(self.face_down)
@@ -51,3 +96,99 @@ class Player:
 
     def can_play_from_face_down(self) -> bool:
         return len(self.hand) == 0 and len(self.face_up) == 0 and len(self.face_down) > 0
+
+
+class Pile(list):
+    # The discard pile. It tracks the run of equal ranks on top as cards are pushed, so four-of-a-kind
+    # burns and burn chances are read from two attributes instead of slicing and comparing the top cards.
+    # Pushes update the run in O(1); the rarer removals recount it from the top.
+    __slots__ = ("run_rank", "run_length")
+
+    def __init__(self, cards=()):
+        super().__init__(cards)
+        self._recount()
+
+    def _recount(self):
+        self.run_rank = 0
+        self.run_length = 0
+        for card in reversed(self):
+            if self.run_length and card.value != self.run_rank:
+                break
+            self.run_rank = card.value
+            self.run_length += 1
+
+    def append(self, card: Card):
+        list.append(self, card)
+        if card.value == self.run_rank:
+            self.run_length += 1
+        else:
+            self.run_rank = card.value
+            self.run_length = 1
+
+    def extend(self, cards):
+        for card in cards:
+            self.append(card)
+
+    def __iadd__(self, cards):
+        self.extend(cards)
+        return self
+
+    def insert(self, index, card: Card):
+        super().insert(index, card)
+        self._recount()
+
+    def pop(self, index=-1) -> Card:
+        card = super().pop(index)
+        self._recount()
+        return card
+
+    def remove(self, card: Card):
+        super().remove(card)
+        self._recount()
+
+    def clear(self):
+        super().clear()
+        self._recount()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._recount()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._recount()
+
+    def cards_to_burn(self, rank: int) -> int:
+        # How many more cards of rank complete four of a kind on top of the pile
+        return 4 - self.run_length if rank == self.run_rank else 4
+
+
+class SeatZones:
+    # Per-seat zone sizes kept in flat arrays, plus running aggregates, so opponent-state queries
+    # cost O(1) instead of a scan over every player each turn
+    def __init__(self, seats: int):
+        self.hand = [0] * seats
+        self.face_up = [0] * seats
+        self.face_down = [0] * seats
+        self.last_card_seats = 0  # seats down to exactly one face-down card and nothing else
+
+    def _on_last_card(self, seat: int) -> bool:
+        return self.face_down[seat] == 1 and not self.hand[seat] and not self.face_up[seat]
+
+    def update(self, player: Player):
+        seat = player.seat
+        if seat is None or seat >= len(self.hand):
+            return
+        self.last_card_seats -= self._on_last_card(seat)
+        self.hand[seat] = len(player.hand)
+        self.face_up[seat] = len(player.face_up)
+        self.face_down[seat] = len(player.face_down)
+        self.last_card_seats += self._on_last_card(seat)
+
+    def total_cards(self, seat: int) -> int:
+        return self.hand[seat] + self.face_up[seat] + self.face_down[seat]
+
+    def opponents_on_last_card(self, seat: Optional[int]) -> int:
+        if seat is None or seat >= len(self.hand):
+            return self.last_card_seats
+        return self.last_card_seats - self._on_last_card(seat)
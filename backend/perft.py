@@ -0,0 +1,221 @@
+import time
+from typing import List, Optional
+
+from backend.models import Card
+
+PLAY = "play"
+PICKUP = "pickup"
+FACE_DOWN = "face_down"
+
+
+class Move:
+    __slots__ = ("kind", "cards", "face_down_index")
+
+    def __init__(self, kind: str, cards: Optional[List[Card]] = None, face_down_index: int = -1):
+        self.kind = kind
+        self.cards = cards
+        self.face_down_index = face_down_index
+
+    def __repr__(self):
+        if self.kind == FACE_DOWN:
+            return f"Move(face_down={self.face_down_index})"
+        return f"Move({self.kind}, {self.cards})" if self.cards else f"Move({self.kind})"
+
+
+class Undo:
+    __slots__ = ("player", "current_player", "game_over", "winner", "hand", "pile", "pile_length", "deck_top",
+                 "deck_length", "face_up_removed", "face_down_removed", "another_turn", "picked_up", "burned",
+                 "pickups", "burns", "specials_played")
+
+    def __init__(self, game, player):
+        self.player = player
+        self.current_player = game.current_player
+        self.game_over = game.game_over
+        self.winner = game.winner
+        # The game's running counters, which feed the result rows of simulated games
+        self.pickups = game.pickups
+        self.burns = game.burns
+        self.specials_played = game.specials_played
+        # The engine edits the hand in place, so it is copied; on burns and pickups the pile is replaced
+        # rather than mutated, so keeping the old reference is enough (truncating a Pile recounts its run)
+        self.hand = list(player.hand)
+        self.pile = game.pile
+        self.pile_length = len(game.pile)
+        # At most three cards are drawn per move
+        self.deck_top = game.deck[-3:]
+        self.deck_length = len(game.deck)
+        self.face_up_removed = []
+        self.face_down_removed = []
+        self.another_turn = False
+        self.picked_up = False
+        self.burned = False
+
+
+class PerftCounts:
+    def __init__(self, nodes: int = 0, plays: int = 0, pickups: int = 0, burns: int = 0, replays: int = 0):
+        self.nodes = nodes
+        self.plays = plays
+        self.pickups = pickups
+        self.burns = burns
+        self.replays = replays  # 8s that grant another turn (burns are counted separately)
+
+    def __iadd__(self, other: "PerftCounts") -> "PerftCounts":
+        self.nodes += other.nodes
+        self.plays += other.plays
+        self.pickups += other.pickups
+        self.burns += other.burns
+        self.replays += other.replays
+        return self
+
+    def as_tuple(self):
+        return self.nodes, self.plays, self.pickups, self.burns, self.replays
+
+    def __eq__(self, other):
+        return isinstance(other, PerftCounts) and self.as_tuple() == other.as_tuple()
+
+    def __repr__(self):
+        return (f"PerftCounts(nodes={self.nodes}, plays={self.plays}, pickups={self.pickups}, "
+                f"burns={self.burns}, replays={self.replays})")
+
+
+def generate_moves(game, tactical_pickups: bool = False) -> List[Move]:
+    player = game.players[game.current_player]
+    if player.can_play_from_face_down():
+        return [Move(FACE_DOWN, face_down_index=index) for index in range(len(player.face_down))]
+    moves = [Move(PLAY, cards) for cards in game.card_utils.get_playable_cards(player)]
+    if not moves or (tactical_pickups and game.pile):
+        moves.append(Move(PICKUP))
+    return moves
+
+
+def _record_removals(zone: List[Card], cards: List[Card]):
+    # Mirrors CardUtils.play_cards, which removes the first equal card for each played card
+    working = list(zone)
+    removed = []
+    for card in cards:
+        if card in working:
+            index = working.index(card)
+            removed.append((index, working.pop(index)))
+    return removed
+
+
+def make_move(game, move: Move) -> Undo:
+    player = game.players[game.current_player]
+    undo = Undo(game, player)
+
+    if move.kind == PICKUP:
+        undo.picked_up = True
+        game.pickup_and_draw(player)
+    else:
+        if move.kind == FACE_DOWN:
+            cards = [player.face_down[move.face_down_index]]
+            playable = game.card_utils.can_play_cards(cards)
+        else:
+            cards = move.cards
+            playable = True
+
+        if playable:
+            if not player.hand:
+                undo.face_up_removed = _record_removals(player.face_up, cards)
+                if not undo.face_up_removed:
+                    undo.face_down_removed = _record_removals(player.face_down, cards)
+            undo.another_turn = game.play_and_draw(player, cards)
+            undo.burned = undo.another_turn and not game.pile
+        else:
+            undo.face_down_removed = [(move.face_down_index, player.face_down.pop(move.face_down_index))]
+            undo.picked_up = True
+            game.pickup_and_draw(player)
+
+    if not game.check_game_over() and not undo.another_turn:
+        game.current_player = (game.current_player + 1) % len(game.players)
+    return undo
+
+
+def unmake_move(game, undo: Undo):
+    player = undo.player
+    drawn = undo.deck_length - len(game.deck)
+    if drawn:
+        game.deck.extend(undo.deck_top[len(undo.deck_top) - drawn:])
+    player.hand[:] = undo.hand
+    for index, card in reversed(undo.face_up_removed):
+        player.face_up.insert(index, card)
+    for index, card in reversed(undo.face_down_removed):
+        player.face_down.insert(index, card)
+    del undo.pile[undo.pile_length:]
+    game.pile = undo.pile
+    game.current_player = undo.current_player
+    game.game_over = undo.game_over
+    game.winner = undo.winner
+    game.pickups = undo.pickups
+    game.burns = undo.burns
+    game.specials_played = undo.specials_played
+    game.zones.update(player)
+
+
+def _count_move(counts: PerftCounts, game, undo: Undo, depth: int, tactical_pickups: bool):
+    # Adds what a move just made contributes at depth: itself as a leaf at depth 1, otherwise the lines
+    # below it, of which a move that ends the game has none
+    if depth == 1:
+        counts.nodes += 1
+        if undo.picked_up:
+            counts.pickups += 1
+        else:
+            counts.plays += 1
+            if undo.burned:
+                counts.burns += 1
+            elif undo.another_turn:
+                counts.replays += 1
+    elif not game.game_over:
+        counts += perft(game, depth - 1, tactical_pickups)
+
+
+def perft(game, depth: int, tactical_pickups: bool = False) -> PerftCounts:
+    counts = PerftCounts()
+    if depth == 0:
+        counts.nodes = 1
+        return counts
+    for move in generate_moves(game, tactical_pickups):
+        undo = make_move(game, move)
+        _count_move(counts, game, undo, depth, tactical_pickups)
+        unmake_move(game, undo)
+    return counts
+
+
+def divide(game, depth: int, tactical_pickups: bool = False):
+    # perft split by root move, so the counts of the moves add up to perft(game, depth)
+    results = []
+    for move in generate_moves(game, tactical_pickups):
+        undo = make_move(game, move)
+        counts = PerftCounts()
+        _count_move(counts, game, undo, max(depth, 1), tactical_pickups)
+        unmake_move(game, undo)
+        results.append((move, counts))
+    return results
+
+
+def main():
+    import argparse
+
+    from backend.simulation import new_selfplay_game
+
+    parser = argparse.ArgumentParser(description="Count legal move sequences from a seeded deal.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--tactical-pickups", action="store_true")
+    parser.add_argument("--divide", action="store_true", help="print the node count below each root move")
+    args = parser.parse_args()
+
+    game, _ = new_selfplay_game(args.seed)
+    if args.divide:
+        for move, counts in divide(game, args.depth, args.tactical_pickups):
+            print(f"{move}: {counts.nodes}")
+    for depth in range(1, args.depth + 1):
+        start = time.perf_counter()
+        counts = perft(game, depth, args.tactical_pickups)
+        elapsed = time.perf_counter() - start
+        rate = counts.nodes / elapsed if elapsed else 0.0
+        print(f"depth {depth}: {counts}  {elapsed:.3f}s  {rate:,.0f} nodes/s")
+
+
+if __name__ == "__main__":
+    main()
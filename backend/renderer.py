@@ -0,0 +1,95 @@
+import sys
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from backend.models import Card, Player
+
+DEFAULT_MAX_HAND_CARDS = 20
+
+
+class ConsoleRenderer:
+    # Renders the board for display_game_state. Each zone's text is cached against a cheap key that
+    # captures everything the rendered text depends on, so only zones that changed since the last frame
+    # are formatted again, and the whole frame goes out in a single write.
+
+    def __init__(self, game, stream: Optional[TextIO] = None, max_hand_cards: int = DEFAULT_MAX_HAND_CARDS,
+                 skip_unchanged: bool = False):
+        self.game = game
+        self.stream = stream
+        self.max_hand_cards = max_hand_cards
+        self.skip_unchanged = skip_unchanged
+        self._cache: Dict[Tuple, Tuple[object, str]] = {}
+        self._last_frame: Optional[str] = None
+        self._pile_ref: Optional[List[Card]] = None
+        self.zones_rendered = 0  # zones formatted from scratch, for measuring cache effectiveness
+
+    def _zone(self, slot: Tuple, key, render) -> str:
+        cached = self._cache.get(slot)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        text = render()
+        self._cache[slot] = (key, text)
+        self.zones_rendered += 1
+        return text
+
+    def _format_cards(self, cards: List[Card]) -> str:
+        if len(cards) <= self.max_hand_cards:
+            return str(cards)
+        shown = ", ".join(str(card) for card in cards[:self.max_hand_cards])
+        return f"[{shown}, ... +{len(cards) - self.max_hand_cards} more]"
+
+    def _player_lines(self, seat: int, player: Player) -> str:
+        hand = player.hand
+        current = seat == self.game.current_player
+        header = self._zone((seat, "name"), (player.name, current),
+                            lambda: f"\n{player.name}{' (CURRENT)' if current else ''}:")
+        if not self.game.is_automated(player):
+            hand_key = (len(hand), tuple(hand[:self.max_hand_cards]))
+            hand_line = self._zone((seat, "hand"), hand_key,
+                                   lambda: f"  Hand ({len(hand)}): {self._format_cards(hand)}")
+        else:
+            hand_line = self._zone((seat, "hand"), len(hand),
+                                   lambda: f"  Hand ({len(hand)}): {'[Hidden]' if hand else 'Empty'}")
+        face_up = player.face_up
+        face_up_line = self._zone((seat, "face_up"), tuple(face_up),
+                                  lambda: f"  Face-up ({len(face_up)}): {face_up if face_up else 'Empty'}")
+        face_down = len(player.face_down)
+        face_down_line = self._zone((seat, "face_down"), face_down,
+                                    lambda: f"  Face-down ({face_down}): "
+                                            f"{'[Hidden] ' * face_down if face_down else 'Empty'}")
+        return "\n".join((header, hand_line, face_up_line, face_down_line))
+
+    def _pile_lines(self) -> str:
+        pile = self.game.pile
+        # The pile is only appended to or replaced, so while it is the same list its length and
+        # visible tail pin the text
+        if pile is not self._pile_ref:
+            self._pile_ref = pile
+            self._cache.pop(("pile",), None)
+        key = (len(pile), tuple(pile[-5:]))
+
+        def render():
+            lines = [f"\nPile ({len(pile)}): {pile[-5:]}"]
+            if pile:
+                lines.append(f"Top pile value: {self.game.card_utils.get_top_pile_value()}")
+            return "\n".join(lines)
+
+        return self._zone(("pile",), key, render)
+
+    def frame(self) -> str:
+        parts = ["\n" + "=" * 50, "GAME STATE", "=" * 50]
+        for seat, player in enumerate(self.game.players):
+            parts.append(self._player_lines(seat, player))
+        parts.append(self._pile_lines())
+        parts.append(f"Deck remaining: {len(self.game.deck)}")
+        return "\n".join(parts) + "\n"
+
+    def render(self) -> bool:
+        # Returns False when the frame was identical to the last one and skip_unchanged suppressed it
+        frame = self.frame()
+        if self.skip_unchanged and frame == self._last_frame:
+            return False
+        self._last_frame = frame
+        stream = self.stream or sys.stdout
+        stream.write(frame)
+        stream.flush()
+        return True
@@ -0,0 +1,110 @@
+from functools import lru_cache
+from math import comb
+from typing import List, Optional, Sequence, Tuple
+
+from backend.models import Card, Player
+
+RANKS = range(2, 15)
+ALWAYS_PLAYABLE = (2, 7, 8, 10)
+TRANSPARENT = (7, 8)  # played on top without changing the value to beat
+
+
+def beats(rank: int, pile_value: int) -> bool:
+    return rank in ALWAYS_PLAYABLE or rank >= pile_value
+
+
+def after_play(ranks: Sequence[int], pile_value: int, run_rank: int, run_length: int) -> Tuple[int, bool]:
+    # The value to beat once ranks are played in order, and whether the player goes again (an 8 or 10 on top,
+    # or a run of four), mirroring CardUtils.play_cards
+    for rank in ranks:
+        if rank not in TRANSPARENT and rank != 10:
+            pile_value = rank
+        run_length = run_length + 1 if rank == run_rank else 1
+        run_rank = rank
+    last = ranks[-1]
+    return pile_value, last in (8, 10) or run_length >= 4
+
+
+@lru_cache(maxsize=1 << 16)
+def beat_probabilities(unseen: Tuple[int, ...], hand_size: int) -> Tuple[float, ...]:
+    # Indexed by the value to beat (0-14): the probability that hand_size cards drawn without replacement from
+    # the unseen rank counts include at least one that beats it. Exact hypergeometric: the responder is stuck
+    # only if every card comes from the ranks that cannot beat, C(U - K, h) / C(U, h).
+    total = sum(unseen)
+    hand_size = min(hand_size, total)
+    if hand_size <= 0:
+        return (0.0,) * 15
+    hands = comb(total, hand_size)
+    # Cards that beat value are the always-playable ranks plus every rank from value up, so the counts
+    # for all fifteen values come from one running sum taken from the top rank down
+    always = sum(unseen[rank] for rank in ALWAYS_PLAYABLE)
+    probabilities = [0.0] * 15
+    higher = 0
+    for value in range(14, -1, -1):
+        if value >= 2 and value not in ALWAYS_PLAYABLE:
+            higher += unseen[value]
+        stuck = total - always - higher
+        probabilities[value] = 1.0 - comb(stuck, hand_size) / hands
+    return tuple(probabilities)
+
+
+class PlayRisk:
+    def __init__(self, cards: List[Card], beat_probability: float, expected_pickup: float, another_turn: bool):
+        self.cards = cards
+        self.beat_probability = beat_probability  # chance the next seat can answer the play
+        self.expected_pickup = expected_pickup  # cards the next seat is expected to pick up when it cannot
+        self.another_turn = another_turn  # the play keeps the turn, so nobody answers it yet
+
+    def __repr__(self):
+        return (f"PlayRisk(cards={self.cards}, beat_probability={self.beat_probability:.4f}, "
+                f"expected_pickup={self.expected_pickup:.2f}, another_turn={self.another_turn})")
+
+
+def unseen_counts(game, seat: int) -> Tuple[int, ...]:
+    # Rank counts a card counter in seat cannot see: the deck, the other hands and every face-down card.
+    # Burned and face-up cards were all seen, so this is exactly what is left.
+    counts = [0] * 15
+    for card in game.deck:
+        counts[card.value] += 1
+    for index, player in enumerate(game.players):
+        for card in player.face_down:
+            counts[card.value] += 1
+        if index != seat:
+            for card in player.hand:
+                counts[card.value] += 1
+    return tuple(counts)
+
+
+def play_risks(playable_sets: List[List[Card]], unseen: Tuple[int, ...], responder_hand: int,
+               responder_face_up: Optional[Sequence[int]], pile_value: int, pile_size: int, run_rank: int = 0,
+               run_length: int = 0) -> List[PlayRisk]:
+    # responder_hand is the next seat's hand size; with an empty hand its face-up ranks answer instead, and
+    # with neither it turns over one face-down card, which is a single draw from the unseen cards
+    if responder_hand:
+        probabilities = beat_probabilities(unseen, responder_hand)
+    elif responder_face_up:
+        probabilities = tuple(float(any(beats(rank, value) for rank in responder_face_up)) for value in range(15))
+    else:
+        probabilities = beat_probabilities(unseen, 1)
+
+    risks = []
+    for cards in playable_sets:
+        value, another_turn = after_play([card.value for card in cards], pile_value, run_rank, run_length)
+        if another_turn:
+            risks.append(PlayRisk(cards, 0.0, 0.0, True))
+            continue
+        probability = probabilities[value]
+        risks.append(PlayRisk(cards, probability, (1.0 - probability) * (pile_size + len(cards)), False))
+    return risks
+
+
+def assess_plays(game, player: Player, playable_sets: List[List[Card]]) -> List[PlayRisk]:
+    # How likely the next seat is to answer each candidate and how much it picks up when it cannot, from
+    # exact counts of the unseen cards; play_risks is cached per unseen histogram, so this is cheap per turn
+    seat = player.seat
+    responder = game.players[(seat + 1) % len(game.players)]
+    pile = game.pile
+    pile_value = game.card_utils.get_pile_top_value_for_comparison(pile) or 0
+    face_up = [card.value for card in responder.face_up]
+    return play_risks(playable_sets, unseen_counts(game, seat), len(responder.hand), face_up, pile_value,
+                      len(pile), pile.run_rank, pile.run_length)
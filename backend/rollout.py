@@ -0,0 +1,250 @@
+import math
+import random
+import time
+from typing import Callable, List, Optional
+
+from backend.card_utils import CardUtils
+
+SPECIAL_RANKS = (2, 7, 8, 10)
+NORMAL_RANKS = (3, 4, 5, 6, 9, 11, 12, 13, 14)
+RANKS = range(2, 15)
+DEADLINE_CHECK_TURNS = 16  # a fast turn takes microseconds, so this overshoots a deadline by well under 1 ms
+
+
+def choose_rank(counts: List[int], pile_value: int, hand_size: int) -> int:
+    # Lowest legal rank, with an 8 first while the hand is small and, on a pile of 10 or more, a 2 to
+    # reset it or else a 10 to burn it; 0 means pick up the pile
+    if hand_size <= 3 and counts[8]:
+        return 8
+    if pile_value >= 10:
+        if counts[2]:
+            return 2
+        if counts[10]:
+            return 10
+    for rank in NORMAL_RANKS:
+        if counts[rank] and rank >= pile_value:
+            return rank
+    for rank in SPECIAL_RANKS:
+        if counts[rank] and rank != 8:
+            return rank
+    if counts[8]:
+        return 8
+    return 0
+
+
+class RolloutState:
+    # Suit-agnostic game state for playouts: zones are rank-count arrays indexed 0-14, the pile is
+    # reduced to its rank counts, comparison value and the length of the run of equal ranks on top
+    __slots__ = ("hands", "hand_sizes", "face_up", "face_up_sizes", "face_down", "deck", "pile_counts",
+                 "pile_size", "pile_value", "run_rank", "run_length", "current")
+
+    def __init__(self, seats: int):
+        self.hands = [[0] * 15 for _ in range(seats)]
+        self.hand_sizes = [0] * seats
+        self.face_up = [[0] * 15 for _ in range(seats)]
+        self.face_up_sizes = [0] * seats
+        self.face_down: List[List[int]] = [[] for _ in range(seats)]
+        self.deck: List[int] = []
+        self.pile_counts = [0] * 15
+        self.pile_size = 0
+        self.pile_value = 0
+        self.run_rank = 0
+        self.run_length = 0
+        self.current = 0
+
+    @classmethod
+    def from_game(cls, game, seat: int, rng: random.Random) -> "RolloutState":
+        # Determinise from seat's point of view: other hands, every face-down card and the deck are redrawn
+        state = cls(len(game.players))
+        unseen = [card.value for card in game.deck]
+        for index, player in enumerate(game.players):
+            unseen.extend(card.value for card in player.face_down)
+            if index != seat:
+                unseen.extend(card.value for card in player.hand)
+        rng.shuffle(unseen)
+
+        for index, player in enumerate(game.players):
+            hand = state.hands[index]
+            if index == seat:
+                for card in player.hand:
+                    hand[card.value] += 1
+            else:
+                for _ in player.hand:
+                    hand[unseen.pop()] += 1
+            state.hand_sizes[index] = len(player.hand)
+            for card in player.face_up:
+                state.face_up[index][card.value] += 1
+            state.face_up_sizes[index] = len(player.face_up)
+            state.face_down[index] = [unseen.pop() for _ in player.face_down]
+        state.deck = unseen
+
+        for card in game.pile:
+            state.pile_counts[card.value] += 1
+        state.run_rank = game.pile.run_rank
+        state.run_length = game.pile.run_length
+        state.pile_size = len(game.pile)
+        state.pile_value = CardUtils.get_pile_top_value_for_comparison(game.pile) or 0
+        state.current = seat
+        return state
+
+    def push(self, rank: int, count: int) -> bool:
+        self.stack(rank, count)
+        return self.settle(rank)
+
+    def stack(self, rank: int, count: int):
+        self.pile_counts[rank] += count
+        self.pile_size += count
+        if rank == self.run_rank:
+            self.run_length += count
+        else:
+            self.run_rank = rank
+            self.run_length = count
+        if rank != 7 and rank != 8:
+            self.pile_value = rank
+
+    def settle(self, rank: int) -> bool:
+        # Once a play is on the pile, its last rank and the run on top decide a burn or another turn
+        if rank == 10 or self.run_length >= 4:
+            self.burn()
+            return True
+        return rank == 8
+
+    def burn(self):
+        counts = self.pile_counts
+        for rank in RANKS:
+            counts[rank] = 0
+        self.pile_size = 0
+        self.pile_value = 0
+        self.run_rank = 0
+        self.run_length = 0
+
+    def pickup(self, seat: int):
+        hand = self.hands[seat]
+        counts = self.pile_counts
+        for rank in RANKS:
+            hand[rank] += counts[rank]
+        self.hand_sizes[seat] += self.pile_size
+        self.burn()
+
+    def draw(self, seat: int):
+        hand = self.hands[seat]
+        deck = self.deck
+        while self.hand_sizes[seat] < 3 and deck:
+            hand[deck.pop()] += 1
+            self.hand_sizes[seat] += 1
+
+    def apply_ranks(self, seat: int, ranks: List[int]) -> bool:
+        # Plays an explicit set (e.g. a mixed face-up combination) as CardUtils.play_cards does: every card
+        # goes on the pile, then only the last one and the final run decide a burn or another turn
+        for rank in ranks:
+            if self.hand_sizes[seat]:
+                self.hands[seat][rank] -= 1
+                self.hand_sizes[seat] -= 1
+            elif self.face_up_sizes[seat]:
+                self.face_up[seat][rank] -= 1
+                self.face_up_sizes[seat] -= 1
+            self.stack(rank, 1)
+        another_turn = self.settle(ranks[-1]) if ranks else False
+        self.draw(seat)
+        return another_turn
+
+    def play_turn(self, rng: random.Random) -> bool:
+        seat = self.current
+        if self.hand_sizes[seat]:
+            counts = self.hands[seat]
+            sizes = self.hand_sizes
+        elif self.face_up_sizes[seat]:
+            counts = self.face_up[seat]
+            sizes = self.face_up_sizes
+        else:
+            face_down = self.face_down[seat]
+            rank = face_down.pop(rng.randrange(len(face_down)))
+            if rank in SPECIAL_RANKS or rank >= self.pile_value:
+                another_turn = self.push(rank, 1)
+                self.draw(seat)
+                return another_turn
+            # Matches the engine: the unplayable face-down card is discarded and the pile is picked up
+            self.pickup(seat)
+            self.draw(seat)
+            return False
+
+        rank = choose_rank(counts, self.pile_value, self.hand_sizes[seat])
+        if not rank:
+            self.pickup(seat)
+            self.draw(seat)
+            return False
+        count = counts[rank]
+        counts[rank] = 0
+        sizes[seat] -= count
+        another_turn = self.push(rank, count)
+        self.draw(seat)
+        return another_turn
+
+    def finished(self, seat: int) -> bool:
+        return not self.hand_sizes[seat] and not self.face_up_sizes[seat] and not self.face_down[seat]
+
+    def cards_left(self, seat: int) -> int:
+        return self.hand_sizes[seat] + self.face_up_sizes[seat] + len(self.face_down[seat])
+
+
+def playout(state: RolloutState, seat: int, another_turn: bool, rng: random.Random, turn_limit: int = 200,
+            evaluate: Optional[Callable[[RolloutState, int], float]] = None, deadline: float = math.inf):
+    # Returns (score for seat, turns played); unfinished playouts are scored by evaluate when given,
+    # otherwise by the share of the table's cards shed. The clock is read every DEADLINE_CHECK_TURNS
+    # turns, and a playout still running at the deadline returns (None, turns).
+    seats = len(state.hand_sizes)
+    turns = 0
+    while True:
+        if turns % DEADLINE_CHECK_TURNS == 0 and time.perf_counter() >= deadline:
+            return None, turns
+        if state.finished(state.current):
+            return (1.0 if state.current == seat else 0.0), turns
+        if turns >= turn_limit:
+            if evaluate is not None:
+                if not another_turn:
+                    state.current = (state.current + 1) % seats
+                return evaluate(state, seat), turns
+            total = sum(state.cards_left(index) for index in range(seats))
+            return (1.0 - state.cards_left(seat) / total if total else 0.5), turns
+        if not another_turn:
+            state.current = (state.current + 1) % seats
+        another_turn = state.play_turn(rng)
+        turns += 1
+
+
+def benchmark(seconds: float = 2.0, seed: int = 0):
+    from backend.search import AnytimeSearch
+    from backend.simulation import new_selfplay_game
+
+    game, _ = new_selfplay_game(seed)
+    player = game.players[game.current_player]
+    cards = game.card_utils.get_playable_cards(player)[0]
+    search = AnytimeSearch(game, seed=seed)
+    results = {}
+    for playout_name in ("fast", "rules"):
+        search.playout = playout_name
+        rollouts = 0
+        deadline = time.perf_counter() + seconds
+        start = time.perf_counter()
+        while time.perf_counter() < deadline:
+            search._rollout(game.current_player, cards, float("inf"))
+            rollouts += 1
+        results[playout_name] = rollouts / (time.perf_counter() - start)
+    return results
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark rollouts per second for the playout policies.")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    results = benchmark(args.seconds, args.seed)
+    for name, rate in results.items():
+        print(f"{name:>5}: {rate:10.0f} rollouts/s")
+    print(f"speed-up: {results['fast'] / results['rules']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
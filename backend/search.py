@@ -0,0 +1,151 @@
+import math
+import random
+import time
+from typing import List, Optional
+
+from backend.models import Card, Player
+from backend.rollout import RolloutState, playout
+
+
+class Decision:
+    def __init__(self, cards: Optional[List[Card]], source: str, rollouts: int = 0, nodes: int = 0,
+                 elapsed: float = 0.0):
+        self.cards = cards  # None means pick up the pile
+        self.source = source  # "rules" for the immediate fallback, "search" once rollouts have backed a move
+        self.rollouts = rollouts
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return (f"Decision(cards={self.cards}, source={self.source!r}, rollouts={self.rollouts}, "
+                f"nodes={self.nodes}, elapsed={self.elapsed:.6f})")
+
+
+class AnytimeSearch:
+    # Flat Monte Carlo over the current playable sets. Each rollout determinises the hidden cards,
+    # applies one candidate and plays out. The default "fast" playout runs the rank-count policy from
+    # backend.rollout, the "rules" playout runs the full AILogic chain on a cloned CardGame; both are
+    # bounded by rollout_turn_limit and check the deadline as they go, dropping a rollout it cuts short,
+    # so a decision returns close to its deadline. With a value_model
+    # (see backend.value_model), playouts cut off at rollout_turn_limit are scored by the model.
+
+    def __init__(self, game, max_rollouts: Optional[int] = None, rollout_turn_limit: int = 200,
+                 exploration: float = 1.4, seed: Optional[int] = None, playout: str = "fast",
+                 value_model=None):
+        if playout not in ("fast", "rules"):
+            raise ValueError(f"Unknown playout policy '{playout}'")
+        self.game = game
+        self.playout = playout
+        self.max_rollouts = max_rollouts
+        self.rollout_turn_limit = rollout_turn_limit
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self.value_model = value_model
+
+    def choose(self, player: Player, playable_sets: List[List[Card]], fallback: Optional[List[Card]],
+               deadline: float) -> Decision:
+        start = time.perf_counter()
+        if len(playable_sets) <= 1 or start >= deadline:
+            return Decision(fallback, "rules", elapsed=time.perf_counter() - start)
+
+        seat = self.game.players.index(player)
+        visits = [0] * len(playable_sets)
+        wins = [0.0] * len(playable_sets)
+        rollouts = 0
+        nodes = 0
+
+        while self.max_rollouts is None or rollouts < self.max_rollouts:
+            if time.perf_counter() >= deadline:
+                break
+            index = self._select(visits, wins, rollouts)
+            result, turns = self._rollout(seat, playable_sets[index], deadline)
+            nodes += turns
+            if result is None:
+                break
+            visits[index] += 1
+            wins[index] += result
+            rollouts += 1
+
+        if rollouts == 0:
+            return Decision(fallback, "rules", nodes=nodes, elapsed=time.perf_counter() - start)
+
+        fallback_index = playable_sets.index(fallback) if fallback in playable_sets else -1
+        best = max(range(len(playable_sets)),
+                   key=lambda i: (wins[i] / visits[i] if visits[i] else -1.0, visits[i], i == fallback_index))
+        return Decision(playable_sets[best], "search", rollouts, nodes, time.perf_counter() - start)
+
+    def evaluate(self, player: Player, playable_sets: List[Optional[List[Card]]], rollouts: int) -> List[float]:
+        # Offline analysis: the same number of rollouts for every set (None for picking up the pile), with
+        # no bandit selection and no clock, so each set's mean score is comparable; returns one mean per set
+        seat = self.game.players.index(player)
+        means = []
+        for cards in playable_sets:
+            total = 0.0
+            for _ in range(rollouts):
+                result, _ = self._rollout(seat, cards, math.inf)
+                total += result
+            means.append(total / rollouts if rollouts else 0.0)
+        return means
+
+    def _select(self, visits: List[int], wins: List[float], total: int) -> int:
+        for index, count in enumerate(visits):
+            if count == 0:
+                return index
+        log_total = math.log(total)
+        return max(range(len(visits)),
+                   key=lambda i: wins[i] / visits[i] + self.exploration * math.sqrt(log_total / visits[i]))
+
+    def _determinise(self, game, seat: int):
+        unseen = list(game.deck)
+        for index, player in enumerate(game.players):
+            unseen.extend(player.face_down)
+            if index != seat:
+                unseen.extend(player.hand)
+        self.rng.shuffle(unseen)
+
+        for index, player in enumerate(game.players):
+            player.face_down = [unseen.pop() for _ in player.face_down]
+            if index != seat:
+                player.hand = [unseen.pop() for _ in player.hand]
+        game.deck = unseen
+
+    def _rollout(self, seat: int, cards: Optional[List[Card]], deadline: float):
+        # cards None starts the playout by picking up the pile
+        if self.playout == "fast":
+            state = RolloutState.from_game(self.game, seat, self.rng)
+            if cards is None:
+                state.pickup(seat)
+                state.draw(seat)
+                another_turn = False
+            else:
+                another_turn = state.apply_ranks(seat, [card.value for card in cards])
+            evaluate = self.value_model.evaluate_rollout if self.value_model is not None else None
+            score, turns = playout(state, seat, another_turn, self.rng, self.rollout_turn_limit, evaluate, deadline)
+            return score, turns + 1
+
+        game = self.game.clone()
+        game.rng = self.rng
+        self._determinise(game, seat)
+
+        game.current_player = seat
+        player = game.players[seat]
+        another_turn = game.play_and_draw(player, list(cards)) if cards is not None else game.pickup_and_draw(player)
+        turns = 1
+
+        while not game.check_game_over():
+            if turns >= self.rollout_turn_limit:
+                if self.value_model is not None:
+                    current = game.current_player if another_turn else (game.current_player + 1) % len(game.players)
+                    return self.value_model.evaluate_game(game, seat, current), turns
+                # Otherwise unfinished playouts are scored by the share of cards shed relative to the table
+                remaining = player.total_cards()
+                total = sum(p.total_cards() for p in game.players)
+                return 1.0 - remaining / total if total else 0.5, turns
+            if time.perf_counter() >= deadline:
+                return None, turns
+            if not another_turn:
+                game.current_player = (game.current_player + 1) % len(game.players)
+            another_turn = game.computer_turn(game.players[game.current_player])
+            turns += 1
+
+        return (1.0 if game.winner is player else 0.0), turns
@@ -0,0 +1,173 @@
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+from typing import Callable, List, Optional, Sequence
+
+from backend.enums import GameOutcome
+from backend.simulation import DEFAULT_MAX_TURNS, GameResult, play_selfplay_game
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; views fall back to 2-D memoryviews
+    np = None
+
+ROW_FIELDS = ("seed", "winner", "turns", "pickups", "burns", "specials", "outcome")
+ROW_WIDTH = len(ROW_FIELDS)
+OUTCOME_CODES = {outcome: code for code, outcome in enumerate(GameOutcome)}
+HEADER_WIDTH = 2  # [head, tail]: rows written by the worker, rows consumed by the parent
+ITEM_SIZE = 8  # int64
+
+
+class ResultRing:
+    # Single-producer, single-consumer ring of fixed-width int64 result rows in shared memory.
+    # The worker only advances head and the parent only advances tail, so no lock is needed.
+
+    def __init__(self, capacity: int = 4096, name: Optional[str] = None):
+        self.capacity = capacity
+        size = (HEADER_WIDTH + capacity * ROW_WIDTH) * ITEM_SIZE
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self._words = self.shm.buf.cast("q")
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def write(self, row: Sequence[int]):
+        words = self._words
+        head = words[0]
+        while head - words[1] >= self.capacity:
+            time.sleep(0.0005)  # parent is behind; wait for it to free a slot
+        offset = HEADER_WIDTH + (head % self.capacity) * ROW_WIDTH
+        for index in range(ROW_WIDTH):
+            words[offset + index] = row[index]
+        words[0] = head + 1
+
+    def write_result(self, result: GameResult):
+        winner = -1 if result.winner is None else result.winner
+        self.write((result.seed, winner, result.turns, result.pickups, result.burns, result.specials,
+                    OUTCOME_CODES[result.outcome]))
+
+    def pending(self) -> int:
+        return self._words[0] - self._words[1]
+
+    def views(self) -> List:
+        # Zero-copy views over the unread rows: one view, or two when the unread region wraps around
+        head, tail = self._words[0], self._words[1]
+        if head == tail:
+            return []
+        start = tail % self.capacity
+        count = head - tail
+        first = min(count, self.capacity - start)
+        spans = [(start, first)] + ([(0, count - first)] if count > first else [])
+        return [self._rows(offset, length) for offset, length in spans]
+
+    def _rows(self, start: int, length: int):
+        begin = (HEADER_WIDTH + start * ROW_WIDTH) * ITEM_SIZE
+        end = begin + length * ROW_WIDTH * ITEM_SIZE
+        if np is not None:
+            return np.ndarray((length, ROW_WIDTH), dtype=np.int64, buffer=self.shm.buf[begin:end])
+        return self.shm.buf[begin:end].cast("q", shape=[length, ROW_WIDTH])
+
+    def consume(self, rows: int):
+        self._words[1] = self._words[1] + rows
+
+    def close(self):
+        self._words.release()
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+
+def _worker(ring_name: str, capacity: int, seeds: Sequence[int], max_turns: int, num_players: int):
+    ring = ResultRing(capacity, ring_name)
+    try:
+        for seed in seeds:
+            ring.write_result(play_selfplay_game(seed, max_turns=max_turns, num_players=num_players))
+    finally:
+        ring.close()
+
+
+def run_shared(seeds: Sequence[int], on_rows: Callable, workers: int = os.cpu_count() or 1,
+               capacity: int = 4096, max_turns: int = DEFAULT_MAX_TURNS, num_players: int = 2,
+               poll_interval: float = 0.001):
+    # on_rows receives each batch of rows as a view into shared memory; it must copy anything it keeps,
+    # because the slots are handed back to the worker as soon as it returns
+    seeds = list(seeds)
+    workers = max(1, min(workers, len(seeds)))
+    rings = [ResultRing(capacity) for _ in range(workers)]
+    context = multiprocessing.get_context()
+    processes = [context.Process(target=_worker, args=(ring.name, capacity, seeds[index::workers], max_turns,
+                                                       num_players), daemon=True)
+                 for index, ring in enumerate(rings)]
+    try:
+        for process in processes:
+            process.start()
+        running = list(range(workers))
+        while running:
+            idle = True
+            for index in list(running):
+                ring = rings[index]
+                alive = processes[index].is_alive()
+                views = ring.views()
+                for view in views:
+                    on_rows(view)
+                    ring.consume(len(view))
+                    idle = False
+                # Drop the views so the segment can be closed once the worker is done
+                view = views = None
+                if not alive and not ring.pending():
+                    running.remove(index)
+            if idle:
+                time.sleep(poll_interval)
+        for process in processes:
+            process.join()
+            if process.exitcode:
+                raise RuntimeError(f"Simulation worker exited with code {process.exitcode}")
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for ring in rings:
+            ring.close()
+            ring.unlink()
+
+
+class ResultTotals:
+    # Running sums over result rows, cheap enough to fold every batch straight from the shared views
+    def __init__(self, num_players: int = 2):
+        self.games = 0
+        self.wins = [0] * num_players
+        self.outcomes = [0] * len(OUTCOME_CODES)
+        self.turns = 0
+        self.pickups = 0
+        self.burns = 0
+        self.specials = 0
+
+    def __call__(self, rows):
+        if np is not None and isinstance(rows, np.ndarray):
+            self.games += len(rows)
+            winners = rows[:, 1]
+            for seat, wins in enumerate(np.bincount(winners[winners >= 0], minlength=len(self.wins))):
+                self.wins[seat] += int(wins)
+            for code, count in enumerate(np.bincount(rows[:, 6], minlength=len(self.outcomes))):
+                self.outcomes[code] += int(count)
+            turns, pickups, burns, specials = rows[:, 2:6].sum(axis=0)
+            self.turns += int(turns)
+            self.pickups += int(pickups)
+            self.burns += int(burns)
+            self.specials += int(specials)
+            return
+        for row in rows.tolist():
+            self.games += 1
+            if row[1] >= 0:
+                self.wins[row[1]] += 1
+            self.outcomes[row[6]] += 1
+            self.turns += row[2]
+            self.pickups += row[3]
+            self.burns += row[4]
+            self.specials += row[5]
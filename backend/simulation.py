@@ -0,0 +1,134 @@
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence, Tuple
+
+from backend.ai_logic import AILogic
+from backend.ai_params import AIParams
+from backend.enums import GameOutcome
+from backend.game_logic import MAX_PLAYERS, MIN_PLAYERS, CardGame
+from backend.state_hash import CycleDetector
+from backend.strategies import StrategySpec
+
+if TYPE_CHECKING:
+    from backend.game_stats import GameStats
+
+DEFAULT_MAX_TURNS = 2000
+
+
+class GameResult:
+    def __init__(self, seed: int, winner: Optional[int], turns: int, outcome: GameOutcome = GameOutcome.WIN,
+                 pickups: int = 0, burns: int = 0, specials: int = 0):
+        self.seed = seed
+        self.winner = winner  # seat index, None unless the outcome is a win
+        self.turns = turns
+        self.outcome = outcome
+        self.pickups = pickups
+        self.burns = burns
+        self.specials = specials
+
+    def __repr__(self):
+        return f"GameResult(seed={self.seed}, winner={self.winner}, turns={self.turns}, outcome={self.outcome.value})"
+
+
+def new_selfplay_game(seed: int, seat_params: Optional[Sequence[AIParams]] = None, num_players: int = 2,
+                      verbose: bool = False, strategies: Optional[Sequence[StrategySpec]] = None
+                      ) -> Tuple[CardGame, Optional[List[AILogic]]]:
+    # With strategies every seat plays through its own strategy and no per-seat AILogic is returned
+    if seat_params and strategies:
+        raise ValueError("Give either seat_params or strategies, not both")
+    game = CardGame(seed=seed, verbose=verbose, num_players=num_players, strategies=strategies)
+    game.deal_cards()
+    if strategies:
+        for player in game.players:
+            game.strategy_for(player).choose_setup(player)
+            player.face_up.sort(key=lambda card: card.value)
+            game.zones.update(player)
+        return game, None
+    if seat_params:
+        seat_ais = [AILogic(game, params=params) for params in seat_params]
+    else:
+        seat_ais = [game.ai_logic] * len(game.players)
+    for ai_logic, player in zip(seat_ais, game.players):
+        ai_logic.choose_ai_setup_cards(player)
+        player.face_up.sort(key=lambda card: card.value)
+        game.zones.update(player)
+    return game, seat_ais
+
+
+def _result(game: CardGame, seed: int, turns: int, outcome: GameOutcome) -> GameResult:
+    winner = game.players.index(game.winner) if outcome is GameOutcome.WIN else None
+    return GameResult(seed, winner, turns, outcome, game.pickups, game.burns, game.specials_played)
+
+
+def run_selfplay_game(game: CardGame, seat_ais: Optional[Sequence[AILogic]], seed: int,
+                      max_turns: int = DEFAULT_MAX_TURNS, detect_cycles: bool = True,
+                      on_turn: Optional[Callable[[CardGame], None]] = None) -> GameResult:
+    # Stops with a draw at the first repeated position (see CycleDetector). Seats without an AILogic
+    # play through game.strategy_for, and a seat whose strategy is not deterministic turns cycle
+    # detection off.
+    if seat_ais is None:
+        detect_cycles = detect_cycles and all(game.strategy_for(player).deterministic for player in game.players)
+    cycles = CycleDetector(len(game.players)) if detect_cycles else None
+    turns = 0
+    while turns < max_turns:
+        seat = game.current_player
+        player = game.players[seat]
+        if cycles is not None and cycles.repeated(game):
+            return _result(game, seed, turns, GameOutcome.DRAWN)
+        if on_turn is not None:
+            on_turn(game)
+        another_turn = game.computer_turn(player, ai_logic=seat_ais[seat] if seat_ais is not None else None)
+        turns += 1
+        if game.check_game_over():
+            return _result(game, seed, turns, GameOutcome.WIN)
+        if not another_turn:
+            game.current_player = (seat + 1) % len(game.players)
+    return _result(game, seed, turns, GameOutcome.ABORTED)
+
+
+def play_selfplay_game(seed: int, seat_params: Optional[Sequence[AIParams]] = None,
+                       max_turns: int = DEFAULT_MAX_TURNS, num_players: int = 2,
+                       detect_cycles: bool = True, strategies: Optional[Sequence[StrategySpec]] = None,
+                       stats: Optional["GameStats"] = None) -> GameResult:
+    game, seat_ais = new_selfplay_game(seed, seat_params, num_players, strategies=strategies)
+    if stats is None:
+        return run_selfplay_game(game, seat_ais, seed, max_turns, detect_cycles)
+    observer = stats.observe(game)
+    try:
+        return run_selfplay_game(game, seat_ais, seed, max_turns, detect_cycles)
+    finally:
+        observer.finish()
+
+
+def benchmark_seats(games: int = 200, seats: Sequence[int] = range(MIN_PLAYERS, MAX_PLAYERS + 1),
+                    seed: int = 0) -> dict:
+    # Turns per second for each table size over the same seeds. Every turn is one seat acting, so
+    # with O(1) opponent queries the rate should stay flat as seats are added.
+    import time
+
+    rates = {}
+    for num_players in seats:
+        turns = 0
+        elapsed = 0.0
+        for game_seed in range(seed, seed + games):
+            game, seat_ais = new_selfplay_game(game_seed, num_players=num_players)
+            start = time.perf_counter()
+            turns += run_selfplay_game(game, seat_ais, game_seed).turns
+            elapsed += time.perf_counter() - start
+        rates[num_players] = turns / elapsed
+    return rates
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark self-play turns per second by table size.")
+    parser.add_argument("--games", type=int, default=200, help="games per table size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rates = benchmark_seats(args.games, seed=args.seed)
+    baseline = rates[min(rates)]
+    for num_players, rate in rates.items():
+        print(f"{num_players} seats: {rate:10.0f} turns/s ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
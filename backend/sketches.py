@@ -0,0 +1,107 @@
+import math
+from typing import Optional, Tuple
+
+
+class HdrHistogram:
+    # Fixed-memory histogram of non-negative integers in the style of HdrHistogram: values below
+    # 2^significant_bits get a bucket each, and every power of two above that is split into half as many
+    # equal buckets, so any recorded value is known to within 2^-(significant_bits - 1) of itself. Values
+    # above 2^max_bits share the last bucket; count, sum, min and max stay exact. Histograms with the same
+    # layout merge by adding bucket counts, so per-worker histograms combine into the one a single process
+    # would have built.
+
+    def __init__(self, significant_bits: int = 5, max_bits: int = 20):
+        if not 1 <= significant_bits <= max_bits:
+            raise ValueError(f"Need 1 <= significant_bits <= max_bits, got {significant_bits} and {max_bits}")
+        self.significant_bits = significant_bits
+        self.max_bits = max_bits
+        self.sub_buckets = 1 << significant_bits
+        self.half = self.sub_buckets >> 1
+        self.counts = [0] * (self.sub_buckets + (max_bits - significant_bits) * self.half)
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_buckets:
+            return value
+        shift = value.bit_length() - self.significant_bits
+        index = self.sub_buckets + (shift - 1) * self.half + (value >> shift) - self.half
+        return min(index, len(self.counts) - 1)
+
+    def _bounds(self, index: int) -> Tuple[int, int]:
+        # Lowest and highest value that land in bucket index
+        if index < self.sub_buckets:
+            return index, index
+        shift, offset = divmod(index - self.sub_buckets, self.half)
+        shift += 1
+        low = (offset + self.half) << shift
+        return low, low + (1 << shift) - 1
+
+    def record(self, value: int, count: int = 1):
+        if value < 0:
+            raise ValueError(f"HdrHistogram records non-negative values, got {value}")
+        self.counts[self._index(value)] += count
+        self.count += count
+        self.total += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: "HdrHistogram"):
+        if (other.significant_bits, other.max_bits) != (self.significant_bits, self.max_bits):
+            raise ValueError("Cannot merge histograms with different bucket layouts")
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> int:
+        # The midpoint of the bucket holding the q-quantile, clamped to the exact extremes
+        if not self.count:
+            return 0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                low, high = self._bounds(index)
+                return min(max((low + high) // 2, self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        # Sparse, so a histogram of a few small values serialises to a few entries
+        return {"significant_bits": self.significant_bits, "max_bits": self.max_bits, "count": self.count,
+                "total": self.total, "min": self.min, "max": self.max,
+                "counts": {str(index): count for index, count in enumerate(self.counts) if count}}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HdrHistogram":
+        histogram = cls(data["significant_bits"], data["max_bits"])
+        for index, count in data["counts"].items():
+            histogram.counts[int(index)] = count
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.min = data["min"]
+        histogram.max = data["max"]
+        return histogram
+
+    def summary(self, quantiles=(0.5, 0.9, 0.99)) -> str:
+        if not self.count:
+            return "n=0"
+        parts = [f"n={self.count}", f"mean={self.mean:.2f}"]
+        parts.extend(f"p{round(q * 100):g}={self.quantile(q)}" for q in quantiles)
+        parts.append(f"max={self.max}")
+        return " ".join(parts)
+
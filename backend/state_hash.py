@@ -0,0 +1,61 @@
+import random
+from typing import List, Optional
+
+from backend.models import Card
+
+MASK = (1 << 64) - 1
+MAX_MULTIPLICITY = 8  # two decks
+
+
+class StateHasher:
+    # Zobrist keys for every (seat, zone, rank, occurrence) plus a rolling polynomial hash over the
+    # pile and deck rank sequences, whose order matters. Suits are ignored throughout.
+    def __init__(self, seats: int, seed: int = 0x5EED):
+        rng = random.Random(seed)
+        self.zone_keys = [[[[rng.getrandbits(64) for _ in range(MAX_MULTIPLICITY + 1)] for _ in range(15)]
+                           for _ in range(3)] for _ in range(seats)]
+        self.turn_keys = [rng.getrandbits(64) for _ in range(seats)]
+
+    @staticmethod
+    def _sequence_hash(cards: List[Card], h: int) -> int:
+        for card in cards:
+            h = (h * 1000003 + card.value) & MASK
+        return h
+
+    def hash(self, game) -> int:
+        # The k-th card of a rank in a zone contributes the key for occurrence k, so the XOR over a zone
+        # identifies its rank multiset with one pass over its cards (and one more to reset the counts)
+        h = self.turn_keys[game.current_player]
+        counts = [0] * 15
+        for seat_keys, player in zip(self.zone_keys, game.players):
+            for zone_keys, zone in zip(seat_keys, (player.hand, player.face_up, player.face_down)):
+                for card in zone:
+                    value = card.value
+                    count = counts[value] + 1
+                    counts[value] = count
+                    h ^= zone_keys[value][count]
+                for card in zone:
+                    counts[card.value] = 0
+        h = self._sequence_hash(game.pile, h ^ len(game.pile))
+        return self._sequence_hash(game.deck, (h * 31 + len(game.deck)) & MASK)
+
+
+class CycleDetector:
+    # Seats that play deterministically make the next position a function of the current one, deck order
+    # included, so a position seen twice means the game will loop forever, whether or not the deck is
+    # empty. Blind face-down flips are random and reset the history. Call repeated() before every turn.
+    def __init__(self, seats: int):
+        self.hasher = StateHasher(seats)
+        self.seen = set()
+
+    def repeated(self, game, key: Optional[int] = None) -> bool:
+        # key is the position's StateHasher hash when the caller already has it
+        if game.players[game.current_player].can_play_from_face_down():
+            self.seen.clear()
+            return False
+        if key is None:
+            key = self.hasher.hash(game)
+        if key in self.seen:
+            return True
+        self.seen.add(key)
+        return False
@@ -0,0 +1,128 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple, Type, Union
+
+from backend.ai_logic import AILogic
+from backend.ai_params import AIParams
+from backend.models import Card, Player
+from backend.search import AnytimeSearch
+
+# A seat's strategy is given as a registered name, or as (name, options) with options passed to its constructor
+StrategySpec = Union[str, Tuple[str, dict]]
+
+
+class Strategy(ABC):
+    # The three decisions a seat makes. The engine only offers legal options and applies the result.
+    name = ""
+
+    def __init__(self, game):
+        self.game = game
+
+    @property
+    def deterministic(self) -> bool:
+        # Deterministic strategies make a repeated position mean a repeating game, which self-play uses to
+        # stop cycles early; strategies that draw on randomness or the clock must say otherwise, and a
+        # move time budget puts the clock in charge of any seat
+        return self.game.move_time_budget is None
+
+    @abstractmethod
+    def choose_setup(self, player: Player):
+        # Rearranges player.hand and player.face_up in place
+        ...
+
+    @abstractmethod
+    def choose_play(self, player: Player, playable_sets: List[List[Card]], top_pile_value: int,
+                    deadline: Optional[float] = None) -> Optional[List[Card]]:
+        # One of playable_sets, or None to pick up the pile
+        ...
+
+    @abstractmethod
+    def choose_face_down(self, player: Player) -> int:
+        # One of player.face_down_positions
+        ...
+
+
+STRATEGIES: Dict[str, Type[Strategy]] = {}
+
+
+def register_strategy(name: str):
+    def register(cls: Type[Strategy]) -> Type[Strategy]:
+        if cls.__abstractmethods__:
+            raise TypeError(f"Strategy '{name}' does not implement {', '.join(sorted(cls.__abstractmethods__))}")
+        cls.name = name
+        STRATEGIES[name] = cls
+        return cls
+    return register
+
+
+def create_strategy(spec: StrategySpec, game) -> Strategy:
+    name, options = (spec, {}) if isinstance(spec, str) else spec
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{name}'; registered: {', '.join(sorted(STRATEGIES))}")
+    return STRATEGIES[name](game, **options)
+
+
+def create_strategies(specs: Sequence[Optional[StrategySpec]], game) -> List[Optional[Strategy]]:
+    return [None if spec is None else create_strategy(spec, game) for spec in specs]
+
+
+@register_strategy("rules")
+class RulesStrategy(Strategy):
+    # The rule chain of AILogic, with the anytime search when a deadline is given and the AI has one
+
+    def __init__(self, game, params: Union[AIParams, dict, None] = None, ai_logic: Optional[AILogic] = None):
+        super().__init__(game)
+        if isinstance(params, dict):
+            params = AIParams(**params)
+        self.ai_logic = ai_logic if ai_logic is not None else AILogic(game, params=params)
+
+    @property
+    def deterministic(self) -> bool:
+        # Once the AI has a search, any deadline hands its plays to rollouts
+        return super().deterministic and self.ai_logic.search is None
+
+    def choose_setup(self, player: Player):
+        self.ai_logic.choose_ai_setup_cards(player)
+
+    def choose_play(self, player: Player, playable_sets: List[List[Card]], top_pile_value: int,
+                    deadline: Optional[float] = None) -> Optional[List[Card]]:
+        if deadline is None:
+            return self.ai_logic.computer_choose_playable_set(playable_sets, top_pile_value, player)
+        return self.ai_logic.choose_playable_set_by(deadline, playable_sets, top_pile_value, player).cards
+
+    def choose_face_down(self, player: Player) -> int:
+        return self.game.rng.choice(player.face_down_positions)
+
+
+@register_strategy("random")
+class RandomStrategy(Strategy):
+    # Uniformly random legal choices from the game's generator; a floor for comparisons
+    deterministic = False
+
+    def choose_setup(self, player: Player):
+        combined = player.hand + player.face_up
+        player.face_up = self.game.rng.sample(combined, 3)
+        player.hand = [card for card in combined if not any(card is chosen for chosen in player.face_up)]
+
+    def choose_play(self, player: Player, playable_sets: List[List[Card]], top_pile_value: int,
+                    deadline: Optional[float] = None) -> Optional[List[Card]]:
+        return self.game.rng.choice(playable_sets) if playable_sets else None
+
+    def choose_face_down(self, player: Player) -> int:
+        return self.game.rng.choice(player.face_down_positions)
+
+
+@register_strategy("search")
+class SearchStrategy(RulesStrategy):
+    # Rule-based setup and face-down play, with every play decided by flat Monte Carlo rollouts
+    deterministic = False
+
+    def __init__(self, game, params: Union[AIParams, dict, None] = None, rollouts: int = 200,
+                 seed: Optional[int] = None, playout: str = "fast"):
+        super().__init__(game, params)
+        self.ai_logic.search = AnytimeSearch(game, max_rollouts=rollouts, seed=seed, playout=playout)
+
+    def choose_play(self, player: Player, playable_sets: List[List[Card]], top_pile_value: int,
+                    deadline: Optional[float] = None) -> Optional[List[Card]]:
+        # Bounded by the rollout count rather than the clock unless the game sets a deadline
+        deadline = float("inf") if deadline is None else deadline
+        return self.ai_logic.choose_playable_set_by(deadline, playable_sets, top_pile_value, player).cards
@@ -0,0 +1,166 @@
+import hashlib
+import inspect
+import mmap
+import os
+import struct
+from itertools import combinations_with_replacement
+from math import comb
+from typing import List, Optional
+
+from backend.ai_params import AIParams
+from backend.card_utils import CardUtils
+from backend.enums import Suit
+from backend.file_utils import write_bytes_atomic
+from backend.models import Card, Player
+
+MAGIC = b"SHTB"
+FORMAT_VERSION = 1
+CACHE_DIR_ENV = "SHITHEAD_TABLE_CACHE"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "shithead")
+TABLE_FILE = "rule_tables.bin"
+
+RANKS = range(2, 15)
+SETUP_CARDS = 6  # three dealt to the hand plus three face-up
+_, SETUP_MIN_THRESHOLD, SETUP_MAX_THRESHOLD = AIParams.SPEC["high_value_threshold"]
+SETUP_ENTRIES = comb(len(RANKS) + SETUP_CARDS - 1, SETUP_CARDS)  # rank multisets of a six-card deal
+
+# Flat layout: header, then play[rank * 15 + value to beat] as 0/1 bytes, then for every threshold and
+# every sorted six-card rank multiset the three face-up ranks the setup heuristic picks, in pick order
+HEADER = struct.Struct("<4sHH32sQ")  # magic, format version, setup cards, rules digest, file size
+PLAY_OFFSET = 64
+PLAY_SIZE = 15 * 15
+SETUP_OFFSET = PLAY_OFFSET + PLAY_SIZE
+SETUP_SIZE = (SETUP_MAX_THRESHOLD - SETUP_MIN_THRESHOLD + 1) * SETUP_ENTRIES * 3
+TABLE_SIZE = SETUP_OFFSET + SETUP_SIZE
+
+# _BINOMIAL[n][k] for the combinatorial number system used to index rank multisets
+_BINOMIAL = [[comb(n, k) for k in range(SETUP_CARDS + 1)] for n in range(len(RANKS) + SETUP_CARDS)]
+
+
+def rules_digest() -> bytes:
+    # Any edit to the rule code the tables are built from changes the digest and invalidates the cache
+    from backend.ai_logic import AILogic
+
+    digest = hashlib.sha256(f"{FORMAT_VERSION}:{TABLE_SIZE}".encode())
+    for function in (CardUtils.can_play_cards_by_rules, CardUtils._base_card_value,
+                     CardUtils.get_pile_top_value_for_comparison, AILogic.setup_face_up_by_rules):
+        digest.update(inspect.getsource(function).encode())
+    return digest.digest()
+
+
+def setup_index(values: List[int]) -> int:
+    # Position of a sorted rank multiset among all multisets of the same size
+    return sum(_BINOMIAL[value - 2 + position][position + 1] for position, value in enumerate(values))
+
+
+class RuleTables:
+    # Read-only views over a memory-mapped table file; every process mapping the same file shares
+    # one physical copy through the page cache
+
+    def __init__(self, mapped: mmap.mmap, path: Optional[str] = None):
+        self.path = path
+        self._mapped = mapped
+        view = memoryview(mapped)
+        self.play = view[PLAY_OFFSET:PLAY_OFFSET + PLAY_SIZE]
+        self.setup = view[SETUP_OFFSET:SETUP_OFFSET + SETUP_SIZE]
+        view.release()
+
+    @staticmethod
+    def has_setup(cards: int, threshold: int) -> bool:
+        return cards == SETUP_CARDS and SETUP_MIN_THRESHOLD <= threshold <= SETUP_MAX_THRESHOLD
+
+    def setup_ranks(self, cards: List[Card], threshold: int) -> List[int]:
+        index = (threshold - SETUP_MIN_THRESHOLD) * SETUP_ENTRIES + setup_index(sorted(c.value for c in cards))
+        return self.setup[index * 3:index * 3 + 3].tolist()
+
+    def close(self):
+        self.play.release()
+        self.setup.release()
+        self._mapped.close()
+
+
+def build_tables() -> bytes:
+    from backend.ai_logic import AILogic
+    from backend.game_logic import CardGame
+
+    data = bytearray(TABLE_SIZE)
+    HEADER.pack_into(data, 0, MAGIC, FORMAT_VERSION, SETUP_CARDS, rules_digest(), TABLE_SIZE)
+
+    # A one-seat scratch game with cards in hand; pile values 7, 8 and 10 are never looked up
+    game = CardGame(verbose=False)
+    player = Player("tables")
+    player.hand = [Card(3, Suit.HEARTS)]
+    game.players = [player]
+    card_utils = CardUtils(game)
+    for pile_value in range(15):
+        game.pile = [Card(pile_value, Suit.SPADES)] if pile_value >= 2 else []
+        for rank in RANKS:
+            data[PLAY_OFFSET + rank * 15 + pile_value] = card_utils.can_play_cards_by_rules([Card(rank, Suit.HEARTS)])
+
+    suits = list(Suit)
+    for values in combinations_with_replacement(RANKS, SETUP_CARDS):
+        cards = [Card(value, suits[position % len(suits)]) for position, value in enumerate(values)]
+        index = setup_index(list(values))
+        for threshold in range(SETUP_MIN_THRESHOLD, SETUP_MAX_THRESHOLD + 1):
+            offset = SETUP_OFFSET + ((threshold - SETUP_MIN_THRESHOLD) * SETUP_ENTRIES + index) * 3
+            data[offset:offset + 3] = bytes(card.value for card in AILogic.setup_face_up_by_rules(cards, threshold))
+    return bytes(data)
+
+
+def _open_tables(path: str, digest: bytes) -> Optional[RuleTables]:
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        if os.fstat(f.fileno()).st_size != TABLE_SIZE:
+            return None
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if HEADER.unpack_from(mapped) != (MAGIC, FORMAT_VERSION, SETUP_CARDS, digest, TABLE_SIZE):
+        mapped.close()
+        return None
+    return RuleTables(mapped, path)
+
+
+def table_path(cache_dir: Optional[str] = None) -> str:
+    return os.path.join(cache_dir or os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR), TABLE_FILE)
+
+
+def load_tables(cache_dir: Optional[str] = None, rebuild: bool = False) -> RuleTables:
+    # Maps the cached tables, rebuilding them first if they are missing, truncated or built from other rules
+    path = table_path(cache_dir)
+    digest = rules_digest()
+    tables = None if rebuild else _open_tables(path, digest)
+    if tables is None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_bytes_atomic(path, build_tables())
+        tables = _open_tables(path, digest)
+    return tables
+
+
+def install_tables(tables: Optional[RuleTables]):
+    # Routes CardUtils.can_play_cards and AILogic.choose_ai_setup_cards through the tables, or back to the
+    # rules when given None
+    CardUtils.tables = tables
+
+
+def use_tables(cache_dir: Optional[str] = None) -> RuleTables:
+    # Also usable as a multiprocessing Pool initializer
+    tables = load_tables(cache_dir)
+    install_tables(tables)
+    return tables
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or check the memory-mapped rule table cache.")
+    parser.add_argument("--cache-dir", help=f"defaults to ${CACHE_DIR_ENV} or {DEFAULT_CACHE_DIR}")
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args()
+    tables = load_tables(args.cache_dir, args.rebuild)
+    print(f"{tables.path}: {TABLE_SIZE:,} bytes, rules digest {rules_digest().hex()[:16]}")
+
+
+if __name__ == "__main__":
+    main()
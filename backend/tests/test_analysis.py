@@ -0,0 +1,57 @@
+import unittest
+from collections import Counter
+
+from backend.analysis import analyse_position, analyse_positions, decode_position, encode_position, \
+    load_position, position_after
+
+
+class TestPositionAnalysis(unittest.TestCase):
+    def test_encoding_round_trips_a_seeded_position(self):
+        """Test that a mid-game position survives encoding and rebuilding without dealing."""
+        game = position_after(3, 10)
+        text = encode_position(game)
+        rebuilt = decode_position(text, seed=9)
+        self.assertEqual(encode_position(rebuilt), text)
+        self.assertEqual(rebuilt.zones.hand, game.zones.hand)
+        self.assertEqual(rebuilt.pile.run_rank, game.pile.run_rank)
+
+    def test_unknown_cards_come_from_the_unseen_remainder(self):
+        """Test that hidden cards are filled without exceeding any rank's count in the deck."""
+        game = decode_position("AAA.KKK.???/???..??|AQ|10|1", seed=4)
+        ranks = Counter(card.value for player in game.players
+                        for zone in (player.hand, player.face_up, player.face_down) for card in zone)
+        ranks.update(card.value for card in game.deck + list(game.pile))
+        self.assertEqual(ranks[14], 4)
+        self.assertLessEqual(max(ranks.values()), 4)
+        self.assertEqual((len(game.players[1].hand), len(game.players[1].face_down), len(game.deck)), (3, 2, 10))
+        self.assertEqual(game.current_player, 1)
+        for bad in ("AAAAA...|.|0|0", "3.4.5|6|0|0", "3..?/4..?|5|0|2", "3..?/4..?|5|99|0"):
+            with self.assertRaises(ValueError):
+                decode_position(bad)
+
+    def test_every_legal_move_is_ranked(self):
+        """Test that each legal set and the tactical pickup get equal rollouts and the rule-based choice is marked."""
+        game = position_after(3, 10)
+        self.assertTrue(game.pile)
+        playable = game.card_utils.get_playable_cards(game.players[game.current_player])
+        seat, moves = analyse_position(game, rollouts=20, seed=1)
+        self.assertEqual(seat, game.current_player)
+        self.assertEqual(len(moves), len(playable) + 1)
+        self.assertEqual([move["move"] for move in moves].count("pickup"), 1)
+        self.assertEqual([move["rank"] for move in moves], list(range(1, len(playable) + 2)))
+        self.assertEqual(sum(move["rules_choice"] for move in moves), 1)
+        scores = [move["score"] for move in moves]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(analyse_position(position_after(3, 10), rollouts=20, seed=1)[1], moves)
+
+    def test_parallel_results_match_serial(self):
+        """Test that positions analysed across workers give the same rankings, streamed in any order."""
+        specs = ["seed:1:4", "seed:2:0", encode_position(load_position("seed:5:12")), "seed:1:100000"]
+        serial = sorted(analyse_positions(specs, rollouts=10), key=lambda result: result["position"])
+        parallel = sorted(analyse_positions(specs, rollouts=10, workers=2), key=lambda result: result["position"])
+        self.assertEqual(parallel, serial)
+        self.assertIn("error", serial[3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+
+from backend.batch import MAX_RECORDED_SEEDS, BatchReport, run_batch
+from backend.enums import GameOutcome, Suit
+from backend.game_logic import CardGame
+from backend.models import Card, Player
+from backend.simulation import GameResult, new_selfplay_game, play_selfplay_game, run_selfplay_game
+from backend.state_hash import StateHasher
+from backend.strategies import RulesStrategy
+
+
+class AlwaysPickUp(RulesStrategy):
+    """Picks up the pile every turn, so two such seats repeat positions while the deck still has cards."""
+
+    def choose_play(self, player, playable_sets, top_pile_value, deadline=None):
+        return None
+
+
+class TestRunawayDetection(unittest.TestCase):
+    def test_cycle_is_drawn(self):
+        """Test that a seed known to loop on pickups ends as a draw well before the turn cap."""
+        result = play_selfplay_game(41)
+        self.assertEqual(result.outcome, GameOutcome.DRAWN)
+        self.assertIsNone(result.winner)
+        self.assertLess(result.turns, 200)
+
+    def test_cycle_with_cards_left_in_the_deck_is_drawn(self):
+        """Test that a loop is drawn while the deck still has cards, as nobody below three cards draws."""
+        game, _ = new_selfplay_game(0)
+        game.strategies = [AlwaysPickUp(game) for _ in game.players]
+        result = run_selfplay_game(game, None, 0, max_turns=100)
+        self.assertEqual(result.outcome, GameOutcome.DRAWN)
+        self.assertEqual(result.turns, 2)
+        self.assertTrue(game.deck)
+
+    def test_turn_cap_aborts(self):
+        """Test that the turn cap stops a game when cycle detection is off."""
+        result = play_selfplay_game(41, max_turns=150, detect_cycles=False)
+        self.assertEqual(result.outcome, GameOutcome.ABORTED)
+        self.assertEqual(result.turns, 150)
+
+    def test_finished_game_is_a_win(self):
+        """Test that ordinary games still report their winner."""
+        result = play_selfplay_game(0)
+        self.assertEqual(result.outcome, GameOutcome.WIN)
+        self.assertIn(result.winner, (0, 1))
+
+    def test_state_hash_ignores_suits(self):
+        """Test that the state hash depends on ranks only."""
+        game = CardGame(verbose=False)
+        game.players = [Player("ME"), Player("COMPUTER")]
+        hasher = StateHasher(2)
+        game.players[0].hand = [Card(5, Suit.HEARTS), Card(9, Suit.CLUBS)]
+        game.pile = [Card(4, Suit.SPADES)]
+        first = hasher.hash(game)
+        game.players[0].hand = [Card(5, Suit.SPADES), Card(9, Suit.DIAMONDS)]
+        game.pile = [Card(4, Suit.HEARTS)]
+        self.assertEqual(hasher.hash(game), first)
+        game.current_player = 1
+        self.assertNotEqual(hasher.hash(game), first)
+
+
+class TestBatchReport(unittest.TestCase):
+    def test_report_counts_outcomes(self):
+        """Test outcome frequencies, merging and the recorded pathological seeds."""
+        report = BatchReport()
+        report.add(GameResult(1, 0, 50))
+        other = BatchReport()
+        other.add(GameResult(2, None, 80, GameOutcome.DRAWN))
+        other.add(GameResult(3, None, 2000, GameOutcome.ABORTED))
+        report.merge(other)
+        self.assertEqual(report.games, 3)
+        self.assertEqual(report.wins, [1, 0])
+        self.assertEqual(report.outcomes[GameOutcome.DRAWN.value], 1)
+        self.assertEqual([seed for seed, _, _ in report.stopped], [2, 3])
+        self.assertEqual(report.length_quantiles(GameOutcome.ABORTED), [2000] * 4)
+        self.assertIn("drawn", report.format())
+
+    def test_length_distribution_covers_games_past_the_seed_cap(self):
+        """Test that drawn lengths count every game while only the first seeds are kept for replay."""
+        report = BatchReport()
+        for seed in range(MAX_RECORDED_SEEDS):
+            report.add(GameResult(seed, None, 10, GameOutcome.DRAWN))
+        later = BatchReport()
+        for seed in range(MAX_RECORDED_SEEDS, 3 * MAX_RECORDED_SEEDS):
+            later.add(GameResult(seed, None, 90, GameOutcome.DRAWN))
+        report.merge(later)
+        self.assertEqual(len(report.stopped), MAX_RECORDED_SEEDS)
+        self.assertEqual(report.length_quantiles(GameOutcome.DRAWN), [90, 90, 90, 90])
+        self.assertAlmostEqual(report.mean_length(GameOutcome.DRAWN), (10 + 2 * 90) / 3)
+        restored = BatchReport.from_dict(report.to_dict())
+        self.assertEqual(restored.length_quantiles(GameOutcome.DRAWN, (0.2, 0.5)), [10, 90])
+
+    def test_run_batch(self):
+        """Test a small serial batch over consecutive seeds."""
+        report = run_batch(range(40, 50), workers=1)
+        self.assertEqual(report.games, 10)
+        self.assertIn(41, [seed for seed, _, _ in report.stopped])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import random
+import unittest
+
+from backend import batch_policy
+from backend.ai_params import AIParams
+from backend.batch_policy import cards_for_move, decide_batch, decide_games, encode_state
+from backend.game_logic import CardGame
+from backend.models import Player
+from backend.simulation import new_selfplay_game
+
+
+def random_position(rng: random.Random) -> CardGame:
+    game = CardGame(seed=rng.randrange(1 << 30), verbose=False)
+    deck = game.card_utils.create_deck(2)
+    rng.shuffle(deck)
+    player, opponent = Player("Computer 1", is_computer=True), Player("Computer 2", is_computer=True)
+    if rng.random() < 0.6:
+        player.hand = [deck.pop() for _ in range(rng.choice((1, 2, 3, 4, 8, 14)))]
+    player.face_up = [deck.pop() for _ in range(rng.randint(1, 3))]
+    if rng.random() < 0.3:
+        # Pile topped by three of a kind, to reach the burn branch
+        rank = rng.choice((3, 5, 9, 12, 8))
+        game.pile = [deck.pop()] + [card for card in deck if card.value == rank][:3]
+    else:
+        game.pile = [deck.pop() for _ in range(rng.randint(0, 4))]
+    if rng.random() < 0.3:
+        opponent.face_down = [deck.pop()]
+    else:
+        opponent.hand = [deck.pop() for _ in range(3)]
+    game.players = [player, opponent]
+    return game
+
+
+@unittest.skipIf(batch_policy.np is None, "NumPy is not installed")
+class TestBatchPolicy(unittest.TestCase):
+    def test_matches_scalar_choices(self):
+        """Test that the vectorised decisions equal computer_choose_playable_set on random positions."""
+        rng = random.Random(11)
+        for params in (AIParams(), AIParams(eights_hand_limit=0, twos_pile_threshold=4, large_hand_limit=2)):
+            games = [random_position(rng) for _ in range(3000)]
+            states = [encode_state(game, game.players[0]) for game in games]
+            moves = decide_batch(states, params)
+            for game, move in zip(games, moves):
+                player = game.players[0]
+                game.ai_logic.params = params
+                expected = game.ai_logic.computer_choose_playable_set(
+                    game.card_utils.get_playable_cards(player), game.card_utils.get_top_pile_value(), player)
+                self.assertEqual(cards_for_move(player, int(move)), expected,
+                                 (player.hand, player.face_up, game.pile))
+
+    def test_lockstep_games_match_scalar_play(self):
+        """Test that games stepped together through decide_games follow the same moves as the engine."""
+        games = [new_selfplay_game(seed)[0] for seed in range(20)]
+        for _ in range(30):
+            active = [game for game in games
+                      if not game.game_over and not game.players[game.current_player].can_play_from_face_down()]
+            if not active:
+                break
+            for game, chosen in zip(active, decide_games(active)):
+                player = game.players[game.current_player]
+                expected = game.ai_logic.computer_choose_playable_set(
+                    game.card_utils.get_playable_cards(player), game.card_utils.get_top_pile_value(), player)
+                self.assertEqual(chosen, expected)
+                if chosen:
+                    another_turn = game.play_and_draw(player, chosen)
+                else:
+                    game.pickup_and_draw(player)
+                    another_turn = False
+                if not game.check_game_over() and not another_turn:
+                    game.current_player = (game.current_player + 1) % len(game.players)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from backend.differential import ENGINES, Engine, ReferenceEngine, compare_seed, create_engine, register_engine, \
+    run_differential
+from backend.enums import GameOutcome
+from backend.simulation import new_selfplay_game, play_selfplay_game
+from backend.tables import CACHE_DIR_ENV
+from backend.trace import FACE_DOWN, PICKUP, PLAY, SETUP, TraceRecorder, trace_game
+
+
+@register_engine("test_off_by_one_hash")
+class OffByOneHash(ReferenceEngine):
+    # A fork that gets the state wrong at turn 7 of every seed ending in 3
+    def trace(self, seed, num_players, max_turns):
+        for record in super().trace(seed, num_players, max_turns):
+            if seed % 10 == 3 and record.turn == 7:
+                record = record._replace(state_hash=record.state_hash ^ 1)
+            yield record
+
+
+class TestDifferential(unittest.TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        del ENGINES["test_off_by_one_hash"]
+
+    def test_incomplete_engine_is_rejected_at_registration(self):
+        """Test that an engine without a trace cannot be registered."""
+        with self.assertRaises(TypeError):
+            @register_engine("test_no_trace")
+            class NoTrace(Engine):
+                pass
+        self.assertNotIn("test_no_trace", ENGINES)
+
+    def test_trace_follows_the_selfplay_game(self):
+        """Test that the trace starts with the setup and records every turn of the self-play game."""
+        for seed in range(5):
+            game, _ = new_selfplay_game(seed)
+            records = TraceRecorder().record(game)
+            result = play_selfplay_game(seed)
+            self.assertEqual(records[0].move[0], SETUP)
+            self.assertEqual(len(records) - 1, result.turns)
+            for record in records[1:]:
+                self.assertIn(record.move[0], (PLAY, PICKUP, FACE_DOWN))
+                if record.move[0] == PLAY:
+                    self.assertIn(record.move[1], record.legal)
+
+    def test_trace_stops_drawn_games_where_selfplay_does(self):
+        """Test that the trace ends a cycling game after the same number of turns as run_selfplay_game."""
+        for seed in (41, 77):
+            result = play_selfplay_game(seed)
+            self.assertEqual(result.outcome, GameOutcome.DRAWN)
+            records = list(trace_game(new_selfplay_game(seed)[0]))
+            self.assertEqual(records[-1].turn, result.turns)
+
+    def test_trace_is_deterministic(self):
+        """Test that the same seed always produces the same records and readable lines."""
+        first = list(trace_game(new_selfplay_game(11)[0]))
+        second = list(trace_game(new_selfplay_game(11)[0]))
+        self.assertEqual(first, second)
+        self.assertEqual(len(list(TraceRecorder(first).lines())), len(first))
+
+    def test_reference_and_tables_agree(self):
+        """Test that the rule-table engine plays exactly like the reference engine."""
+        cache_dir = tempfile.mkdtemp()
+        try:
+            with mock.patch.dict(os.environ, {CACHE_DIR_ENV: cache_dir}):
+                report = run_differential("reference", "tables", range(100), num_players=3)
+        finally:
+            shutil.rmtree(cache_dir)
+        self.assertIsNone(report.divergence)
+        self.assertEqual(report.games, 100)
+
+    def test_first_divergence_with_reproduction(self):
+        """Test that the runner stops at the lowest diverging seed, serially and in parallel."""
+        divergence, compared = compare_seed(3, create_engine("reference"), create_engine("test_off_by_one_hash"))
+        self.assertEqual((divergence.turn, compared), (7, 7))
+        self.assertEqual([record.turn for record in divergence.context], [2, 3, 4, 5, 6])
+        self.assertIn("--seed 3", divergence.reproduction())
+        for workers in (1, 2):
+            report = run_differential("reference", "test_off_by_one_hash", range(5, 60), workers=workers,
+                                      chunk_size=4)
+            self.assertEqual(report.divergence.seed, 13)
+            self.assertEqual(report.games, 9)
+        with self.assertRaises(ValueError):
+            create_engine("nonexistent")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import json
+import os
+import tempfile
+import unittest
+
+from backend.experiment import Experiment
+
+
+class TestExperiment(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "experiment.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_resume_matches_uninterrupted_run(self):
+        """Test that an interrupted and resumed run aggregates exactly what a single run does."""
+        uninterrupted = Experiment(os.path.join(self.tmp.name, "full.json"), games=60, master_seed=9,
+                                   chunk_size=20).run()
+
+        Experiment(self.path, games=60, master_seed=9, chunk_size=20).run(max_chunks=2)
+        with open(self.path) as f:
+            self.assertEqual(json.load(f)["games_done"], 40)
+
+        resumed = Experiment.resume(self.path)
+        self.assertEqual(resumed.games_done, 40)
+        report = resumed.run()
+        self.assertEqual(report.to_dict(), uninterrupted.to_dict())
+        self.assertEqual(report.games, 60)
+
+    def test_completed_run_does_no_more_work(self):
+        """Test that resuming a finished experiment does not double-count games."""
+        Experiment(self.path, games=20, master_seed=1, chunk_size=10).run()
+        resumed = Experiment.resume(self.path)
+        self.assertEqual(resumed.run().games, 20)
+
+    def test_checkpoint_is_written_atomically(self):
+        """Test that no temporary file is left beside the checkpoint."""
+        Experiment(self.path, games=10, master_seed=1, chunk_size=5).run()
+        self.assertEqual(os.listdir(self.tmp.name), ["experiment.json"])
+
+    def test_parallel_resume(self):
+        """Test that a multi-process run resumes with the same totals as a serial one."""
+        serial = Experiment(os.path.join(self.tmp.name, "serial.json"), games=40, master_seed=4,
+                            chunk_size=10).run()
+        Experiment(self.path, games=40, master_seed=4, chunk_size=10).run(workers=2, max_chunks=1)
+        report = Experiment.resume(self.path).run(workers=2)
+        self.assertEqual(report.to_dict()["outcomes"], serial.to_dict()["outcomes"])
+        self.assertEqual(report.wins, serial.wins)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,20 @@
+import io
 import unittest
+from contextlib import redirect_stdout
+from unittest import mock
 
-from backend.enums import Suit
+from backend.enums import GameOutcome, Suit
 from backend.game_logic import CardGame
-from backend.models import Card, Player
+from backend.models import Card, Player, SeatZones
+from backend.simulation import new_selfplay_game, run_selfplay_game
+from backend.strategies import RulesStrategy
+
+
+class AlwaysPickUp(RulesStrategy):
+    """Picks up the pile every turn, so a table of them goes round in a loop."""
+
+    def choose_play(self, player, playable_sets, top_pile_value, deadline=None):
+        return None
 
 
 class TestGameLogic(unittest.TestCase):
@@ -101,6 +113,24 @@ class TestGameLogic(unittest.TestCase):
         self.assertTrue(self.game.card_utils.play_cards(self.player, [Card(7, Suit.DIAMONDS)]))
         self.assertEqual(self.game.pile, [])
 
+    def test_four_of_a_kind_burns_across_plays(self):
+        """Test that a run built over several plays burns on the fourth card and resets."""
+        self.game.pile = [Card(3, Suit.HEARTS)]
+        self.player.hand = [Card(9, Suit.HEARTS), Card(9, Suit.CLUBS), Card(9, Suit.SPADES), Card(9, Suit.DIAMONDS)]
+        self.assertFalse(self.game.card_utils.play_cards(self.player, [Card(9, Suit.HEARTS), Card(9, Suit.CLUBS)]))
+        self.assertEqual(self.game.pile.cards_to_burn(9), 2)
+        self.assertFalse(self.game.card_utils.play_cards(self.player, [Card(9, Suit.SPADES)]))
+
+        # The AI sees the burn chance from the run length
+        chosen = self.game.ai_logic.computer_choose_playable_set(
+            [[Card(9, Suit.DIAMONDS)], [Card(12, Suit.CLUBS)]], 9, self.player)
+        self.assertEqual(chosen, [Card(9, Suit.DIAMONDS)])
+
+        self.assertTrue(self.game.card_utils.play_cards(self.player, [Card(9, Suit.DIAMONDS)]))
+        self.assertEqual(self.game.pile, [])
+        self.assertEqual(self.game.pile.run_length, 0)
+        self.assertEqual(self.game.burns, 1)
+
     def test_draw_card(self):
         """Test drawing cards to restore hand to 3."""
         self.player.hand = [Card(2, Suit.HEARTS)]
@@ -141,6 +171,111 @@ class TestGameLogic(unittest.TestCase):
         self.assertEqual(len(player.face_up), 3)
         self.assertEqual(len(player.hand), 3)
 
+    def test_choose_ai_setup_cards_never_repeats_a_card(self):
+        """Test that a high pair is not picked again by the single high-card pass."""
+        player = Player("COMPUTER")
+        player.hand = [Card(13, Suit.HEARTS), Card(13, Suit.CLUBS), Card(3, Suit.HEARTS)]
+        player.face_up = [Card(4, Suit.HEARTS), Card(5, Suit.HEARTS), Card(6, Suit.HEARTS)]
+        self.game.ai_logic.choose_ai_setup_cards(player)
+        self.assertEqual(player.face_up, [Card(13, Suit.HEARTS), Card(13, Suit.CLUBS), Card(6, Suit.HEARTS)])
+        self.assertEqual(len(player.hand), 3)
+
+    def test_deal_cards_multiple_seats(self):
+        """Test that larger tables are dealt from as many decks as they need."""
+        for num_players, decks in [(3, 1), (5, 1), (6, 2)]:
+            game = CardGame(seed=1, verbose=False, num_players=num_players)
+            game.deal_cards()
+            self.assertEqual(len(game.players), num_players)
+            self.assertEqual(len(game.deck), 52 * decks - 9 * num_players)
+            self.assertEqual([player.seat for player in game.players], list(range(num_players)))
+            self.assertTrue(all(player.is_computer for player in game.players[1:]))
+            self.assertFalse(game.players[0].is_computer)
+
+    def test_invalid_number_of_players(self):
+        """Test that tables outside 2-6 seats are rejected."""
+        with self.assertRaises(ValueError):
+            CardGame(num_players=1)
+        with self.assertRaises(ValueError):
+            CardGame(num_players=7)
+
+    def test_play_cards_with_duplicate_cards(self):
+        """Test that playing one of two identical cards (two decks) removes only one."""
+        self.player.hand = [Card(9, Suit.HEARTS), Card(9, Suit.HEARTS), Card(12, Suit.CLUBS)]
+        self.game.pile = []
+        self.game.card_utils.play_cards(self.player, [Card(9, Suit.HEARTS)])
+        self.assertEqual(self.player.hand, [Card(9, Suit.HEARTS), Card(12, Suit.CLUBS)])
+
+    def test_opponent_on_last_card_tracked_per_seat(self):
+        """Test that the seat zone arrays follow plays and drive the AI's opponent check."""
+        self.computer.face_down = [Card(4, Suit.CLUBS)]
+        self.game.zones.update(self.computer)
+        self.assertEqual(self.game.zones.opponents_on_last_card(self.player.seat), 1)
+        self.assertEqual(self.game.zones.opponents_on_last_card(self.computer.seat), 0)
+
+        # With the opponent on a single face-down card the AI plays its highest valid set
+        self.player.hand = [Card(5, Suit.HEARTS), Card(13, Suit.SPADES)]
+        self.game.zones.update(self.player)
+        chosen = self.game.ai_logic.computer_choose_playable_set(
+            [[Card(5, Suit.HEARTS)], [Card(13, Suit.SPADES)]], 3, self.player)
+        self.assertEqual(chosen[0].value, 13)
+
+        self.game.deck = []
+        self.game.pile = [Card(6, Suit.SPADES)]
+        self.game.player_must_pickup_pile(self.computer)
+        self.assertEqual(self.game.zones.hand[self.computer.seat], 1)
+        self.assertEqual(self.game.zones.opponents_on_last_card(self.player.seat), 0)
+
+    def test_zone_assignment_refreshes_seat_zones(self):
+        """Test that assigning a player's zones keeps the AI's opponent check current without a manual update."""
+        self.computer.face_down = [Card(4, Suit.CLUBS)]
+        self.assertEqual(self.game.zones.opponents_on_last_card(self.player.seat), 1)
+
+        self.player.hand = [Card(5, Suit.HEARTS), Card(13, Suit.SPADES)]
+        self.game.pile = [Card(3, Suit.DIAMONDS)]
+        chosen = self.game.ai_logic.computer_choose_playable_set(
+            [[Card(5, Suit.HEARTS)], [Card(13, Suit.SPADES)]], 3, self.player)
+        self.assertEqual(chosen, [Card(13, Suit.SPADES)])
+
+        self.computer.face_up = [Card(9, Suit.HEARTS)]
+        self.assertEqual(self.game.zones.opponents_on_last_card(self.player.seat), 0)
+
+    def test_opponent_check_reads_one_seat_at_a_six_seat_table(self):
+        """Test that the running last-card count tracks a six-seat game and a query reads only the asking seat."""
+        game, seat_ais = new_selfplay_game(0, num_players=6)
+        counts = []
+
+        def recount(game):
+            expected = sum(len(p.face_down) == 1 and not p.hand and not p.face_up for p in game.players)
+            counts.append((game.zones.last_card_seats, expected))
+
+        run_selfplay_game(game, seat_ais, 0, on_turn=recount)
+        self.assertEqual([tracked for tracked, _ in counts], [expected for _, expected in counts])
+        self.assertTrue(any(expected for _, expected in counts))
+
+        with mock.patch.object(SeatZones, "_on_last_card", autospec=True,
+                               side_effect=SeatZones._on_last_card) as reads:
+            for seat in range(6):
+                game.zones.opponents_on_last_card(seat)
+        self.assertEqual(reads.call_count, 6)
+
+
+class TestPlayGame(unittest.TestCase):
+    def play(self, strategies, max_turns=None):
+        """Play a whole silent game with the given seat strategies and return it."""
+        game = CardGame(seed=3, verbose=False)
+        game.strategies = [strategy(game) for strategy in strategies]
+        with redirect_stdout(io.StringIO()):
+            game.play_game(max_turns)
+        return game
+
+    def test_outcomes(self):
+        """Test that play_game records a win, a draw on a repeated position and an abort at the turn cap."""
+        self.assertEqual(self.play([RulesStrategy, RulesStrategy]).outcome, GameOutcome.WIN)
+        drawn = self.play([AlwaysPickUp, AlwaysPickUp])
+        self.assertEqual(drawn.outcome, GameOutcome.DRAWN)
+        self.assertIsNone(drawn.winner)
+        self.assertEqual(self.play([AlwaysPickUp, AlwaysPickUp], max_turns=1).outcome, GameOutcome.ABORTED)
+
 
 if __name__ == '__main__':
     unittest.main()
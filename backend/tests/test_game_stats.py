@@ -0,0 +1,90 @@
+import io
+import random
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from backend.batch import BatchReport, run_batch
+from backend.enums import Suit
+from backend.game_logic import CardGame
+from backend.game_stats import FACE_DOWN, PHASES, GameStats
+from backend.models import Card, Player
+from backend.simulation import new_selfplay_game, run_selfplay_game
+from backend.sketches import HdrHistogram
+
+
+class TestHdrHistogram(unittest.TestCase):
+    def test_quantiles_within_relative_error(self):
+        """Test that quantiles stay within the bucket precision while count, mean and extremes are exact."""
+        rng = random.Random(5)
+        values = sorted(int(rng.expovariate(1 / 500)) for _ in range(20000))
+        histogram = HdrHistogram(significant_bits=5)
+        for value in values:
+            histogram.record(value)
+        for q in (0.5, 0.9, 0.99):
+            exact = values[int(q * len(values)) - 1]
+            self.assertLessEqual(abs(histogram.quantile(q) - exact), exact / 16 + 1)
+        self.assertEqual((histogram.count, histogram.min, histogram.max), (len(values), values[0], values[-1]))
+        self.assertAlmostEqual(histogram.mean, sum(values) / len(values))
+
+    def test_merge_matches_single_histogram(self):
+        """Test that merged shards equal one histogram of all values, and survive a dict round trip."""
+        whole, first, second = HdrHistogram(), HdrHistogram(), HdrHistogram()
+        for value in range(0, 5000, 7):
+            whole.record(value)
+            (first if value % 2 else second).record(value)
+        merged = HdrHistogram.from_dict(first.to_dict())
+        merged.merge(second)
+        self.assertEqual(merged.to_dict(), whole.to_dict())
+        with self.assertRaises(ValueError):
+            merged.merge(HdrHistogram(significant_bits=4))
+
+
+class TestGameStats(unittest.TestCase):
+    def test_observed_game_counts_every_turn(self):
+        """Test that the hooks see every turn and pickup, and leave the game as it was when finished."""
+        stats = GameStats()
+        pickups = 0
+        for seed in range(20):
+            game, seat_ais = new_selfplay_game(seed)
+            observer = stats.observe(game)
+            result = run_selfplay_game(game, seat_ais, seed)
+            observer.finish()
+            self.assertEqual(sum(observer.phase_turns.values()), result.turns)
+            self.assertEqual(observer.turns, result.turns)
+            self.assertIsNone(game.observer)
+            pickups += result.pickups
+        self.assertEqual((stats.games, stats.pickup_size.count), (20, pickups))
+        self.assertEqual({phase: histogram.count for phase, histogram in stats.phase_turns.items()},
+                         dict.fromkeys(PHASES, 20))
+        self.assertGreater(stats.face_down_flips, stats.face_down_successes)
+
+    def test_human_face_down_flips_are_counted(self):
+        """Test that a blind flip made at the prompt in player_turn reaches the stats."""
+        game = CardGame(verbose=False)
+        game.players = [Player("ME"), Player("COMPUTER", is_computer=True)]
+        me = game.players[0]
+        me.face_down = [Card(4, Suit.CLUBS), Card(12, Suit.HEARTS)]
+        game.pile = [Card(9, Suit.SPADES)]
+        stats = GameStats()
+        observer = stats.observe(game)
+        with mock.patch("builtins.input", return_value="1"), redirect_stdout(io.StringIO()):
+            game.player_turn(me)
+        observer.finish()
+        self.assertEqual((stats.face_down_flips, stats.face_down_successes), (1, 0))
+        self.assertEqual(stats.pickup_size.max, 1)
+        self.assertEqual(observer.phase_turns[FACE_DOWN], 1)
+
+    def test_batch_stats_merge_across_workers(self):
+        """Test that stats collected in parallel equal the serial stats and round-trip through the report."""
+        serial = run_batch(range(40), chunk_size=10, collect_stats=True)
+        parallel = run_batch(range(40), workers=2, chunk_size=10, collect_stats=True)
+        self.assertEqual(parallel.stats.to_dict(), serial.stats.to_dict())
+        restored = BatchReport.from_dict(serial.to_dict())
+        self.assertEqual(restored.stats.to_dict(), serial.stats.to_dict())
+        self.assertIsNone(run_batch(range(2)).stats)
+        self.assertIn("Face-down flips", serial.format())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from multiprocessing import Pool
+
+from backend.head_to_head import ACCEPT_H0, ACCEPT_H1, INCONCLUSIVE, SPRT, _bounded_imap, elo_to_score, play_pair, \
+    run_match
+
+
+class TestHeadToHead(unittest.TestCase):
+    def test_pair_swaps_seats_on_the_same_deal(self):
+        """Test that identical deterministic strategies split every pair evenly."""
+        for seed in range(10):
+            first, second = play_pair(seed, "rules", "rules")
+            self.assertEqual(first + second, 1.0)
+
+    def test_sprt_bounds_and_verdicts(self):
+        """Test the log-likelihood ratio against the Wald bounds on either side of the hypotheses."""
+        sprt = SPRT(0.0, 10.0, alpha=0.05, beta=0.05)
+        self.assertAlmostEqual(sprt.upper, -sprt.lower)
+        midpoint = (elo_to_score(0.0) + elo_to_score(10.0)) / 2
+        self.assertAlmostEqual(sprt.llr(1000, 1000 * midpoint, 1000 * (midpoint ** 2 + 0.04)), 0.0)
+        self.assertEqual(sprt.verdict(sprt.llr(1000, 600.0, 1000 * (0.36 + 0.04))), ACCEPT_H1)
+        self.assertEqual(sprt.verdict(sprt.llr(1000, 400.0, 1000 * (0.16 + 0.04))), ACCEPT_H0)
+        self.assertIsNone(sprt.verdict(0.0))
+        with self.assertRaises(ValueError):
+            SPRT(5.0, 0.0)
+
+    def test_match_stops_early_and_ignores_worker_count(self):
+        """Test that a lopsided match stops before max_pairs with the same report serially and in parallel."""
+        serial = run_match("rules", "random", max_pairs=400, chunk_size=10)
+        parallel = run_match("rules", "random", max_pairs=400, chunk_size=10, workers=2)
+        self.assertEqual(serial.result, ACCEPT_H1)
+        self.assertLess(serial.pairs, 400)
+        self.assertEqual((parallel.result, parallel.pairs, parallel.total, parallel.games),
+                         (serial.result, serial.pairs, serial.total, serial.games))
+
+    def test_workers_only_get_a_bounded_window_of_chunks(self):
+        """Test that parallel matches submit chunks as results are taken, not the whole run up front."""
+        submitted = []
+
+        def jobs():
+            for job in range(1000):
+                submitted.append(job)
+                yield -job
+
+        with Pool(2) as pool:
+            results = _bounded_imap(pool, abs, jobs(), 4)
+            self.assertEqual([next(results) for _ in range(3)], [0, 1, 2])
+        self.assertEqual(len(submitted), 7)
+
+    def test_match_without_decision_is_inconclusive(self):
+        """Test that running out of pairs before a bound is crossed reports no verdict."""
+        report = run_match("random", "random", max_pairs=4, chunk_size=2)
+        self.assertEqual(report.pairs, 4)
+        self.assertEqual(report.result, INCONCLUSIVE)
+
+
+if __name__ == '__main__':
+    unittest.main()
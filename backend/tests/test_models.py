@@ -1,6 +1,6 @@
 import unittest
 from backend.enums import Suit
-from backend.models import Card, Player
+from backend.models import Card, Pile, Player
 
 
 class TestModels(unittest.TestCase):
@@ -59,3 +59,27 @@ class TestModels(unittest.TestCase):
 
         player.face_up = []
         self.assertTrue(player.can_play_from_face_down())
+
+    def test_pile_tracks_top_run(self):
+        """Test that the pile keeps the run of equal ranks on top through pushes and removals."""
+        pile = Pile([Card(5, Suit.HEARTS), Card(9, Suit.CLUBS), Card(9, Suit.SPADES)])
+        self.assertEqual((pile.run_rank, pile.run_length), (9, 2))
+        self.assertEqual(pile.cards_to_burn(9), 2)
+        self.assertEqual(pile.cards_to_burn(5), 4)
+
+        pile.append(Card(9, Suit.HEARTS))
+        self.assertEqual((pile.run_rank, pile.run_length), (9, 3))
+        pile.extend([Card(4, Suit.HEARTS), Card(4, Suit.CLUBS)])
+        self.assertEqual((pile.run_rank, pile.run_length), (4, 2))
+
+        del pile[4:]
+        self.assertEqual((pile.run_rank, pile.run_length), (9, 3))
+        pile.pop()
+        self.assertEqual((pile.run_rank, pile.run_length), (9, 2))
+        pile.clear()
+        self.assertEqual((pile.run_rank, pile.run_length), (0, 0))
+        self.assertEqual(pile.cards_to_burn(9), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+from backend.analysis import decode_position
+from backend.perft import PICKUP, PerftCounts, divide, generate_moves, make_move, perft, unmake_move
+from backend.simulation import new_selfplay_game
+
+
+def fingerprint(game):
+    players = tuple((tuple(p.hand), tuple(p.face_up), tuple(p.face_down)) for p in game.players)
+    zones = (tuple(game.zones.hand), tuple(game.zones.face_up), tuple(game.zones.face_down))
+    counters = (game.pickups, game.burns, game.specials_played)
+    return players, zones, counters, tuple(game.deck), tuple(game.pile), game.current_player, game.game_over
+
+
+def reference_perft(game, depth, tactical_pickups):
+    """Count leaf nodes by copying the game at every step instead of making and unmaking moves."""
+    if depth == 0:
+        return 1
+    nodes = 0
+    for index in range(len(generate_moves(game, tactical_pickups))):
+        child = game.clone()
+        make_move(child, generate_moves(child, tactical_pickups)[index])
+        if depth == 1:
+            nodes += 1
+        elif not child.game_over:
+            nodes += reference_perft(child, depth - 1, tactical_pickups)
+    return nodes
+
+
+class TestPerft(unittest.TestCase):
+    # Regression fixtures for find_playable_combinations and play_cards:
+    # (seed, depth, tactical pickups) -> (nodes, plays, pickups, burns, replays)
+    FIXTURES = {
+        (4, 6, True): (917, 709, 208, 36, 0),
+        (4, 6, False): (104, 104, 0, 11, 0),
+        (5, 6, True): (833, 617, 216, 0, 45),
+        (5, 6, False): (73, 73, 0, 0, 6),
+    }
+
+    def test_fixture_counts(self):
+        """Test node and move-type counts against recorded fixtures."""
+        for (seed, depth, tactical), expected in self.FIXTURES.items():
+            game, _ = new_selfplay_game(seed)
+            self.assertEqual(perft(game, depth, tactical).as_tuple(), expected, (seed, depth, tactical))
+
+    def test_perft_restores_game(self):
+        """Test that walking the tree leaves the live game, its counters included, exactly as it was."""
+        game, _ = new_selfplay_game(4)
+        before = fingerprint(game)
+        counts = perft(game, 6, tactical_pickups=True)
+        self.assertGreater(counts.pickups, 0)
+        self.assertGreater(counts.burns, 0)
+        self.assertEqual(fingerprint(game), before)
+
+    def test_matches_copy_based_reference(self):
+        """Test that make/unmake agrees with a deep-copying enumeration."""
+        for seed in range(3):
+            game, _ = new_selfplay_game(seed)
+            self.assertEqual(perft(game, 5, True).nodes, reference_perft(game, 5, True))
+
+    def test_divide_adds_up_to_perft(self):
+        """Test that the per-move counts of divide sum to perft, with a game-ending root move counting nothing."""
+        positions = [decode_position("A../345.6.?|3|0|0")] + [new_selfplay_game(seed)[0] for seed in range(3)]
+        for game in positions:
+            for depth in range(1, 5):
+                for tactical in (False, True):
+                    total = PerftCounts()
+                    for _, counts in divide(game, depth, tactical):
+                        total += counts
+                    self.assertEqual(total, perft(game, depth, tactical), (depth, tactical))
+
+        game = positions[0]
+        self.assertEqual([counts.nodes for _, counts in divide(game, 1)], [1])
+        self.assertEqual([counts for _, counts in divide(game, 3)], [PerftCounts()])
+
+    def test_depth_zero_and_pickup_move(self):
+        """Test the trivial depth and that tactical pickups add a move when the pile is not empty."""
+        game, _ = new_selfplay_game(1)
+        self.assertEqual(perft(game, 0), PerftCounts(nodes=1))
+        undo = make_move(game, generate_moves(game)[0])
+        self.assertEqual(generate_moves(game, tactical_pickups=True)[-1].kind, PICKUP)
+        unmake_move(game, undo)
+
+
+if __name__ == '__main__':
+    unittest.main()
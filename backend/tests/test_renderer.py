@@ -0,0 +1,75 @@
+import io
+import unittest
+
+from backend.enums import Suit
+from backend.game_logic import CardGame
+from backend.models import Card, Player
+from backend.renderer import ConsoleRenderer
+
+
+class TestConsoleRenderer(unittest.TestCase):
+    def setUp(self):
+        """Set up a two-seat game with a human and a computer seat."""
+        self.game = CardGame(verbose=False)
+        self.game.players = [Player("ME"), Player("COMPUTER", is_computer=True)]
+        self.player, self.computer = self.game.players
+        self.player.hand = [Card(4, Suit.HEARTS), Card(9, Suit.CLUBS)]
+        self.player.face_up = [Card(13, Suit.SPADES)]
+        self.player.face_down = [Card(3, Suit.CLUBS), Card(5, Suit.CLUBS)]
+        self.computer.hand = [Card(6, Suit.DIAMONDS)]
+        self.game.pile = [Card(7, Suit.SPADES), Card(3, Suit.HEARTS)]
+        self.stream = io.StringIO()
+        self.renderer = ConsoleRenderer(self.game, self.stream)
+
+    def test_frame_layout(self):
+        """Test the rendered board, hiding the computer's hand."""
+        frame = self.renderer.frame()
+        self.assertIn("ME (CURRENT):\n  Hand (2): [4♥, 9♣]\n  Face-up (1): [K♠]\n"
+                      "  Face-down (2): [Hidden] [Hidden] ", frame)
+        self.assertIn("COMPUTER:\n  Hand (1): [Hidden]\n  Face-up (0): Empty\n  Face-down (0): Empty", frame)
+        self.assertIn("Pile (2): [7♠, 3♥]\nTop pile value: 3\nDeck remaining: 0", frame)
+
+    def test_hand_of_seat_with_strategy_is_hidden(self):
+        """Test that a seat played by a strategy is shown like a computer, whatever its player flag."""
+        game = CardGame(verbose=False, strategies=[None, "random"])
+        game.players = [Player("ME"), Player("GUEST")]
+        game.players[1].hand = [Card(6, Suit.DIAMONDS)]
+        frame = ConsoleRenderer(game, self.stream).frame()
+        self.assertIn("GUEST:\n  Hand (1): [Hidden]", frame)
+
+    def test_unchanged_zones_are_not_reformatted(self):
+        """Test that a second frame reuses every cached zone and a play re-renders only what changed."""
+        self.renderer.frame()
+        first = self.renderer.zones_rendered
+        self.renderer.frame()
+        self.assertEqual(self.renderer.zones_rendered, first)
+
+        self.game.card_utils.play_cards(self.player, [Card(4, Suit.HEARTS)])
+        self.renderer.frame()
+        # The human's hand and the pile changed
+        self.assertEqual(self.renderer.zones_rendered, first + 2)
+
+    def test_pile_replacement_invalidates_cache(self):
+        """Test that a burned or picked-up pile is re-rendered even if it looks the same."""
+        self.renderer.frame()
+        self.game.pile = [Card(7, Suit.SPADES), Card(3, Suit.HEARTS)]
+        before = self.renderer.zones_rendered
+        self.renderer.frame()
+        self.assertEqual(self.renderer.zones_rendered, before + 1)
+
+    def test_hand_is_capped(self):
+        """Test that huge hands are truncated in the display."""
+        self.player.hand = [Card(value, suit) for suit in Suit for value in range(2, 15)]
+        renderer = ConsoleRenderer(self.game, self.stream, max_hand_cards=3)
+        self.assertIn("Hand (52): [2♥, 2♦, 2♣, ... +49 more]", renderer.frame())
+
+    def test_single_write_and_skip_unchanged(self):
+        """Test that identical frames are suppressed when requested."""
+        renderer = ConsoleRenderer(self.game, self.stream, skip_unchanged=True)
+        self.assertTrue(renderer.render())
+        self.assertFalse(renderer.render())
+        self.assertEqual(self.stream.getvalue().count("GAME STATE"), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from itertools import combinations
+
+from backend.enums import Suit
+from backend.game_logic import CardGame
+from backend.models import Card, Player
+from backend.risk import after_play, assess_plays, beat_probabilities, beats, play_risks
+
+
+class TestRisk(unittest.TestCase):
+    def test_beat_probabilities_match_enumeration(self):
+        """Test the closed form against every possible responder hand drawn from a small unseen pool."""
+        unseen = [0] * 15
+        for rank, count in ((3, 2), (5, 1), (7, 1), (9, 2), (13, 1)):
+            unseen[rank] = count
+        cards = [rank for rank in range(15) for _ in range(unseen[rank])]
+        probabilities = beat_probabilities(tuple(unseen), 3)
+        hands = list(combinations(range(len(cards)), 3))
+        for value in range(15):
+            answered = sum(any(beats(cards[i], value) for i in hand) for hand in hands)
+            self.assertAlmostEqual(probabilities[value], answered / len(hands))
+
+    def test_after_play_follows_the_pile_rules(self):
+        """Test that 7s and 8s keep the value to beat while 8s, 10s and runs of four keep the turn."""
+        self.assertEqual(after_play([7], 11, 0, 0), (11, False))
+        self.assertEqual(after_play([8], 11, 0, 0), (11, True))
+        self.assertEqual(after_play([10], 11, 0, 0), (11, True))
+        self.assertEqual(after_play([9, 9], 6, 9, 2), (9, True))
+        self.assertEqual(after_play([9], 6, 9, 2), (9, False))
+
+    def test_face_up_responder_and_expected_pickup(self):
+        """Test that a known face-up responder is answered exactly and pickups scale with the pile."""
+        plays = [[Card(5, Suit.HEARTS)], [Card(12, Suit.CLUBS)], [Card(8, Suit.SPADES)]]
+        low, high, eight = play_risks(plays, tuple([0] * 15), 0, [6, 9], pile_value=4, pile_size=6)
+        self.assertEqual((low.beat_probability, low.expected_pickup), (1.0, 0.0))
+        self.assertEqual((high.beat_probability, high.expected_pickup), (0.0, 7.0))
+        self.assertTrue(eight.another_turn)
+
+    def test_assesses_the_live_game(self):
+        """Test that the assessment reads the unseen cards and the next seat from the game."""
+        game = CardGame(verbose=False)
+        player, opponent = Player("ME"), Player("COMPUTER", is_computer=True)
+        game.players = [player, opponent]
+        player.hand = [Card(4, Suit.HEARTS), Card(14, Suit.SPADES)]
+        opponent.hand = [Card(3, Suit.CLUBS), Card(5, Suit.CLUBS)]
+        game.pile = [Card(3, Suit.HEARTS)]
+        risks = assess_plays(game, player, [[card] for card in player.hand])
+        self.assertEqual([risk.beat_probability for risk in risks], [1.0, 0.0])
+        self.assertEqual(risks[1].expected_pickup, 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import random
+import tracemalloc
+import unittest
+
+from backend import rollout
+from backend.enums import Suit
+from backend.models import Card
+from backend.rollout import RolloutState, choose_rank, playout
+from backend.simulation import new_selfplay_game
+
+
+def counts_of(*ranks):
+    counts = [0] * 15
+    for rank in ranks:
+        counts[rank] += 1
+    return counts
+
+
+class TestRolloutPolicy(unittest.TestCase):
+    def test_lowest_legal_rank(self):
+        """Test that the policy plays the lowest rank that meets the pile."""
+        self.assertEqual(choose_rank(counts_of(4, 9, 12, 12), 6, 4), 9)
+
+    def test_two_resets_high_pile(self):
+        """Test that a 2 is preferred once the pile value is 10 or more."""
+        self.assertEqual(choose_rank(counts_of(2, 13, 14, 14), 12, 4), 2)
+
+    def test_ten_burns_high_pile_without_two(self):
+        """Test that a 10 is preferred on a pile of 10 or more when there is no 2."""
+        self.assertEqual(choose_rank(counts_of(7, 10, 13, 14), 12, 4), 10)
+        self.assertEqual(choose_rank(counts_of(7, 10, 13, 14), 9, 4), 13)
+
+    def test_eight_with_small_hand(self):
+        """Test that an 8 is played first while the hand holds three cards or fewer."""
+        self.assertEqual(choose_rank(counts_of(5, 8, 9), 3, 3), 8)
+
+    def test_specials_when_nothing_meets_pile(self):
+        """Test that 2, 7 and 10 are used in that order before an 8 or a pickup."""
+        self.assertEqual(choose_rank(counts_of(4, 7, 10, 8, 8, 8, 8), 9, 7), 7)
+        self.assertEqual(choose_rank(counts_of(4, 10, 8, 8, 8, 8), 9, 6), 10)
+        self.assertEqual(choose_rank(counts_of(4, 5), 9, 2), 0)
+
+    def test_choose_rank_allocates_nothing(self):
+        """Test that the policy decision does not allocate."""
+        counts = counts_of(3, 5, 9, 12)
+        choose_rank(counts, 6, 4)
+        tracemalloc.start()
+        for _ in range(1000):
+            choose_rank(counts, 6, 4)
+        snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(True, rollout.__file__)])
+        tracemalloc.stop()
+        self.assertEqual(sum(stat.size for stat in snapshot.statistics("filename")), 0)
+
+
+class TestRolloutState(unittest.TestCase):
+    def test_four_of_a_kind_and_ten_burn(self):
+        """Test that the pile run length and 10s burn the pile."""
+        state = RolloutState(2)
+        self.assertFalse(state.push(6, 3))
+        self.assertEqual(state.run_length, 3)
+        self.assertTrue(state.push(6, 1))
+        self.assertEqual(state.pile_size, 0)
+        state.push(9, 1)
+        self.assertTrue(state.push(10, 1))
+        self.assertEqual(state.pile_value, 0)
+
+    def test_mixed_set_burns_only_on_its_last_card(self):
+        """Test that a set with a 10 before its last card does not burn, as in CardUtils.play_cards."""
+        state = RolloutState(2)
+        state.face_up[0] = counts_of(9, 10)
+        state.face_up_sizes[0] = 2
+        self.assertFalse(state.apply_ranks(0, [10, 9]))
+        self.assertEqual((state.pile_size, state.pile_value), (2, 9))
+        state.face_up[1] = counts_of(9, 9, 9, 5)
+        state.face_up_sizes[1] = 4
+        self.assertFalse(state.apply_ranks(1, [9, 9, 9, 5]))
+        self.assertEqual((state.pile_size, state.pile_value, state.run_length), (6, 5, 1))
+
+    def test_eight_keeps_pile_value(self):
+        """Test that an 8 grants another turn and leaves the comparison value alone."""
+        state = RolloutState(2)
+        state.push(11, 1)
+        self.assertTrue(state.push(8, 1))
+        self.assertEqual(state.pile_value, 11)
+
+    def test_pickup_moves_pile_into_hand(self):
+        """Test that a pickup adds the pile's rank counts to the hand."""
+        state = RolloutState(2)
+        state.push(5, 2)
+        state.push(7, 1)
+        state.pickup(1)
+        self.assertEqual(state.hand_sizes[1], 3)
+        self.assertEqual(state.hands[1][5], 2)
+        self.assertEqual(state.pile_size, 0)
+
+    def test_from_game_preserves_zone_sizes(self):
+        """Test that determinising a dealt game keeps every zone's size and the known cards."""
+        game, _ = new_selfplay_game(5)
+        game.pile = [Card(9, Suit.HEARTS), Card(9, Suit.CLUBS), Card(8, Suit.SPADES)]
+        state = RolloutState.from_game(game, 0, random.Random(1))
+        self.assertEqual(state.hand_sizes, [3, 3])
+        self.assertEqual(sorted(r for r in range(15) for _ in range(state.hands[0][r])),
+                         [card.value for card in game.players[0].hand])
+        self.assertEqual([len(face_down) for face_down in state.face_down], [3, 3])
+        self.assertEqual(len(state.deck), len(game.deck))
+        self.assertEqual((state.pile_value, state.run_rank, state.run_length), (9, 8, 1))
+
+    def test_playout_stops_at_the_deadline(self):
+        """Test that a playout past its deadline gives up within one clock check instead of playing on."""
+        game, _ = new_selfplay_game(2, num_players=6)
+        state = RolloutState.from_game(game, 0, random.Random(1))
+        score, turns = playout(state, 0, False, random.Random(1), turn_limit=10 ** 6, deadline=0.0)
+        self.assertIsNone(score)
+        self.assertLessEqual(turns, rollout.DEADLINE_CHECK_TURNS)
+
+    def test_playout_finishes(self):
+        """Test that seeded playouts from a dealt game end with a score in [0, 1]."""
+        rng = random.Random(3)
+        for seed in range(20):
+            game, _ = new_selfplay_game(seed)
+            state = RolloutState.from_game(game, 0, rng)
+            score, turns = playout(state, 0, False, rng)
+            self.assertGreaterEqual(score, 0.0)
+            self.assertLessEqual(score, 1.0)
+            self.assertGreater(turns, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import time
+import unittest
+
+from backend.enums import Suit
+from backend.game_logic import CardGame
+from backend.models import Card
+from backend.search import AnytimeSearch
+
+
+class TestAnytimeSearch(unittest.TestCase):
+    def setUp(self):
+        """Deal a silent, seeded game with the computer to move."""
+        self.game = CardGame(seed=7, verbose=False)
+        self.game.deal_cards()
+        self.game.current_player = 1
+        self.computer = self.game.players[1]
+        self.computer.hand = [Card(4, Suit.HEARTS), Card(9, Suit.CLUBS), Card(13, Suit.SPADES)]
+        self.game.pile = [Card(3, Suit.DIAMONDS)]
+        self.playable_sets = self.game.card_utils.get_playable_cards(self.computer)
+        self.top_value = self.game.card_utils.get_top_pile_value()
+
+    def test_expired_deadline_returns_rule_based_choice(self):
+        """Test that a deadline already in the past falls back to the rule-based move."""
+        self.game.ai_logic.search = AnytimeSearch(self.game, seed=1)
+        expected = self.game.ai_logic.computer_choose_playable_set(self.playable_sets, self.top_value,
+                                                                   self.computer)
+        decision = self.game.ai_logic.choose_playable_set_by(time.perf_counter() - 1, self.playable_sets,
+                                                            self.top_value, self.computer)
+        self.assertEqual(decision.cards, expected)
+        self.assertEqual(decision.source, "rules")
+        self.assertEqual(decision.rollouts, 0)
+
+    def test_search_reports_rollouts_and_nodes(self):
+        """Test that a bounded search returns a playable set and counts its work."""
+        self.game.ai_logic.search = AnytimeSearch(self.game, max_rollouts=12, seed=1)
+        decision = self.game.ai_logic.choose_playable_set_by(time.perf_counter() + 5, self.playable_sets,
+                                                            self.top_value, self.computer)
+        self.assertEqual(decision.source, "search")
+        self.assertEqual(decision.rollouts, 12)
+        self.assertGreaterEqual(decision.nodes, 12)
+        self.assertIn(decision.cards, self.playable_sets)
+        self.assertIs(self.game.ai_logic.last_decision, decision)
+
+    def test_rules_playout(self):
+        """Test that the full rule-chain playout is still available to the search."""
+        self.game.ai_logic.search = AnytimeSearch(self.game, max_rollouts=6, seed=1, playout="rules")
+        decision = self.game.ai_logic.choose_playable_set_by(time.perf_counter() + 5, self.playable_sets,
+                                                            self.top_value, self.computer)
+        self.assertEqual(decision.rollouts, 6)
+        self.assertIn(decision.cards, self.playable_sets)
+
+    def test_search_respects_deadline(self):
+        """Test that an unbounded search stops close to its deadline."""
+        self.game.ai_logic.search = AnytimeSearch(self.game, seed=1)
+        start = time.perf_counter()
+        decision = self.game.ai_logic.choose_playable_set_by(start + 0.05, self.playable_sets,
+                                                            self.top_value, self.computer)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertIn(decision.cards, self.playable_sets)
+
+    def test_tiny_budget_is_kept_with_long_playouts(self):
+        """Test that a fast-playout search with a 2 ms budget and no turn limit returns within a few ms."""
+        game = CardGame(seed=5, verbose=False, num_players=6)
+        game.deal_cards()
+        player = game.players[0]
+        playable_sets = game.card_utils.get_playable_cards(player)
+        search = AnytimeSearch(game, rollout_turn_limit=10 ** 6, seed=1)
+        for _ in range(20):
+            start = time.perf_counter()
+            decision = search.choose(player, playable_sets, playable_sets[0], start + 0.002)
+            self.assertLess(time.perf_counter() - start, 0.002 + 0.02)
+            self.assertIn(decision.cards, playable_sets)
+
+    def test_search_leaves_game_untouched(self):
+        """Test that rollouts run on clones and do not mutate the live game."""
+        hand_before = list(self.computer.hand)
+        deck_before = list(self.game.deck)
+        self.game.ai_logic.search = AnytimeSearch(self.game, max_rollouts=5, seed=1)
+        self.game.ai_logic.choose_playable_set_by(time.perf_counter() + 5, self.playable_sets,
+                                                 self.top_value, self.computer)
+        self.assertEqual(self.computer.hand, hand_before)
+        self.assertEqual(self.game.deck, deck_before)
+        self.assertEqual(self.game.pile, [Card(3, Suit.DIAMONDS)])
+
+    def test_computer_turn_with_time_budget(self):
+        """Test that a computer turn under a move budget still plays a legal set."""
+        self.game.ai_logic.search = AnytimeSearch(self.game, max_rollouts=4, seed=1)
+        self.game.move_time_budget = 0.5
+        self.game.computer_turn(self.computer)
+        self.assertEqual(len(self.game.pile), 2)
+
+    def test_move_budget_alone_enables_search(self):
+        """Test that setting a move budget, with no search configured, makes computer turns search."""
+        self.assertIsNone(self.game.ai_logic.search)
+        self.game.move_time_budget = 0.05
+        self.game.computer_turn(self.computer)
+        decision = self.game.ai_logic.last_decision
+        self.assertEqual(decision.source, "search")
+        self.assertGreater(decision.rollouts, 0)
+        self.assertEqual(len(self.game.pile), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+from backend import shm_results
+from backend.batch import run_batch
+from backend.enums import GameOutcome
+from backend.shm_results import ResultRing, ResultTotals, run_shared
+
+
+class TestResultRing(unittest.TestCase):
+    def setUp(self):
+        self.ring = ResultRing(capacity=4)
+
+    def tearDown(self):
+        self.ring.close()
+        self.ring.unlink()
+
+    def drain(self):
+        rows = []
+        for view in self.ring.views():
+            rows.extend(tuple(int(value) for value in row) for row in view.tolist())
+            self.ring.consume(len(view))
+        return rows
+
+    def test_rows_round_trip_across_wraparound(self):
+        """Test that rows written past the end of the ring come back in order as two views."""
+        for seed in range(3):
+            self.ring.write((seed, 0, 10, 1, 2, 3, 0))
+        self.assertEqual([row[0] for row in self.drain()], [0, 1, 2])
+        for seed in range(3, 7):
+            self.ring.write((seed, 1, 10, 1, 2, 3, 0))
+        self.assertEqual(len(self.ring.views()), 2)
+        self.assertEqual([row[0] for row in self.drain()], [3, 4, 5, 6])
+        self.assertEqual(self.ring.pending(), 0)
+
+    @unittest.skipIf(shm_results.np is None, "NumPy is not installed")
+    def test_views_are_zero_copy(self):
+        """Test that the parent's NumPy view aliases the shared segment."""
+        self.ring.write((42, 1, 5, 0, 0, 0, 0))
+        view = self.ring.views()[0]
+        self.assertEqual(int(view[0, 0]), 42)
+        self.ring._words[2] = 43
+        self.assertEqual(int(view[0, 0]), 43)
+        del view
+
+
+class TestRunShared(unittest.TestCase):
+    def test_totals_match_pickled_batch(self):
+        """Test that shared-memory aggregation gives the same totals as the pickling batch runner."""
+        totals = ResultTotals()
+        run_shared(range(30, 70), totals, workers=2, capacity=8)
+        report = run_batch(range(30, 70), workers=1)
+        self.assertEqual(totals.games, 40)
+        self.assertEqual(totals.wins, report.wins)
+        self.assertEqual(totals.outcomes[shm_results.OUTCOME_CODES[GameOutcome.DRAWN]],
+                         report.outcomes[GameOutcome.DRAWN.value])
+        self.assertGreater(totals.specials, 0)
+
+    def test_memoryview_fallback(self):
+        """Test that aggregation works from plain memoryviews when NumPy is unavailable."""
+        numpy_module, shm_results.np = shm_results.np, None
+        try:
+            totals = ResultTotals()
+            run_shared(range(5), totals, workers=1, capacity=2)
+        finally:
+            shm_results.np = numpy_module
+        self.assertEqual(totals.games, 5)
+        self.assertEqual(sum(totals.outcomes), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from backend.game_logic import CardGame
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Cumulative import time allowed for the engine module, in microseconds. Generous enough for a loaded CI box;
+# eagerly importing the AI, search and CLI modules used to cost several times the current figure.
+IMPORT_BUDGET_US = 150000
+LAZY_MODULES = ("backend.ai_logic", "backend.search", "backend.input_utils", "backend.renderer", "argparse",
+                "multiprocessing", "numpy")
+
+
+def import_times(statement):
+    """Run a statement in a fresh interpreter under -X importtime and return {module: cumulative us}."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=REPO_ROOT,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup(unittest.TestCase):
+    def test_engine_import_is_lean_and_within_budget(self):
+        """Test that importing the engine skips the lazy subsystems and stays within the time budget."""
+        times = import_times("import backend.game_logic")
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, times)
+        self.assertLess(times["backend.game_logic"], IMPORT_BUDGET_US)
+
+    def test_main_module_import_loads_nothing(self):
+        """Test that re-importing main.py, as spawned workers do, does not load the engine."""
+        times = import_times("import runpy; runpy.run_path('main.py', run_name='__mp_main__')")
+        self.assertNotIn("backend.game_logic", times)
+
+    def test_subsystems_load_on_first_use(self):
+        """Test that subsystems are built on first access and then reused."""
+        game = CardGame(verbose=False)
+        self.assertNotIn("ai_logic", vars(game))
+        ai_logic = game.ai_logic
+        self.assertIs(game.ai_logic, ai_logic)
+        self.assertIs(ai_logic.game, game)
+
+
+if __name__ == '__main__':
+    unittest.main()
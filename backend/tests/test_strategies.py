@@ -0,0 +1,88 @@
+import unittest
+
+from backend.game_logic import CardGame
+from backend.simulation import play_selfplay_game
+from backend.strategies import STRATEGIES, RulesStrategy, Strategy, create_strategy, register_strategy
+
+
+class TestStrategies(unittest.TestCase):
+    def test_registry_creates_strategies_with_options(self):
+        """Test that specs resolve by name, pass options through and reject unknown names."""
+        game = CardGame(verbose=False)
+        strategy = create_strategy(("rules", {"params": {"high_value_threshold": 9}}), game)
+        self.assertIsInstance(strategy, RulesStrategy)
+        self.assertEqual(strategy.ai_logic.params.high_value_threshold, 9)
+        self.assertEqual(create_strategy("random", game).name, "random")
+        with self.assertRaises(ValueError):
+            create_strategy("telepathy", game)
+
+    def test_game_takes_one_strategy_per_seat(self):
+        """Test that CardGame checks the seat count and treats seats with a strategy as automated."""
+        with self.assertRaises(ValueError):
+            CardGame(verbose=False, strategies=["rules"])
+        game = CardGame(seed=1, verbose=False, strategies=["random", None])
+        game.deal_cards()
+        human, computer = game.players
+        self.assertTrue(game.is_automated(human))
+        self.assertIs(game.strategy_for(human), game.strategies[0])
+        self.assertIs(game.strategy_for(computer), game.ai_logic.strategy)
+
+    def test_rules_strategy_matches_default_selfplay(self):
+        """Test that seats playing the registered rules strategy replay the default self-play games."""
+        for seed in range(20):
+            default = play_selfplay_game(seed)
+            via_strategies = play_selfplay_game(seed, strategies=["rules", "rules"])
+            self.assertEqual((via_strategies.winner, via_strategies.turns, via_strategies.outcome),
+                             (default.winner, default.turns, default.outcome))
+
+    def test_custom_strategy_drives_every_decision(self):
+        """Test that a registered strategy is asked for setup, plays and face-down picks."""
+        calls = set()
+
+        @register_strategy("test_first_choice")
+        class FirstChoice(Strategy):
+            def choose_setup(self, player):
+                calls.add("setup")
+
+            def choose_play(self, player, playable_sets, top_pile_value, deadline=None):
+                calls.add("play")
+                return playable_sets[0] if playable_sets else None
+
+            def choose_face_down(self, player):
+                calls.add("face_down")
+                return player.face_down_positions[0]
+
+        try:
+            for seed in range(10):
+                play_selfplay_game(seed, strategies=["test_first_choice", "rules"])
+        finally:
+            del STRATEGIES["test_first_choice"]
+        self.assertEqual(calls, {"setup", "play", "face_down"})
+
+    def test_move_time_budget_makes_strategies_nondeterministic(self):
+        """Test that a clock budget or a search on the AI turns off the deterministic flag cycle detection uses."""
+        game = CardGame(verbose=False)
+        rules = create_strategy("rules", game)
+        self.assertTrue(rules.deterministic)
+        self.assertFalse(create_strategy("search", game).deterministic)
+        game.move_time_budget = 0.01
+        self.assertFalse(rules.deterministic)
+        game.move_time_budget = None
+        rules.ai_logic.search = create_strategy("search", game).ai_logic.search
+        self.assertFalse(rules.deterministic)
+
+    def test_incomplete_strategy_is_rejected_at_registration(self):
+        """Test that a strategy missing one of the three decisions cannot be registered."""
+        with self.assertRaises(TypeError):
+            @register_strategy("test_no_face_down")
+            class NoFaceDown(Strategy):
+                def choose_setup(self, player):
+                    pass
+
+                def choose_play(self, player, playable_sets, top_pile_value, deadline=None):
+                    return None
+        self.assertNotIn("test_no_face_down", STRATEGIES)
+
+
+if __name__ == '__main__':
+    unittest.main()
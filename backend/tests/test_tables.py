@@ -0,0 +1,95 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from backend import tables
+from backend.ai_logic import AILogic
+from backend.card_utils import CardUtils
+from backend.enums import Suit
+from backend.game_logic import CardGame
+from backend.models import Card, Player
+from backend.simulation import play_selfplay_game
+
+
+class TestRuleTables(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.cache_dir = tempfile.mkdtemp()
+        cls.tables = tables.load_tables(cls.cache_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tables.close()
+        shutil.rmtree(cls.cache_dir)
+
+    def tearDown(self):
+        tables.install_tables(None)
+
+    def test_can_play_matches_rules(self):
+        """Test that table lookups agree with the rules for random piles and card sets."""
+        rng = random.Random(3)
+        game = CardGame(verbose=False)
+        player = Player("Leo")
+        game.players = [player]
+        tables.install_tables(self.tables)
+        for _ in range(5000):
+            game.pile = [Card(rng.randint(2, 14), Suit.HEARTS) for _ in range(rng.randint(0, 5))]
+            ranks = [rng.choice((rng.randint(2, 14), 8)) for _ in range(rng.randint(1, 3))]
+            if rng.random() < 0.5:
+                ranks = [ranks[0]] * len(ranks)
+            cards = [Card(rank, Suit.SPADES) for rank in ranks]
+            player.hand = [Card(3, Suit.CLUBS)] if rng.random() < 0.5 else []
+            self.assertEqual(game.card_utils.can_play_cards(cards), game.card_utils.can_play_cards_by_rules(cards),
+                             (game.pile, cards, player.hand))
+
+    def test_setup_matches_rules(self):
+        """Test that the setup table reproduces the heuristic's cards and order for every threshold."""
+        rng = random.Random(5)
+        deck = CardUtils(None).create_deck(2)
+        for _ in range(300):
+            cards = rng.sample(deck, 6)
+            for threshold in range(tables.SETUP_MIN_THRESHOLD, tables.SETUP_MAX_THRESHOLD + 1):
+                expected = AILogic.setup_face_up_by_rules(cards, threshold)
+                ranks = self.tables.setup_ranks(cards, threshold)
+                self.assertEqual(AILogic._cards_for_ranks(cards, ranks), expected)
+
+    def test_selfplay_identical_with_tables(self):
+        """Test that installing the tables leaves seeded self-play games unchanged."""
+        expected = [vars(play_selfplay_game(seed)) for seed in range(5)]
+        tables.install_tables(self.tables)
+        self.assertEqual([vars(play_selfplay_game(seed)) for seed in range(5)], expected)
+
+    def test_existing_cache_is_mapped_not_rebuilt(self):
+        """Test that a valid cache file is reused as-is."""
+        path = tables.table_path(self.cache_dir)
+        before = os.stat(path).st_mtime_ns
+        reopened = tables.load_tables(self.cache_dir)
+        self.assertEqual(os.stat(path).st_mtime_ns, before)
+        self.assertEqual(reopened.play.tolist(), self.tables.play.tolist())
+        reopened.close()
+
+    def test_stale_or_truncated_cache_is_rebuilt(self):
+        """Test that a digest from other rules or a torn file triggers a rebuild."""
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        path = tables.table_path(cache_dir)
+        shutil.copy(tables.table_path(self.cache_dir), path)
+        with open(path, "r+b") as f:
+            f.seek(8)
+            f.write(b"\0" * 32)  # the rules digest
+        self.assertIsNone(tables._open_tables(path, tables.rules_digest()))
+        rebuilt = tables.load_tables(cache_dir)
+        self.assertEqual(rebuilt.setup.tolist(), self.tables.setup.tolist())
+        rebuilt.close()
+
+        with open(path, "r+b") as f:
+            f.truncate(tables.TABLE_SIZE // 2)
+        rebuilt = tables.load_tables(cache_dir)
+        self.assertEqual(os.path.getsize(path), tables.TABLE_SIZE)
+        rebuilt.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
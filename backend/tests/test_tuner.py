@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from backend import ai_params
+from backend.ai_params import PARAMS_PATH_ENV, AIParams, load_startup_params
+from backend.enums import Suit
+from backend.game_logic import CardGame
+from backend.models import Card, Player
+from backend.simulation import play_selfplay_game
+from backend.tuner import SPSATuner
+
+
+class TestAIParams(unittest.TestCase):
+    def test_defaults_match_original_thresholds(self):
+        """Test that the default parameter vector reproduces the hard-coded thresholds."""
+        params = AIParams()
+        self.assertEqual(params.to_vector(), [9.0, 3.0, 10.0, 10.0])
+
+    def test_from_vector_rounds_and_clamps(self):
+        """Test that real-valued vectors are rounded and clamped to each parameter's bounds."""
+        params = AIParams.from_vector([8.6, -4.0, 100.0, 10.2])
+        self.assertEqual(params.to_dict(), {"high_value_threshold": 9, "eights_hand_limit": 0,
+                                            "large_hand_limit": 52, "twos_pile_threshold": 10})
+
+    def test_save_and_load(self):
+        """Test that parameters round-trip through a JSON file."""
+        params = AIParams(high_value_threshold=11)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "params.json")
+            params.save(path)
+            self.assertEqual(AIParams.load(path), params)
+
+    def test_startup_params_log_the_file_they_came_from(self):
+        """Test that the startup parameters name the file they were loaded from."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "params.json")
+            AIParams(high_value_threshold=11).save(path)
+            with mock.patch.dict(os.environ, {PARAMS_PATH_ENV: path}), \
+                    mock.patch.object(ai_params, "_startup_params", None), \
+                    self.assertLogs("backend.ai_params", "INFO") as logs:
+                self.assertEqual(load_startup_params().high_value_threshold, 11)
+        self.assertIn(path, logs.output[0])
+
+    def test_unknown_parameter_rejected(self):
+        """Test that misspelt parameter names raise."""
+        with self.assertRaises(ValueError):
+            AIParams(high_value=5)
+
+    def test_ai_uses_twos_threshold(self):
+        """Test that AILogic reads the twos threshold from its parameters."""
+        game = CardGame(verbose=False)
+        game.ai_logic.params = AIParams(twos_pile_threshold=13)
+        playable_sets = [[Card(2, Suit.SPADES)], [Card(13, Suit.HEARTS)]]
+        chosen = game.ai_logic.computer_choose_playable_set(playable_sets, 12, Player("COMPUTER"))
+        self.assertEqual(chosen[0].value, 13)
+        game.ai_logic.params = AIParams()
+        chosen = game.ai_logic.computer_choose_playable_set(playable_sets, 12, Player("COMPUTER"))
+        self.assertEqual(chosen[0].value, 2)
+
+
+class TestSPSATuner(unittest.TestCase):
+    def test_selfplay_is_deterministic(self):
+        """Test that a seeded self-play game always produces the same result."""
+        first = play_selfplay_game(11)
+        second = play_selfplay_game(11)
+        self.assertEqual((first.winner, first.turns), (second.winner, second.turns))
+
+    def test_resume_matches_uninterrupted_run(self):
+        """Test that resuming from a checkpoint continues exactly where the run stopped."""
+        uninterrupted = SPSATuner(games_per_iteration=8, seed=3)
+        uninterrupted.run(3)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tuner.json")
+            SPSATuner(games_per_iteration=8, seed=3, checkpoint_path=path).run(2)
+            resumed = SPSATuner(games_per_iteration=8, seed=3, checkpoint_path=path)
+            self.assertEqual(resumed.iteration, 2)
+            resumed.run(3)
+
+        self.assertEqual(resumed.theta, uninterrupted.theta)
+        self.assertEqual(resumed.next_seed, uninterrupted.next_seed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+from backend.enums import Suit
+from backend.game_logic import CardGame
+from backend.models import Card, Player
+from backend.turn_allocations import measure_turn_allocations
+
+
+class TestInPlaceTurns(unittest.TestCase):
+    def setUp(self):
+        self.game = CardGame(verbose=False)
+        self.player = Player("Leo")
+        self.game.players = [self.player, Player("Computer", is_computer=True)]
+
+    def test_play_and_draw_edit_the_hand_in_place(self):
+        """Test that playing and drawing keep the same sorted hand list."""
+        hand = self.player.hand
+        self.player.add_to_hand(Card(9, Suit.HEARTS))
+        self.player.add_to_hand(Card(4, Suit.CLUBS))
+        self.player.add_to_hand(Card(12, Suit.SPADES))
+        self.game.deck = [Card(14, Suit.CLUBS), Card(6, Suit.HEARTS)]
+        self.game.play_and_draw(self.player, [Card(9, Suit.HEARTS)])
+        self.assertIs(self.player.hand, hand)
+        self.assertEqual(hand, [Card(4, Suit.CLUBS), Card(6, Suit.HEARTS), Card(12, Suit.SPADES)])
+        self.assertEqual(self.game.zones.hand[0], 3)
+
+    def test_pickup_matches_stable_sort(self):
+        """Test that picking up inserts pile cards after equal hand cards, in pile order."""
+        self.player.hand = [Card(5, Suit.HEARTS), Card(9, Suit.CLUBS)]
+        pile = [Card(9, Suit.SPADES), Card(3, Suit.CLUBS), Card(5, Suit.DIAMONDS), Card(9, Suit.HEARTS)]
+        self.game.pile = list(pile)
+        expected = sorted(self.player.hand + pile, key=lambda card: card.value)
+        self.game.player_must_pickup_pile(self.player)
+        self.assertEqual(self.player.hand, expected)
+        self.assertEqual([card.suit for card in self.player.hand], [card.suit for card in expected])
+
+    def test_turn_allocations_stay_small(self):
+        """Test that a turn's state update allocates little beyond its loop iterator."""
+        report = measure_turn_allocations(range(5))
+        self.assertGreater(report.turns, 100)
+        self.assertLess(report.bytes / report.turns, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import math
+import os
+import random
+import tempfile
+import time
+import unittest
+
+from backend import value_model
+from backend.rollout import RolloutState
+from backend.search import AnytimeSearch
+from backend.simulation import new_selfplay_game
+from backend.value_model import NUM_FEATURES, ValueModel, collect_selfplay, game_features, rollout_features
+
+
+@unittest.skipIf(value_model.np is None, "NumPy is not installed")
+class TestValueModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.features, cls.labels = collect_selfplay(range(60))
+
+    def test_features_agree_between_game_and_rollout_state(self):
+        """Test that a position yields the same suit-agnostic features from either representation."""
+        game, _ = new_selfplay_game(3, num_players=3)
+        for _ in range(12):
+            game.computer_turn(game.players[game.current_player])
+            game.current_player = (game.current_player + 1) % len(game.players)
+        for seat in range(3):
+            state = RolloutState.from_game(game, seat, random.Random(seat))
+            state.current = game.current_player
+            self.assertEqual(rollout_features(state, seat), game_features(game, seat))
+            self.assertEqual(len(game_features(game, seat)), NUM_FEATURES)
+
+    def test_selfplay_records_are_labelled_per_seat(self):
+        """Test that every position is recorded once per seat with exactly one winning seat."""
+        self.assertEqual(self.features.shape[1], NUM_FEATURES)
+        self.assertEqual(len(self.features), len(self.labels))
+        self.assertEqual(self.labels.sum() * 2, len(self.labels))
+
+    def test_fit_beats_constant_prediction(self):
+        """Test that the linear and MLP models both learn something from the outcomes."""
+        for hidden in (0, 8):
+            model = ValueModel(hidden)
+            losses = model.fit(self.features, self.labels, epochs=20)
+            self.assertLess(losses[-1], math.log(2) - 0.05)
+            self.assertLess(losses[-1], losses[0])
+
+    def test_constant_baseline_stays_finite_on_one_sided_labels(self):
+        """Test that the constant baseline clips the win rate when every label is a win or every label a loss."""
+        for label in (0.0, 1.0):
+            labels = [label] * 10
+            baseline = ValueModel.constant(labels)
+            self.assertTrue(math.isfinite(baseline.b2))
+            self.assertTrue(math.isfinite(baseline.log_loss(self.features[:10], labels)))
+        self.assertAlmostEqual(ValueModel.constant(self.labels).b2, 0.0)
+
+    def test_save_and_load_round_trip(self):
+        """Test that a saved model evaluates identically after loading."""
+        model = ValueModel(4)
+        model.fit(self.features[:2000], self.labels[:2000], epochs=2)
+        path = os.path.join(tempfile.mkdtemp(), "value_model.json")
+        model.save(path)
+        loaded = ValueModel.load(path)
+        self.assertEqual(loaded.evaluate(self.features[:50]).tolist(), model.evaluate(self.features[:50]).tolist())
+
+    def test_batched_evaluation_is_cheap(self):
+        """Test that evaluating a batch costs on the order of microseconds per position."""
+        model = ValueModel(16)
+        model.fit(self.features[:2000], self.labels[:2000], epochs=1)
+        start = time.perf_counter()
+        probabilities = model.evaluate(self.features)
+        per_state = (time.perf_counter() - start) / len(self.features)
+        self.assertTrue(((probabilities > 0) & (probabilities < 1)).all())
+        self.assertLess(per_state, 20e-6)
+
+    def test_search_uses_model_at_cutoff(self):
+        """Test that the search scores cut-off playouts with the value model."""
+        model = ValueModel()
+        model.fit(self.features, self.labels, epochs=5)
+        game, _ = new_selfplay_game(7)
+        player = game.players[game.current_player]
+        playable = game.card_utils.get_playable_cards(player)
+        for policy in ("fast", "rules"):
+            search = AnytimeSearch(game, max_rollouts=20, rollout_turn_limit=2, seed=1, playout=policy,
+                                   value_model=model)
+            decision = search.choose(player, playable, playable[0], time.perf_counter() + 5)
+            self.assertEqual(decision.rollouts, 20)
+            self.assertIn(decision.cards, playable)
+
+
+
+class TestWithoutNumPy(unittest.TestCase):
+    def test_collecting_needs_numpy(self):
+        """Test that collecting training data without NumPy fails up front with a clear ImportError."""
+        numpy_module, value_model.np = value_model.np, None
+        try:
+            with self.assertRaisesRegex(ImportError, "requires NumPy"):
+                collect_selfplay(range(3))
+        finally:
+            value_model.np = numpy_module
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from backend.game_logic import CardGame
+from backend.models import Card, Player
+from backend.simulation import DEFAULT_MAX_TURNS
+from backend.state_hash import CycleDetector, StateHasher
+from backend.strategies import Strategy
+
+SETUP = "setup"
+PLAY = "play"
+PICKUP = "pickup"
+FACE_DOWN = "face_down"
+
+
+class TurnRecord(NamedTuple):
+    # Suit-agnostic, so engines that only track rank counts can produce the same records. A move is
+    # (PLAY, ranks), (PICKUP,) or (FACE_DOWN, position, rank); the setup record's move lists each seat's
+    # face-up ranks. state_hash is the StateHasher key of the position after the move.
+    turn: int
+    seat: int
+    legal: Tuple
+    move: Tuple
+    state_hash: int
+
+
+def _ranks(cards: List[Card]) -> Tuple[int, ...]:
+    return tuple(card.value for card in cards)
+
+
+class RecordingStrategy(Strategy):
+    # Passes every decision through to the seat's strategy and keeps the options and the answer
+    def __init__(self, game, inner: Strategy):
+        super().__init__(game)
+        self.inner = inner
+        self.legal: Tuple = ()
+        self.move: Tuple = ()
+
+    @property
+    def deterministic(self) -> bool:
+        return self.inner.deterministic
+
+    def choose_setup(self, player: Player):
+        self.inner.choose_setup(player)
+
+    def choose_play(self, player: Player, playable_sets: List[List[Card]], top_pile_value: int,
+                    deadline: Optional[float] = None) -> Optional[List[Card]]:
+        cards = self.inner.choose_play(player, playable_sets, top_pile_value, deadline)
+        self.legal = tuple(sorted(_ranks(cards) for cards in playable_sets))
+        self.move = (PLAY, _ranks(cards)) if cards else (PICKUP,)
+        return cards
+
+    def choose_face_down(self, player: Player) -> int:
+        position = self.inner.choose_face_down(player)
+        self.legal = tuple(player.face_down_positions)
+        self.move = (FACE_DOWN, position, player.face_down[player.face_down_positions.index(position)].value)
+        return position
+
+
+def trace_game(game: CardGame, max_turns: int = DEFAULT_MAX_TURNS) -> Iterator[TurnRecord]:
+    # Plays a dealt and set-up game to the end, yielding the setup record and then one record per turn.
+    # Like run_selfplay_game it stops at the first repeated position (see CycleDetector), provided every
+    # seat is deterministic, so both agree on which games are drawn and after how many turns.
+    hasher = StateHasher(len(game.players))
+    recorders = [RecordingStrategy(game, game.strategy_for(player)) for player in game.players]
+    game.strategies = recorders
+    state_hash = hasher.hash(game)
+    yield TurnRecord(0, -1, (), (SETUP,) + tuple(_ranks(player.face_up) for player in game.players), state_hash)
+
+    cycles = CycleDetector(len(game.players)) if all(recorder.deterministic for recorder in recorders) else None
+    for turn in range(1, max_turns + 1):
+        # The previous record's hash is the position the seat to move now faces
+        if cycles is not None and cycles.repeated(game, state_hash):
+            return
+        seat = game.current_player
+        another_turn = game.computer_turn(game.players[seat])
+        recorder = recorders[seat]
+        if game.check_game_over():
+            yield TurnRecord(turn, seat, recorder.legal, recorder.move, hasher.hash(game))
+            return
+        if not another_turn:
+            game.current_player = (seat + 1) % len(game.players)
+        state_hash = hasher.hash(game)
+        yield TurnRecord(turn, seat, recorder.legal, recorder.move, state_hash)
+
+
+class TraceRecorder:
+    # Collects the records of one game, for logging or for comparing against another engine later
+    def __init__(self, records: Optional[List[TurnRecord]] = None):
+        self.records: List[TurnRecord] = records if records is not None else []
+
+    def record(self, game: CardGame, max_turns: int = DEFAULT_MAX_TURNS) -> List[TurnRecord]:
+        self.records.extend(trace_game(game, max_turns))
+        return self.records
+
+    def lines(self) -> Iterator[str]:
+        for record in self.records:
+            legal = " ".join("".join(map(_rank_symbol, ranks)) if isinstance(ranks, tuple) else str(ranks)
+                             for ranks in record.legal)
+            yield f"{record.turn:>5} seat={record.seat:>2} move={_format_move(record.move):<14} " \
+                  f"hash={record.state_hash:016x} legal=[{legal}]"
+
+
+_SYMBOLS = {10: "T", 11: "J", 12: "Q", 13: "K", 14: "A"}
+
+
+def _rank_symbol(rank: int) -> str:
+    return _SYMBOLS.get(rank, str(rank))
+
+
+def _format_move(move: Tuple) -> str:
+    if move[0] == PLAY:
+        return "play " + "".join(map(_rank_symbol, move[1]))
+    if move[0] == FACE_DOWN:
+        return f"face_down {move[1]}:{_rank_symbol(move[2])}"
+    if move[0] == SETUP:
+        return "setup " + "/".join("".join(map(_rank_symbol, ranks)) for ranks in move[1:])
+    return move[0]
@@ -0,0 +1,138 @@
+import json
+import os
+import random
+from multiprocessing import Pool
+from typing import List, Optional, Sequence, Tuple
+
+from backend.ai_params import AIParams, DEFAULT_PARAMS_PATH
+from backend.file_utils import rng_state_from_json, write_json_atomic
+from backend.simulation import play_selfplay_game
+
+
+def _play_seed_pair(args: Tuple[int, List[float], List[float], int]) -> float:
+    # One seed played twice with the seats swapped, so both candidates see identical deals (common random numbers)
+    seed, plus_vector, minus_vector, max_turns = args
+    plus, minus = AIParams.from_vector(plus_vector), AIParams.from_vector(minus_vector)
+    score = 0.0
+    for seats, plus_seat in (((plus, minus), 0), ((minus, plus), 1)):
+        result = play_selfplay_game(seed, seats, max_turns)
+        if result.winner is None:
+            continue
+        score += 1.0 if result.winner == plus_seat else -1.0
+    return score
+
+
+class SPSATuner:
+    # Simultaneous perturbation stochastic approximation: every iteration perturbs all parameters at once and
+    # estimates the gradient from a single paired self-play match between theta + c_k * delta and theta - c_k * delta.
+
+    def __init__(self, start: Optional[AIParams] = None, games_per_iteration: int = 200, workers: int = 1,
+                 checkpoint_path: Optional[str] = None, seed: int = 0, a: float = 2.0, c: float = 1.5,
+                 alpha: float = 0.602, gamma: float = 0.101, stability: float = 10.0, max_turns: int = 2000):
+        self.theta = (start or AIParams()).to_vector()
+        self.games_per_iteration = games_per_iteration
+        self.workers = workers
+        self.checkpoint_path = checkpoint_path
+        self.a = a
+        self.c = c
+        self.alpha = alpha
+        self.gamma = gamma
+        self.stability = stability
+        self.max_turns = max_turns
+        self.iteration = 0
+        self.next_seed = 0
+        self.history: List[dict] = []
+        self.rng = random.Random(seed)
+
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            self._load_checkpoint()
+
+    def _load_checkpoint(self):
+        with open(self.checkpoint_path) as f:
+            state = json.load(f)
+        self.theta = state["theta"]
+        self.iteration = state["iteration"]
+        self.next_seed = state["next_seed"]
+        self.history = state["history"]
+        self.rng.setstate(rng_state_from_json(state["rng_state"]))
+
+    def _save_checkpoint(self):
+        if not self.checkpoint_path:
+            return
+        write_json_atomic(self.checkpoint_path, {
+            "theta": self.theta,
+            "iteration": self.iteration,
+            "next_seed": self.next_seed,
+            "history": self.history,
+            "rng_state": self.rng.getstate(),
+        })
+
+    def evaluate(self, plus: Sequence[float], minus: Sequence[float], pool=None) -> float:
+        pairs = max(1, self.games_per_iteration // 2)
+        seeds = range(self.next_seed, self.next_seed + pairs)
+        self.next_seed += pairs
+        jobs = [(seed, list(plus), list(minus), self.max_turns) for seed in seeds]
+        if pool is None:
+            scores = map(_play_seed_pair, jobs)
+        else:
+            scores = pool.imap_unordered(_play_seed_pair, jobs, chunksize=max(1, pairs // (4 * self.workers)))
+        return sum(scores) / (2 * pairs)
+
+    def step(self, pool=None) -> AIParams:
+        k = self.iteration + 1
+        a_k = self.a / (k + self.stability) ** self.alpha
+        c_k = self.c / k ** self.gamma
+        delta = [self.rng.choice((-1.0, 1.0)) for _ in self.theta]
+        plus = [t + c_k * d for t, d in zip(self.theta, delta)]
+        minus = [t - c_k * d for t, d in zip(self.theta, delta)]
+
+        # Score is the net win rate of plus over minus; SPSA ascends it
+        score = self.evaluate(plus, minus, pool)
+        bounds = list(AIParams.SPEC.values())
+        self.theta = [min(high, max(low, t + a_k * score / (2 * c_k * d)))
+                      for t, d, (_, low, high) in zip(self.theta, delta, bounds)]
+
+        self.iteration = k
+        self.history.append({"iteration": k, "score": score, "theta": list(self.theta)})
+        self._save_checkpoint()
+        return self.params()
+
+    def run(self, iterations: int) -> AIParams:
+        remaining = max(0, iterations - self.iteration)
+        if self.workers > 1:
+            with Pool(self.workers) as pool:
+                for _ in range(remaining):
+                    self.step(pool)
+        else:
+            for _ in range(remaining):
+                self.step()
+        return self.params()
+
+    def params(self) -> AIParams:
+        return AIParams.from_vector(self.theta)
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Tune AILogic thresholds with SPSA self-play.")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--games", type=int, default=400, help="games per iteration (played as seat-swapped pairs)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--checkpoint", default="tuner_checkpoint.json")
+    parser.add_argument("--output", default=DEFAULT_PARAMS_PATH)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    tuner = SPSATuner(games_per_iteration=args.games, workers=args.workers, checkpoint_path=args.checkpoint,
+                      seed=args.seed)
+    if tuner.iteration:
+        print(f"Resuming from iteration {tuner.iteration}")
+    params = tuner.run(args.iterations)
+    params.save(args.output)
+    print(f"Tuned parameters after {tuner.iteration} iterations: {params}")
+    print(f"Written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
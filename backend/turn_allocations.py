@@ -0,0 +1,80 @@
+import tracemalloc
+from typing import Iterable
+
+from backend.simulation import new_selfplay_game
+
+DEFAULT_TURN_LIMIT = 500
+
+
+class AllocationReport:
+    def __init__(self):
+        self.turns = 0
+        self.allocating_turns = 0
+        self.bytes = 0  # transient peak above the pre-turn baseline, summed over turns
+        self.worst = 0
+
+    def add(self, allocated: int):
+        self.turns += 1
+        self.bytes += allocated
+        self.worst = max(self.worst, allocated)
+        if allocated:
+            self.allocating_turns += 1
+
+    def format(self) -> str:
+        mean = self.bytes / self.turns if self.turns else 0.0
+        share = self.allocating_turns / self.turns if self.turns else 0.0
+        return (f"{self.turns} turns: {mean:.1f} bytes/turn, {share:.1%} of turns allocate, "
+                f"worst {self.worst} bytes")
+
+
+def measure_turn_allocations(seeds: Iterable[int] = range(20), num_players: int = 2,
+                             turn_limit: int = DEFAULT_TURN_LIMIT) -> AllocationReport:
+    # Plays seeded self-play games and traces only the state update of each hand or face-up turn
+    # (play_and_draw or pickup_and_draw); the AI decision runs outside the measured region. What remains
+    # is the loop iterator over the played cards and the amortised growth of the pile and hand lists.
+    report = AllocationReport()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        for seed in seeds:
+            game, seat_ais = new_selfplay_game(seed, num_players=num_players)
+            for _ in range(turn_limit):
+                seat = game.current_player
+                player = game.players[seat]
+                if player.can_play_from_face_down():
+                    another_turn = game.computer_turn(player, ai_logic=seat_ais[seat])
+                else:
+                    playable_sets = game.card_utils.get_playable_cards(player)
+                    chosen = seat_ais[seat].computer_choose_playable_set(
+                        playable_sets, game.card_utils.get_top_pile_value(), player)
+                    baseline, _ = tracemalloc.get_traced_memory()
+                    tracemalloc.reset_peak()
+                    if chosen:
+                        another_turn = game.play_and_draw(player, chosen)
+                    else:
+                        another_turn = game.pickup_and_draw(player)
+                    _, peak = tracemalloc.get_traced_memory()
+                    report.add(peak - baseline)
+                if game.check_game_over():
+                    break
+                if not another_turn:
+                    game.current_player = (seat + 1) % len(game.players)
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return report
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure memory allocated by the per-turn state update.")
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--players", type=int, default=2)
+    args = parser.parse_args()
+    print(measure_turn_allocations(range(args.games), args.players).format())
+
+
+if __name__ == "__main__":
+    main()
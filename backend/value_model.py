@@ -0,0 +1,244 @@
+import json
+import random
+from typing import List, Optional, Sequence, Tuple
+
+from backend.card_utils import CardUtils
+from backend.enums import GameOutcome
+from backend.file_utils import write_json_atomic
+from backend.simulation import DEFAULT_MAX_TURNS, new_selfplay_game, run_selfplay_game
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional for the engine; fitting and evaluating the model need it
+    np = None
+
+RANKS = range(2, 15)
+# Suit-agnostic features seen from one seat: its own hand and face-up rank histograms, the opponents'
+# combined face-up histogram and zone sizes, and the shared pile (including the run of equal ranks on top
+# and how many of that rank the seat holds towards a burn) and deck
+FEATURE_NAMES = ([f"hand_{rank}" for rank in RANKS] + [f"face_up_{rank}" for rank in RANKS] + ["face_down"]
+                 + [f"opponent_face_up_{rank}" for rank in RANKS]
+                 + ["opponent_hand", "opponent_face_down", "opponent_min_cards", "pile_value", "pile_size",
+                    "pile_run_length", "hand_run_cards", "deck_size", "to_move", "opponents"])
+NUM_FEATURES = len(FEATURE_NAMES)
+PROBABILITY_EPS = 1e-9  # keeps log losses and logits finite when a probability reaches 0 or 1
+
+
+def _features(seat: int, current: int, hands: Sequence[Sequence[int]], hand_sizes: Sequence[int],
+              face_up: Sequence[Sequence[int]], face_down_sizes: Sequence[int], pile_value: int, pile_size: int,
+              run_rank: int, run_length: int, deck_size: int) -> List[float]:
+    # hands and face_up are rank-count arrays indexed 0-14, as in RolloutState; only seat's hand is read
+    features = [float(hands[seat][rank]) for rank in RANKS]
+    features.extend(float(face_up[seat][rank]) for rank in RANKS)
+    features.append(float(face_down_sizes[seat]))
+    opponents = [index for index in range(len(hand_sizes)) if index != seat]
+    features.extend(float(sum(face_up[index][rank] for index in opponents)) for rank in RANKS)
+    features.append(float(sum(hand_sizes[index] for index in opponents)))
+    features.append(float(sum(face_down_sizes[index] for index in opponents)))
+    features.append(float(min(hand_sizes[index] + sum(face_up[index]) + face_down_sizes[index]
+                              for index in opponents)))
+    features.extend((float(pile_value), float(pile_size), float(run_length), float(hands[seat][run_rank]),
+                     float(deck_size), float(current == seat), float(len(opponents))))
+    return features
+
+
+def game_features(game, seat: int, current: Optional[int] = None) -> List[float]:
+    hands, face_up = [], []
+    for player in game.players:
+        hand = [0] * 15
+        for card in player.hand:
+            hand[card.value] += 1
+        hands.append(hand)
+        counts = [0] * 15
+        for card in player.face_up:
+            counts[card.value] += 1
+        face_up.append(counts)
+    return _features(seat, game.current_player if current is None else current, hands,
+                     [len(player.hand) for player in game.players], face_up,
+                     [len(player.face_down) for player in game.players],
+                     CardUtils.get_pile_top_value_for_comparison(game.pile) or 0, len(game.pile), game.pile.run_rank,
+                     game.pile.run_length, len(game.deck))
+
+
+def rollout_features(state, seat: int) -> List[float]:
+    return _features(seat, state.current, state.hands, state.hand_sizes, state.face_up,
+                     [len(face_down) for face_down in state.face_down], state.pile_value, state.pile_size,
+                     state.run_rank, state.run_length, len(state.deck))
+
+
+def collect_selfplay(seeds: Sequence[int], num_players: int = 2, max_turns: int = DEFAULT_MAX_TURNS):
+    # One row per seat for every position of every finished game, labelled 1 if that seat went on to win;
+    # drawn and aborted games have no outcome to learn from and are dropped
+    if np is None:
+        raise ImportError("collect_selfplay requires NumPy")
+    features, labels = [], []
+    for seed in seeds:
+        game, seat_ais = new_selfplay_game(seed, num_players=num_players)
+        rows = []
+
+        def record(position):
+            rows.extend((seat, game_features(position, seat)) for seat in range(len(position.players)))
+
+        result = run_selfplay_game(game, seat_ais, seed, max_turns, on_turn=record)
+        if result.outcome is not GameOutcome.WIN:
+            continue
+        features.extend(row for _, row in rows)
+        labels.extend(float(seat == result.winner) for seat, _ in rows)
+    return np.array(features, dtype=np.float64).reshape(-1, NUM_FEATURES), np.array(labels, dtype=np.float64)
+
+
+class ValueModel:
+    # Win probability from the feature vector: logistic regression, or a one-hidden-layer tanh MLP when
+    # hidden > 0. Inputs are standardised with the training set's mean and spread.
+
+    def __init__(self, hidden: int = 0, seed: int = 0):
+        if np is None:
+            raise ImportError("ValueModel requires NumPy")
+        self.hidden = hidden
+        rng = np.random.default_rng(seed)
+        self.mean = np.zeros(NUM_FEATURES)
+        self.scale = np.ones(NUM_FEATURES)
+        if hidden:
+            self.w1 = rng.normal(0.0, 1.0 / np.sqrt(NUM_FEATURES), (NUM_FEATURES, hidden))
+            self.b1 = np.zeros(hidden)
+            self.w2 = rng.normal(0.0, 1.0 / np.sqrt(hidden), hidden)
+        else:
+            self.w1 = self.b1 = None
+            self.w2 = np.zeros(NUM_FEATURES)
+        self.b2 = 0.0
+
+    def _forward(self, x):
+        if self.hidden:
+            activations = np.tanh(x @ self.w1 + self.b1)
+            return activations, activations @ self.w2 + self.b2
+        return x, x @ self.w2 + self.b2
+
+    def evaluate(self, states):
+        # Batched: states is an (n, NUM_FEATURES) array of raw feature rows; returns n win probabilities
+        x = (np.asarray(states, dtype=np.float64) - self.mean) / self.scale
+        _, logits = self._forward(x)
+        return 1.0 / (1.0 + np.exp(-logits))
+
+    def evaluate_game(self, game, seat: int, current: Optional[int] = None) -> float:
+        return float(self.evaluate([game_features(game, seat, current)])[0])
+
+    def evaluate_rollout(self, state, seat: int) -> float:
+        # Signature matches the evaluate hook of backend.rollout.playout
+        return float(self.evaluate([rollout_features(state, seat)])[0])
+
+    def fit(self, features, labels, epochs: int = 50, learning_rate: float = 0.05, l2: float = 1e-3,
+            batch_size: int = 4096, seed: int = 0) -> List[float]:
+        # Mini-batch Adam on the log loss; returns the training loss after each epoch
+        features = np.asarray(features, dtype=np.float64)
+        labels = np.asarray(labels, dtype=np.float64)
+        self.mean = features.mean(axis=0)
+        spread = features.std(axis=0)
+        self.scale = np.where(spread > 1e-9, spread, 1.0)
+        x_all = (features - self.mean) / self.scale
+        names = ["w2", "b2"] + (["w1", "b1"] if self.hidden else [])
+        moments = {name: (np.zeros_like(getattr(self, name)), np.zeros_like(getattr(self, name))) for name in names}
+        rng = np.random.default_rng(seed)
+        losses = []
+        step = 0
+        for _ in range(epochs):
+            order = rng.permutation(len(x_all))
+            for start in range(0, len(order), batch_size):
+                batch = order[start:start + batch_size]
+                x, y = x_all[batch], labels[batch]
+                activations, logits = self._forward(x)
+                error = (1.0 / (1.0 + np.exp(-logits)) - y) / len(batch)
+                gradients = {"w2": activations.T @ error + l2 * self.w2, "b2": error.sum()}
+                if self.hidden:
+                    delta = np.outer(error, self.w2) * (1.0 - activations ** 2)
+                    gradients["w1"] = x.T @ delta + l2 * self.w1
+                    gradients["b1"] = delta.sum(axis=0)
+                step += 1
+                for name, gradient in gradients.items():
+                    first, second = moments[name]
+                    first = 0.9 * first + 0.1 * gradient
+                    second = 0.999 * second + 0.001 * gradient ** 2
+                    moments[name] = (first, second)
+                    corrected = np.sqrt(second / (1 - 0.999 ** step)) + 1e-8
+                    setattr(self, name, getattr(self, name) - learning_rate * first / (1 - 0.9 ** step) / corrected)
+            losses.append(self.log_loss(features, labels))
+        return losses
+
+    def log_loss(self, features, labels) -> float:
+        probabilities = np.clip(self.evaluate(features), PROBABILITY_EPS, 1 - PROBABILITY_EPS)
+        labels = np.asarray(labels, dtype=np.float64)
+        return float(-np.mean(labels * np.log(probabilities) + (1 - labels) * np.log(1 - probabilities)))
+
+    @classmethod
+    def constant(cls, labels) -> "ValueModel":
+        # The baseline that predicts the training win rate everywhere, clipped like log_loss so a set of
+        # labels that are all wins or all losses still gives a finite logit
+        base_rate = float(np.clip(np.mean(labels), PROBABILITY_EPS, 1 - PROBABILITY_EPS))
+        model = cls()
+        model.b2 = float(np.log(base_rate / (1 - base_rate)))
+        return model
+
+    def to_dict(self) -> dict:
+        data = {"features": FEATURE_NAMES, "hidden": self.hidden, "mean": self.mean.tolist(),
+                "scale": self.scale.tolist(), "w2": self.w2.tolist(), "b2": float(self.b2)}
+        if self.hidden:
+            data.update(w1=self.w1.tolist(), b1=self.b1.tolist())
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ValueModel":
+        if data["features"] != FEATURE_NAMES:
+            raise ValueError("Value model was trained on a different feature layout")
+        model = cls(data["hidden"])
+        model.mean = np.array(data["mean"])
+        model.scale = np.array(data["scale"])
+        model.w2 = np.array(data["w2"])
+        model.b2 = data["b2"]
+        if model.hidden:
+            model.w1 = np.array(data["w1"])
+            model.b1 = np.array(data["b1"])
+        return model
+
+    def save(self, path: str):
+        write_json_atomic(path, self.to_dict())
+
+    @classmethod
+    def load(cls, path: str) -> "ValueModel":
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def holdout_split(features, labels, holdout: float, seed: int = 0) -> Tuple:
+    # Rows arrive game by game and positions within a game are strongly correlated, so the holdout is the
+    # trailing slice rather than a random sample; only the training rows are shuffled
+    cut = int(len(features) * (1.0 - holdout))
+    order = list(range(cut))
+    random.Random(seed).shuffle(order)
+    return features[order], labels[order], features[cut:], labels[cut:]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fit a value model on self-play positions.")
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--hidden", type=int, default=0, help="hidden units; 0 fits a linear model")
+    parser.add_argument("--epochs", type=int, default=50)
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--out", default="value_model.json")
+    args = parser.parse_args()
+
+    features, labels = collect_selfplay(range(args.first_seed, args.first_seed + args.games), args.players)
+    train_x, train_y, test_x, test_y = holdout_split(features, labels, args.holdout)
+    model = ValueModel(args.hidden)
+    losses = model.fit(train_x, train_y, args.epochs)
+    baseline = ValueModel.constant(train_y)
+    print(f"{len(features)} positions, train loss {losses[-1]:.4f}, "
+          f"holdout loss {model.log_loss(test_x, test_y):.4f} (constant {baseline.log_loss(test_x, test_y):.4f})")
+    model.save(args.out)
+    print(f"Saved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
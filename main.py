@@ -1,5 +1,14 @@
-from backend.game_logic import CardGame
-
 if __name__ == "__main__":
-    game = CardGame()
+    # Imported here rather than at module level so worker processes that re-import this module as
+    # __mp_main__ do not load the engine until they need it
+    import argparse
+
+    from backend.game_logic import MAX_PLAYERS, MIN_PLAYERS, CardGame
+
+    parser = argparse.ArgumentParser(description="Play Shithead against computer opponents.")
+    parser.add_argument("--players", type=int, default=MIN_PLAYERS, choices=range(MIN_PLAYERS, MAX_PLAYERS + 1),
+                        metavar=f"{{{MIN_PLAYERS}-{MAX_PLAYERS}}}", help="seats at the table, you plus the computers")
+    args = parser.parse_args()
+
+    game = CardGame(num_players=args.players)
     game.play_game()